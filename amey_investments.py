@@ -1,16 +1,29 @@
+import argparse
 import os
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 
+from calendar_sync import GoogleCalendarAsyncClient, run_sync
+from fixed_deposit_calculator.currency import format_inr
+from fixed_deposit_calculator.ingest import load_portfolio
 from google_calendar import GoogleCalendarUtil
+from ics_export import with_event_key, write_ics
+from sip import SIP_OPTIONAL_COLUMNS, sip_summary
 
 data_path = os.path.join(os.path.dirname(__file__), "data", "amey_data.xlsx")
 
+SIP_COLUMNS = ["Company", "Folio Number", "Amount", "Day of the Month", "Type"]
+
 def load_data():
     """Load data from Excel file and filter to only include rows where Type is 'recurring'."""
     try:
-        # Read the excel file
-        df = pd.read_excel(data_path)
+        # Read every sheet of the excel file
+        df = load_portfolio(
+            [data_path],
+            columns=SIP_COLUMNS,
+            max_workers=None,
+            optional_columns=SIP_OPTIONAL_COLUMNS,
+        )
         
         # Filter to only include rows where Type is 'recurring'
         recurring_df = df[df['Type'].str.lower() == 'recurring']
@@ -21,16 +34,14 @@ def load_data():
         print(f"Error loading data: {e}")
         return pd.DataFrame()
     
-def create_events(google_calendar_util, row):
-    """Create a basic recurring event for SIP payment based on the day of the month"""
+def sip_event(row):
+    """Build a basic recurring event for SIP payment based on the day of the month"""
     # Extract information from the row
     company = row['Company']
     folio_number = row['Folio Number']
     amount = row['Amount']
     day_of_month = row['Day of the Month']
     
-    print(f"Processing: {company} (Rs.{amount}) - Day {day_of_month}")
-    
     # Create event summary and description
     summary = f"{company} - {format_currency_inr(amount)}"
     description = f"Folio Number: {folio_number}"
@@ -39,36 +50,60 @@ def create_events(google_calendar_util, row):
     today = datetime.now()
     start_date = datetime(today.year, 1, int(day_of_month))
 
-    # Create the recurring event (monthly)
-    google_calendar_util.create_event(
+    # Build the recurring event (monthly)
+    event = GoogleCalendarUtil.event_body(
         summary=summary,
         description=description,
         start_date=start_date,
         frequency=1  # Monthly
     )
-    print(f"\u2713 Created event for {company} starting {start_date.strftime('%Y-%m-%d')}")
+    # One SIP per company and folio; the amount and day may change
+    return with_event_key(event, "sip", row.get("SOURCE", ""), company, folio_number)
 
 
 def format_currency_inr(amount):
     """Format a number in Indian currency with rupee symbol"""
-    return u" \u20B9{:,}".format(amount)
+    return format_inr(amount)
 
 
 if __name__ == "__main__":
     # Target calendar name - hardcoded for safety
     TARGET_CALENDAR = "SIPs"
 
+    parser = argparse.ArgumentParser(description="Sync SIPs to Google Calendar")
+    parser.add_argument(
+        "--ics", metavar="PATH", help="write the events to an .ics file instead of syncing"
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="print installments, invested amount, next debits and XIRR per SIP",
+    )
+    args = parser.parse_args()
+
     data = load_data()
-    if not data.empty:
+    if not data.empty and args.summary:
+        summary = sip_summary(data)
+        summary["INVESTED"] = summary["INVESTED"].map(format_currency_inr)
+        summary["XIRR"] = summary["XIRR"].map(lambda rate: "" if pd.isna(rate) else f"{rate:.2%}")
+        print(summary.to_string(index=False))
+    elif not data.empty and args.ics:
+        events = (sip_event(row) for _, row in data.iterrows())
+        count = write_ics(args.ics, events, TARGET_CALENDAR)
+        print(f"Wrote {count} events to {args.ics}")
+    elif not data.empty:
         print("Data loaded successfully.")
         
         # Create a calendar and events for each row
         google_calendar_util = GoogleCalendarUtil()
         google_calendar_util.create_or_use_calendar(TARGET_CALENDAR)
-        google_calendar_util.clear_calendar()
         
-        # Create events for each recurring payment
-        for index, row in data.iterrows():
-            create_events(google_calendar_util, row)
+        # Create events for changed recurring payments; unchanged ones are skipped
+        report = run_sync(
+            GoogleCalendarAsyncClient(google_calendar_util),
+            (sip_event(row) for _, row in data.iterrows()),
+            existing=list(google_calendar_util.iter_events()),
+        )
+        print(report)
     else:
         print("No data to display.")
@@ -0,0 +1,418 @@
+"""
+Concurrent-session load test for the Streamlit app.
+
+Runs N sessions of fixed_deposit_calculator/app.py at once against a
+synthetic encrypted portfolio. Each session logs in through the login form,
+lands on the pre-rendered report and flips the "Live dashboard" toggle
+--clicks times, alternating between the live dashboard and the report.
+Every step is a real widget interaction: the widget values are set on the
+page the session last received and sent back as its widget states. Reports
+p50/p95/p99 rerun latency per step and overall, CPU time and RSS.
+
+--mode server (the default) starts one ``streamlit run`` server and
+connects every session to it over its websocket, the way browsers do, so
+the sessions share its runtime, caches and GIL. The CPU time and RSS
+reported are the server's. --cpus pins the server.
+
+--mode processes runs each session as a headless AppTest in its own process
+(AppTest keeps the runtime and secrets in process globals). No cache is
+shared and sessions only contend for the --cpus cores they are pinned to,
+so this measures a session's own cost, not a server under load.
+
+Both modes make one unmeasured warm-up visit first (imports, store cache,
+the day's report).
+
+    python benchmarks/load_test.py --sessions 8 --deposits 2000 --clicks 6
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from cryptography.fernet import Fernet
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from fixed_deposit_calculator.passwords import hash_password  # noqa: E402
+from fixed_deposit_calculator.storage import SQLiteStore, import_workbooks  # noqa: E402
+from sync_throughput import synthetic_book  # noqa: E402
+
+APP_PATH = os.path.join(PROJECT_DIR, "fixed_deposit_calculator", "app.py")
+PASSWORD = "load-test"
+
+PROCESSES_NOTE = (
+    "each session ran in its own process: no shared caches and no contention "
+    "beyond the pinned cores; use --mode server to load one shared runtime"
+)
+
+
+def rss_mb(pid="self"):
+    """Current resident set size of a process in MB (Linux), else this process's peak."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def cpu_seconds(pid=None):
+    """CPU time of this process, or of process ``pid`` (Linux)."""
+    if pid is None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime
+    with open(f"/proc/{pid}/stat") as f:
+        # Fields after the parenthesized command name; utime and stime are 14 and 15
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def write_portfolio(directory, deposits, key, store):
+    """Encrypt a synthetic book into ``directory``; returns the portfolio path."""
+    workbook = os.path.join(directory, "portfolio.xlsx")
+    synthetic_book(deposits).to_excel(workbook, index=False)
+    path = os.path.join(directory, "data.xlsx.enc")
+    with open(workbook, "rb") as f:
+        encrypted = Fernet(key).encrypt(f.read())
+    with open(path, "wb") as f:
+        f.write(encrypted)
+    if store == "sqlite":
+        database = os.path.join(directory, "portfolio.db")
+        import_workbooks(SQLiteStore(database, key), [path], key)
+        return database
+    return path
+
+
+def app_secrets(key, portfolio, directory, scrypt_n):
+    return {
+        "cryptography": {"fernet_key": key.decode()},
+        "authentication": {
+            "encrypted_password_hash": Fernet(key)
+            .encrypt(hash_password(PASSWORD, n=scrypt_n).encode())
+            .decode()
+        },
+        # Absolute paths win over the package directory they are joined to
+        "storage": {"path": portfolio},
+        "reports": {"dir": os.path.join(directory, "artifacts")},
+    }
+
+
+def write_secrets(directory, secrets):
+    """Write ``secrets`` to ``directory``/.streamlit/secrets.toml for a server run there."""
+    os.makedirs(os.path.join(directory, ".streamlit"), exist_ok=True)
+    with open(os.path.join(directory, ".streamlit", "secrets.toml"), "w") as f:
+        for section, values in secrets.items():
+            f.write(f"[{section}]\n")
+            for name, value in values.items():
+                # JSON strings are valid TOML basic strings
+                f.write(f"{name} = {json.dumps(value)}\n")
+
+
+def login(page):
+    page.text_input[0].input(PASSWORD)
+    page.button[0].click()
+
+
+def visit_steps(clicks):
+    """
+    One user's visit as [(step, interact)], ``interact(page)`` setting widget
+    values on the page the previous step rendered (None for the first load).
+    """
+    steps = [("login page", None), ("login", login)]
+    for click in range(clicks):
+        live = click % 2 == 0
+        steps.append(
+            (
+                "live dashboard" if live else "report",
+                lambda page, live=live: page.toggle[0].set_value(live),
+            )
+        )
+    return steps
+
+
+def check_page(name, page):
+    # The dashboard reports its own failures with st.error
+    problems = [e.value for e in page.exception] + [e.value for e in page.error]
+    if problems:
+        raise RuntimeError(f"{name}: {problems[0]}")
+
+
+def run_session(secrets, clicks, timeout):
+    """One user's visit in a headless AppTest; returns [(step, seconds)] for every rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    for section, values in secrets.items():
+        app.secrets[section] = values
+    timings = []
+    for name, interact in visit_steps(clicks):
+        if interact is not None:
+            interact(app)
+        began = time.perf_counter()
+        app.run()
+        timings.append((name, time.perf_counter() - began))
+        check_page(name, app)
+    return timings
+
+
+def session_process(secrets, clicks, timeout, cpus, barrier, results):
+    """Warm up, wait for every session, then run the measured visit."""
+    # Headless sessions log a missing ScriptRunContext and deprecations on
+    # every rerun; failures are reported through ``results`` instead
+    sys.stderr = open(os.devnull, "w")
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, range(cpus))
+    try:
+        run_session(secrets, 0, timeout)
+        barrier.wait()
+        cpu_before, began = cpu_seconds(), time.time()
+        timings = run_session(secrets, clicks, timeout)
+        results.put(
+            {
+                "timings": timings,
+                "began": began,
+                "ended": time.time(),
+                "cpu_seconds": cpu_seconds() - cpu_before,
+                "rss_mb": rss_mb(),
+            }
+        )
+    except Exception as e:
+        barrier.abort()
+        results.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_processes(args, secrets):
+    """--mode processes: one AppTest session per process; returns the session results."""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.sessions)
+    queue = context.Queue()
+    processes = [
+        context.Process(
+            target=session_process,
+            args=(secrets, args.clicks, args.timeout, args.cpus, barrier, queue),
+        )
+        for _ in range(args.sessions)
+    ]
+    for process in processes:
+        process.start()
+    sessions = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return sessions, {}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(directory, port, cpus, timeout):
+    """``streamlit run`` the app in ``directory`` (where its secrets are); waits until it listens."""
+    preexec = None
+    if cpus and hasattr(os, "sched_setaffinity"):
+        preexec = lambda: os.sched_setaffinity(0, range(cpus))  # noqa: E731
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH]
+        + ["--server.headless", "true", "--server.port", str(port)]
+        + ["--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=directory,
+        env=dict(os.environ, PYTHONPATH=PROJECT_DIR),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        preexec_fn=preexec,
+    )
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                raise RuntimeError("the Streamlit server did not start")
+            time.sleep(0.1)
+
+
+async def rerun(connection, widget_states=None):
+    """Ask the server for a rerun with ``widget_states``; returns the rendered page."""
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.testing.v1.element_tree import parse_tree_from_messages
+
+    request = BackMsg()
+    request.rerun_script.query_string = ""
+    if widget_states is not None:
+        request.rerun_script.widget_states.CopyFrom(widget_states)
+    await connection.send(request.SerializeToString())
+
+    messages = []
+    while True:
+        message = ForwardMsg()
+        message.ParseFromString(await connection.recv())
+        if message.WhichOneof("type") != "script_finished":
+            messages.append(message)
+        elif message.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+            # st.rerun (the login does one): the page is the next run's
+            messages = []
+        else:
+            return parse_tree_from_messages(messages)
+
+
+async def server_session(url, clicks, timeout):
+    """One user's visit over the server's websocket; returns timings like run_session."""
+    import websockets
+
+    timings = []
+    page = None
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as connection:
+        for name, interact in visit_steps(clicks):
+            widget_states = None
+            if interact is not None:
+                interact(page)
+                widget_states = page.get_widget_states()
+            began = time.perf_counter()
+            page = await asyncio.wait_for(rerun(connection, widget_states), timeout)
+            timings.append((name, time.perf_counter() - began))
+            check_page(name, page)
+    return timings
+
+
+async def server_sessions(url, sessions, clicks, timeout):
+    async def session():
+        began = time.time()
+        timings = await server_session(url, clicks, timeout)
+        return {"timings": timings, "began": began, "ended": time.time()}
+
+    results = await asyncio.gather(*(session() for _ in range(sessions)), return_exceptions=True)
+    return [
+        {"error": f"{type(r).__name__}: {r}"} if isinstance(r, BaseException) else r
+        for r in results
+    ]
+
+
+def run_server(args, secrets, directory):
+    """--mode server: every session on one ``streamlit run`` server; returns the session results."""
+    write_secrets(directory, secrets)
+    port = free_port()
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    server = start_server(directory, port, args.cpus, args.timeout)
+    try:
+        asyncio.run(server_sessions(url, 1, 0, args.timeout))
+        cpu_before = cpu_seconds(server.pid)
+        sessions = asyncio.run(server_sessions(url, args.sessions, args.clicks, args.timeout))
+        usage = {
+            "server_cpu_seconds": cpu_seconds(server.pid) - cpu_before,
+            "server_rss_mb": rss_mb(server.pid),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+    return sessions, usage
+
+
+def percentiles(values):
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000
+    return {"n": len(values), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--deposits", type=int, default=2000, help="deposits in the portfolio")
+    parser.add_argument(
+        "--clicks", type=int, default=6, help="flips of the Live dashboard toggle per session"
+    )
+    parser.add_argument("--store", choices=["workbook", "sqlite"], default="workbook")
+    parser.add_argument(
+        "--mode",
+        choices=["server", "processes"],
+        default="server",
+        help="one shared streamlit server, or an AppTest process per session",
+    )
+    parser.add_argument(
+        "--cpus", type=int, default=1, help="cores the server or sessions run on (0: no pinning)"
+    )
+    parser.add_argument(
+        "--scrypt-n", type=int, default=2**15, help="scrypt cost of the password hash"
+    )
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per rerun")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    key = Fernet.generate_key()
+    with tempfile.TemporaryDirectory() as directory:
+        portfolio = write_portfolio(directory, args.deposits, key, args.store)
+        secrets = app_secrets(key, portfolio, directory, args.scrypt_n)
+        if args.mode == "server":
+            sessions, usage = run_server(args, secrets, directory)
+        else:
+            sessions, usage = run_processes(args, secrets)
+
+    errors = [session["error"] for session in sessions if "error" in session]
+    if errors:
+        print(f"{len(errors)} session(s) failed, e.g. {errors[0]}")
+        sys.exit(1)
+
+    wall = max(s["ended"] for s in sessions) - min(s["began"] for s in sessions)
+    steps = {}
+    for session in sessions:
+        for name, seconds in session["timings"]:
+            steps.setdefault(name, []).append(seconds)
+    reruns = sum(len(session["timings"]) for session in sessions)
+    results = {
+        "mode": args.mode,
+        "sessions": args.sessions,
+        "deposits": args.deposits,
+        "store": args.store,
+        "cpus": args.cpus,
+        "wall_seconds": wall,
+        "reruns_per_second": reruns / wall,
+        "reruns": percentiles([s for session in sessions for _, s in session["timings"]]),
+        "steps": {name: percentiles(values) for name, values in steps.items()},
+    }
+    if args.mode == "processes":
+        cpu = [session["cpu_seconds"] for session in sessions]
+        rss = [session["rss_mb"] for session in sessions]
+        results["cpu_seconds_per_session"] = {"mean": float(np.mean(cpu)), "max": max(cpu)}
+        results["rss_mb_per_session"] = {"mean": float(np.mean(rss)), "max": max(rss)}
+        results["note"] = PROCESSES_NOTE
+    else:
+        results.update(usage)
+
+    where = "one server" if args.mode == "server" else "separate processes"
+    print(
+        f"{args.sessions} sessions in {where} on {args.cpus or 'all'} core(s), "
+        f"{args.deposits} deposits ({args.store}), {wall:.1f}s wall"
+    )
+    print(f"{'step':<16} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in list(results["steps"].items()) + [("all reruns", results["reruns"])]:
+        print(
+            f"{name:<16} {row['n']:>5} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+            f"{row['p99_ms']:>9.1f}"
+        )
+    if args.mode == "processes":
+        print(f"CPU per session:  {np.mean(cpu):.2f} s mean, {max(cpu):.2f} s max")
+        print(f"RSS per session:  {np.mean(rss):.0f} MB mean, {max(rss):.0f} MB max")
+    else:
+        print(f"Server CPU:       {usage['server_cpu_seconds']:.2f} s")
+        print(f"Server RSS:       {usage['server_rss_mb']:.0f} MB")
+    print(f"Rerun throughput: {results['reruns_per_second']:.1f}/s")
+    if args.mode == "processes":
+        print(f"Note: {PROCESSES_NOTE}.")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+"""
+Differential oracle for the vectorized interest engines.
+
+Generates adversarial deposit books (month-end and leap-day starts, every
+frequency code, maturities on, next to and far from payment dates and window
+edges) and checks the fast paths against the reference functions of
+interest.py, called row by row the way the app originally did:
+
+    next interest date    DepositSchedule.next_interest_dates  calculate_next_interest_date
+    per-payment interest  schema.per_payment_interest          calculate_interest_amount
+    FY interest dates     DepositSchedule.window_ledger        calculate_financial_year_interest_dates
+    date range payments   query.PaymentIndex.payments          calculate_date_range_interest_dates
+    window interest       reports.with_window_interest         len(dates) * calculate_interest_amount
+
+Dates must be equal and amounts equal bit for bit. Every divergence is shrunk
+to the fewest deposits and the narrowest window still reproducing it, and
+printed as a reproducer. Both sides are also timed on the whole book, so each
+case reports its speedup next to its divergences. Business-day calendars are
+not covered: the reference functions have no notion of them.
+
+    python benchmarks/oracle.py --books 10 --deposits 200 --seed 0
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixed_deposit_calculator.interest import (  # noqa: E402
+    calculate_date_range_interest_dates,
+    calculate_financial_year_interest_dates,
+    calculate_interest_amount,
+    calculate_next_interest_date,
+)
+from fixed_deposit_calculator.query import PaymentIndex  # noqa: E402
+from fixed_deposit_calculator.reports import with_window_interest  # noqa: E402
+from fixed_deposit_calculator.schedule import DepositSchedule  # noqa: E402
+from fixed_deposit_calculator.schema import FREQUENCIES, per_payment_interest  # noqa: E402
+
+STEPS = {"M": relativedelta(months=1), "Q": relativedelta(months=3), "H": relativedelta(months=6)}
+STEPS["Y"] = relativedelta(years=1)
+
+# Small index blocks, so the block pruning of PaymentIndex is exercised on
+# books of a few hundred deposits
+BLOCK_SIZE = 16
+
+# Amounts and rates whose products round differently depending on the order
+# of the operations
+AMOUNTS = [0.01, 1.0, 999.99, 12345.675, 100000.0, 250000.07, 1e9 + 0.07]
+RATES = [0.0, 0.0001, 0.065, 0.0725, 1 / 3, 0.085, 0.999999]
+
+
+# -- Adversarial books ---------------------------------------------------
+
+
+def _month_end(year, month):
+    return (pd.Timestamp(year, month, 1) + pd.offsets.MonthEnd(0)).date()
+
+
+def adversarial_date(rng, years):
+    """A date biased towards month ends, leap days and the days 28 to 31."""
+    year = int(rng.choice(years))
+    month = int(rng.integers(1, 13))
+    kind = rng.choice(
+        ["month end", "leap day", "late", "first", "any"], p=[0.3, 0.1, 0.2, 0.1, 0.3]
+    )
+    if kind == "leap day":
+        year = next(y for y in range(year, year + 8) if y % 4 == 0 and (y % 100 or y % 400 == 0))
+        return datetime.date(year, 2, 29)
+    if kind == "month end":
+        return _month_end(year, month)
+    if kind == "late":
+        day = datetime.date(year, month, 28) + datetime.timedelta(int(rng.integers(0, 4)))
+        return min(day, _month_end(year, month))
+    if kind == "first":
+        return datetime.date(year, month, 1)
+    return datetime.date(year, month, 1) + datetime.timedelta(int(rng.integers(0, 28)))
+
+
+def reference_payment(start, frequency, k):
+    """Payment ``k`` the way the reference functions reach it: k additions of the step."""
+    date = pd.Timestamp(start)
+    for _ in range(k):
+        date += STEPS[frequency]
+    return date.date()
+
+
+def adversarial_maturity(rng, start, frequency):
+    """A maturity on a payment date, a day off one, a month end, the start, or far away."""
+    kind = rng.choice(
+        ["on payment", "day before", "day after", "month end", "start", "far", "any"],
+        p=[0.25, 0.1, 0.1, 0.15, 0.05, 0.05, 0.3],
+    )
+    k = int(rng.integers(1, 40))
+    if kind == "start":
+        return start
+    if kind == "far":
+        return datetime.date(2104, 12, 31)
+    if kind == "any":
+        return start + datetime.timedelta(int(rng.integers(0, 15 * 366)))
+    if frequency == "C":
+        payment = reference_payment(start, "M", k)
+    else:
+        payment = reference_payment(start, frequency, k)
+    if kind == "month end":
+        return _month_end(payment.year, payment.month)
+    if kind == "day before":
+        return max(payment - datetime.timedelta(1), start)
+    if kind == "day after":
+        return payment + datetime.timedelta(1)
+    return payment
+
+
+def adversarial_book(rng, n):
+    """A validated-looking deposit frame of ``n`` adversarial deposits."""
+    # Mostly recent deposits, some around the non-leap century year 2100
+    years = list(range(1998, 2032)) * 9 + list(range(2092, 2101))
+    starts = [adversarial_date(rng, years) for _ in range(n)]
+    frequencies = rng.choice(FREQUENCIES, n).tolist()
+    return pd.DataFrame(
+        {
+            "DEP NO": np.arange(n) + 1,
+            "NAME OF THE DEPOSITEE": rng.choice(["Asha", "Vivek", "Amey"], n),
+            "DATE": pd.to_datetime(starts),
+            "MATURITY DATE": pd.to_datetime(
+                [adversarial_maturity(rng, s, f) for s, f in zip(starts, frequencies)]
+            ),
+            "DEPOSIT AMT": rng.choice(AMOUNTS, n),
+            "RATE OF INT": rng.choice(RATES, n),
+            "INTEREST PAYABLE": pd.Categorical(frequencies, categories=FREQUENCIES),
+            "CUST ID": rng.integers(1000, 9999, n),
+        }
+    )
+
+
+def adversarial_days(rng, df, count):
+    """``today`` values: edges of the book's own starts, payments and maturities."""
+    picks = [
+        pd.Timestamp(1997, 12, 31),
+        pd.Timestamp(2024, 2, 29),
+        pd.Timestamp(2100, 2, 28),
+    ]
+    while len(picks) < count:
+        row = df.iloc[int(rng.integers(len(df)))]
+        date = row["DATE"] if rng.random() < 0.5 else row["MATURITY DATE"]
+        if row["INTEREST PAYABLE"] != "C" and rng.random() < 0.5:
+            k = int(rng.integers(0, 30))
+            date = pd.Timestamp(reference_payment(row["DATE"], row["INTEREST PAYABLE"], k))
+        picks.append(date + pd.Timedelta(days=int(rng.integers(-1, 2))))
+    return picks
+
+
+def adversarial_windows(rng, df, count):
+    """(start, end) windows: FYs, single days, month ends, maturities and inverted ranges."""
+    windows = [
+        (pd.Timestamp(2023, 4, 1), pd.Timestamp(2024, 3, 31)),
+        (pd.Timestamp(2099, 4, 1), pd.Timestamp(2100, 3, 31)),
+        (pd.Timestamp(2024, 2, 29), pd.Timestamp(2024, 2, 29)),
+        (pd.Timestamp(2025, 3, 31), pd.Timestamp(2025, 3, 1)),
+    ]
+    while len(windows) < count:
+        kind = rng.choice(["fy", "day", "month", "around maturity", "years"])
+        row = df.iloc[int(rng.integers(len(df)))]
+        if kind == "fy":
+            year = int(rng.choice([row["DATE"].year, row["MATURITY DATE"].year]))
+            windows.append((pd.Timestamp(year, 4, 1), pd.Timestamp(year + 1, 3, 31)))
+        elif kind == "day":
+            day = pd.Timestamp(adversarial_date(rng, [row["DATE"].year + 1]))
+            windows.append((day, day))
+        elif kind == "month":
+            day = pd.Timestamp(adversarial_date(rng, [row["DATE"].year]))
+            windows.append((day.replace(day=1), day + pd.offsets.MonthEnd(0)))
+        elif kind == "around maturity":
+            # Windows ending the day before, on, or after a maturity
+            maturity = row["MATURITY DATE"]
+            end = maturity + pd.Timedelta(days=int(rng.integers(-1, 2)))
+            windows.append((end - pd.Timedelta(days=int(rng.integers(0, 400))), end))
+        else:
+            start = row["DATE"] + pd.Timedelta(days=int(rng.integers(-30, 30)))
+            windows.append((start, start + pd.Timedelta(days=int(rng.integers(365, 6 * 366)))))
+    return windows
+
+
+# -- Cases ---------------------------------------------------------------
+
+
+def _rows(df):
+    return zip(
+        df["DATE"],
+        df["INTEREST PAYABLE"].astype(str),
+        df["MATURITY DATE"],
+        df["DEPOSIT AMT"],
+        df["RATE OF INT"],
+    )
+
+
+def _by_row(n, rows, values):
+    grouped = [[] for _ in range(n)]
+    for row, value in zip(rows, values):
+        grouped[row].append(value)
+    return grouped
+
+
+def _window_reference(function):
+    def reference(df, window):
+        return [
+            [pd.Timestamp(d) for d in function(start, frequency, window[0], window[1], maturity)]
+            for start, frequency, maturity, _, _ in _rows(df)
+        ]
+
+    return reference
+
+
+def _fy_fast(df, window):
+    rows, dates = DepositSchedule.from_frame(df).window_ledger(*window)
+    return _by_row(len(df), rows, pd.to_datetime(dates))
+
+
+def _date_range_fast(df, window):
+    rows, dates, _ = PaymentIndex.from_frame(df, BLOCK_SIZE).payments(*window)
+    return _by_row(len(df), rows, pd.to_datetime(dates))
+
+
+def _window_interest_reference(df, window):
+    """Payments and interest of each deposit, with the app's original formula."""
+    results = []
+    for start, frequency, maturity, amount, rate in _rows(df):
+        dates = calculate_date_range_interest_dates(start, frequency, *window, maturity)
+        per_payment = calculate_interest_amount(amount, rate, frequency)
+        if frequency != "C":
+            interest = len(dates) * per_payment
+        else:
+            interest = per_payment if any(date <= window[1] for date in dates) else 0
+        results.append((len(dates), float(interest).hex()))
+    return results
+
+
+def _window_interest_fast(df, window):
+    df = with_window_interest(df.copy(), *window, "WINDOW")
+    return [
+        (int(count), float(interest).hex())
+        for count, interest in zip(df["WINDOW_PAYMENTS"], df["WINDOW_INTEREST_AMOUNT"])
+    ]
+
+
+# name: (reference, fast, kind of argument)
+CASES = {
+    "next interest date": (
+        lambda df, today: [
+            pd.Timestamp(calculate_next_interest_date(start, frequency, today, maturity))
+            for start, frequency, maturity, _, _ in _rows(df)
+        ],
+        lambda df, today: list(
+            pd.to_datetime(DepositSchedule.from_frame(df).next_interest_dates(today))
+        ),
+        "day",
+    ),
+    "per-payment interest": (
+        lambda df, _: [
+            float(calculate_interest_amount(amount, rate, frequency)).hex()
+            for _, frequency, _, amount, rate in _rows(df)
+        ],
+        lambda df, _: [float(value).hex() for value in per_payment_interest(df)],
+        None,
+    ),
+    "FY interest dates": (
+        _window_reference(calculate_financial_year_interest_dates),
+        _fy_fast,
+        "window",
+    ),
+    "date range payments": (
+        _window_reference(calculate_date_range_interest_dates),
+        _date_range_fast,
+        "window",
+    ),
+    "window interest": (_window_interest_reference, _window_interest_fast, "window"),
+}
+
+
+def divergences(case, df, argument):
+    """Positions of the deposits on which the fast path disagrees with the reference."""
+    reference, fast, _ = CASES[case]
+    expected, got = reference(df, argument), fast(df, argument)
+    if len(expected) != len(got):
+        return list(range(len(df)))
+    return [i for i, (e, g) in enumerate(zip(expected, got)) if e != g]
+
+
+# -- Shrinking -----------------------------------------------------------
+
+
+def shrink_rows(case, df, argument, diverging):
+    """The fewest deposits of ``df`` that still diverge: one if possible, else ddmin."""
+    for i in diverging[:20]:
+        single = df.iloc[[i]].reset_index(drop=True)
+        if divergences(case, single, argument):
+            return single
+
+    # The divergence depends on other deposits (an index built over the book)
+    chunk = len(df) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(df):
+            candidate = df.drop(df.index[start : start + chunk]).reset_index(drop=True)
+            if len(candidate) and divergences(case, candidate, argument):
+                df = candidate
+            else:
+                start += chunk
+        chunk //= 2
+    return df
+
+
+def shrink_window(case, df, window):
+    """Move the window edges towards each other while the divergence persists."""
+    start, end = window
+    if start > end:
+        return window
+    for edge in ("start", "end"):
+        step = (end - start).days // 2
+        while step >= 1:
+            if edge == "start":
+                candidate = (start + pd.Timedelta(days=step), end)
+            else:
+                candidate = (start, end - pd.Timedelta(days=step))
+            if candidate[0] <= candidate[1] and divergences(case, df, candidate):
+                start, end = candidate
+            else:
+                step //= 2
+    return start, end
+
+
+def _describe(value):
+    if isinstance(value, tuple) and all(isinstance(v, pd.Timestamp) for v in value):
+        return [v.date().isoformat() for v in value]
+    if isinstance(value, pd.Timestamp):
+        return value.date().isoformat()
+    if isinstance(value, list):
+        return [_describe(v) for v in value]
+    return value
+
+
+def reproducer(case, df, argument, diverging):
+    """A minimal failing input, with the expected and actual results."""
+    df = shrink_rows(case, df, argument, diverging)
+    if CASES[case][2] == "window":
+        argument = shrink_window(case, df, argument)
+    reference, fast, _ = CASES[case]
+    return {
+        "case": case,
+        "argument": _describe(argument),
+        "deposits": [
+            {
+                "DATE": start.date().isoformat(),
+                "MATURITY DATE": maturity.date().isoformat(),
+                "INTEREST PAYABLE": frequency,
+                "DEPOSIT AMT": amount,
+                "RATE OF INT": rate,
+            }
+            for start, frequency, maturity, amount, rate in _rows(df)
+        ],
+        "expected": _describe(reference(df, argument)),
+        "got": _describe(fast(df, argument)),
+    }
+
+
+# -- Driver --------------------------------------------------------------
+
+
+def timed(function, *args, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def check_book(df, days, windows, repeat, results):
+    arguments = {"day": days, "window": windows, None: [None]}
+    for case, (reference, fast, kind) in CASES.items():
+        row = results.setdefault(
+            case,
+            {"checks": 0, "divergences": 0, "reference_s": 0.0, "fast_s": 0.0, "reproducers": []},
+        )
+        for argument in arguments[kind]:
+            row["checks"] += len(df)
+            row["reference_s"] += timed(reference, df, argument)
+            row["fast_s"] += timed(fast, df, argument, repeat=repeat)
+            diverging = divergences(case, df, argument)
+            if diverging:
+                row["divergences"] += len(diverging)
+                # One reproducer per argument is enough to locate the bug
+                row["reproducers"].append(reproducer(case, df, argument, diverging))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=10, help="adversarial books to generate")
+    parser.add_argument("--deposits", type=int, default=200, help="deposits per book")
+    parser.add_argument("--days", type=int, default=8, help="'today' values per book")
+    parser.add_argument("--windows", type=int, default=12, help="windows per book")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timing runs of the fast paths")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    results = {}
+    for _ in range(args.books):
+        df = adversarial_book(rng, args.deposits)
+        days = adversarial_days(rng, df, args.days)
+        windows = adversarial_windows(rng, df, args.windows)
+        check_book(df, days, windows, args.repeat, results)
+
+    print(
+        f"{args.books} books of {args.deposits} deposits (seed {args.seed}), "
+        f"{args.days} days and {args.windows} windows each"
+    )
+    print(f"{'case':<22} {'checks':>8} {'diverging':>9} {'reference':>11} {'fast':>9} {'speedup':>8}")
+    for case, row in results.items():
+        row["speedup"] = row["reference_s"] / row["fast_s"]
+        print(
+            f"{case:<22} {row['checks']:>8} {row['divergences']:>9} "
+            f"{row['reference_s'] * 1000:>9.0f}ms {row['fast_s'] * 1000:>7.1f}ms "
+            f"{row['speedup']:>7.0f}x"
+        )
+
+    failed = [r for row in results.values() for r in row["reproducers"]]
+    for example in failed[:10]:
+        print(f"\n{example['case']} diverges on {example['argument']}:")
+        for deposit in example["deposits"]:
+            print(f"  {deposit}")
+        print(f"  expected {example['expected']}")
+        print(f"  got      {example['got']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"seed": args.seed, "cases": results}, f, indent=2, default=str)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
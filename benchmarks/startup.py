@@ -0,0 +1,77 @@
+"""
+Cold-start benchmark for the Streamlit app.
+
+Imports the login path (fixed_deposit_calculator.app) in fresh interpreters
+and checks it against an import-time budget, and that none of the heavy
+modules only the dashboard needs were pulled in. The dashboard import is
+timed too, for reference.
+
+    python benchmarks/startup.py --budget 1.0 --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the login screen must not wait for
+HEAVY_MODULES = ["pandas", "numpy", "cryptography", "babel", "dateutil", "openpyxl"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure_import(module, runs):
+    """Import ``module`` in ``runs`` fresh interpreters and return (median seconds, modules)."""
+    timings = []
+    modules = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        modules = result["modules"]
+    return statistics.median(timings), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--budget", type=float, default=1.0, help="login path import budget in seconds"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    args = parser.parse_args()
+
+    login_seconds, login_modules = measure_import("fixed_deposit_calculator.app", args.runs)
+    dashboard_seconds, _ = measure_import("fixed_deposit_calculator.dashboard", args.runs)
+
+    leaked = [
+        name for name in HEAVY_MODULES
+        if any(module == name or module.startswith(name + ".") for module in login_modules)
+    ]
+
+    print(f"login path import:     {login_seconds * 1000:8.1f} ms (budget {args.budget * 1000:.0f} ms)")
+    print(f"dashboard import:      {dashboard_seconds * 1000:8.1f} ms")
+    print(f"heavy modules on login: {', '.join(leaked) or 'none'}")
+
+    if leaked or login_seconds > args.budget:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
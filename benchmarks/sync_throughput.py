@@ -0,0 +1,77 @@
+"""
+Calendar sync benchmark against the in-memory fake Calendar client.
+
+Builds the quickstart event payloads for a synthetic book and compares a
+sequential compute-then-insert loop with the async producer/sender pipeline.
+
+    python benchmarks/sync_throughput.py --deposits 500 --latency 0.05 --concurrency 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calendar_sync import FakeCalendarClient, run_sync  # noqa: E402
+from quickstart import portfolio_events  # noqa: E402
+
+
+def synthetic_book(n, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, n), unit="D")
+    tenor = rng.integers(6, 84, n)
+    return pd.DataFrame(
+        {
+            "DEP NO": rng.integers(10000, 99999, n),
+            "NAME OF THE DEPOSITEE": rng.choice(["Asha", "Vivek", "Amey"], n),
+            "DATE": start,
+            "MATURITY DATE": [s + pd.DateOffset(months=int(t)) for s, t in zip(start, tenor)],
+            "DEPOSIT AMT": rng.integers(1, 100, n) * 10000.0,
+            "RATE OF INT": rng.choice([0.065, 0.071, 0.0725], n),
+            "INTEREST PAYABLE": rng.choice(list("MQHYC"), n),
+            "CUST ID": rng.integers(1000, 9999, n),
+        }
+    )
+
+
+async def sequential(client, events):
+    for event in events:
+        await client.insert_event(event)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--deposits", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per insert")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    df = synthetic_book(args.deposits)
+
+    start = time.perf_counter()
+    events = list(portfolio_events(df))
+    compute = time.perf_counter() - start
+
+    client = FakeCalendarClient(latency=args.latency)
+    start = time.perf_counter()
+    asyncio.run(sequential(client, portfolio_events(df)))
+    sequential_seconds = time.perf_counter() - start
+
+    client = FakeCalendarClient(latency=args.latency)
+    report = run_sync(client, portfolio_events(df), concurrency=args.concurrency)
+
+    io_bound = len(events) * args.latency / args.concurrency
+    print(f"events:               {len(events)}")
+    print(f"compute only:         {compute:.2f}s")
+    print(f"I/O only (ideal):     {io_bound:.2f}s")
+    print(f"sequential:           {sequential_seconds:.2f}s")
+    print(f"pipeline:             {report.seconds:.2f}s ({report.throughput:.1f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
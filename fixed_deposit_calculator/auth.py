@@ -0,0 +1,86 @@
+import streamlit as st
+
+from fixed_deposit_calculator.passwords import verify_password_hash
+
+
+def load_key() -> bytes:
+    """
+    Load the Fernet key from Streamlit secrets. Not cached: the secrets are
+    reloaded when secrets.toml changes, e.g. during a key rotation.
+    """
+    key_str = st.secrets["cryptography"]["fernet_key"]
+    return key_str.encode()
+
+
+def load_keys() -> tuple:
+    """
+    The Fernet key followed by the previous keys of a rotation still being
+    rolled out ([cryptography] previous_fernet_keys), newest first.
+    """
+    previous = st.secrets["cryptography"].get("previous_fernet_keys", [])
+    return (load_key(),) + tuple(key.encode() for key in previous)
+
+
+@st.cache_data(show_spinner=False)
+def decrypt_password_hash(encrypted_hash: str, keys: tuple) -> str:
+    """
+    Decrypt the password hash, once per encrypted hash and keys.
+    """
+    # Imported here so the login screen does not wait for cryptography
+    from fixed_deposit_calculator.keys import fernet
+
+    return fernet(keys).decrypt(encrypted_hash.encode()).decode()
+
+
+def get_password_hash() -> str:
+    """
+    Get the encrypted password hash from Streamlit secrets and decrypt it.
+    """
+    try:
+        encrypted_hash = st.secrets["authentication"]["encrypted_password_hash"]
+        return decrypt_password_hash(encrypted_hash, load_keys())
+    except KeyError:
+        st.error("Encrypted password hash not configured in secrets. Authentication failed.")
+        st.stop()
+    except Exception as e:
+        st.error(f"Error decrypting password hash: {str(e)}")
+        st.stop()
+
+
+def verify_password(password: str) -> bool:
+    """
+    Verify if the provided password matches the stored hash.
+    """
+    stored_hash = get_password_hash()
+    with st.spinner("Verifying password..."):
+        return verify_password_hash(password, stored_hash)
+
+
+def check_authentication():
+    """Check if the user is authenticated and handle the login process.
+    Returns True if authenticated, False otherwise."""
+    # Initialize session state for authentication
+    if 'authenticated' not in st.session_state:
+        st.session_state.authenticated = False
+
+    if not st.session_state.authenticated:
+        st.title("Fixed Deposit Interest Calculator")
+        st.subheader("Login Required")
+        
+        # Create login form
+        with st.form("login_form"):
+            password = st.text_input("Enter Password", type="password")
+            submit_button = st.form_submit_button("Login")
+            
+            if submit_button:
+                if verify_password(password):
+                    st.session_state.authenticated = True
+                    st.rerun()
+                else:
+                    st.error("Incorrect password. Please try again.")
+        
+        # User is not authenticated
+        return False
+    
+    # User is authenticated
+    return True
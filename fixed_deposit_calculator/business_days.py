@@ -0,0 +1,163 @@
+"""
+Business-day adjustment of payment dates.
+
+Banks pay interest falling on a Sunday, a second or fourth Saturday or a bank
+holiday on another business day. A BusinessCalendar is built once from a
+local holiday file and precomputes, with numpy.busday_offset, the adjusted
+date of every day in a wide range, so adjusting a whole column of payment
+dates is one array gather.
+
+``following`` moves a date to the next business day. ``modified_following``
+does the same unless that lands in the next month, in which case the date
+moves back to the previous business day, keeping payments in their month.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from fixed_deposit_calculator.schedule import days_in_month
+
+# Convention name -> numpy.busday_offset roll
+CONVENTIONS = {"following": "following", "modified_following": "modifiedfollowing"}
+
+# Monday to Saturday; the second and fourth Saturdays are added as holidays
+BANK_WEEKMASK = "1111110"
+
+# Range of the precomputed table; other dates go through busday_offset directly
+TABLE_START = np.datetime64("1970-01-01", "D")
+TABLE_END = np.datetime64("2101-01-01", "D")
+
+
+def _to_days(values):
+    return np.asarray(values, dtype="datetime64[D]")
+
+
+def load_holidays(path):
+    """
+    Holiday dates from a local file: an iCalendar (.ics) export, or a text or
+    CSV file with a YYYY-MM-DD date first on each line. Headers, blank lines
+    and ``#`` comments are skipped. An iCalendar DTSTART may be a date or a
+    date-time (floating, TZID or UTC); either way only its date is kept.
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    if path.lower().endswith(".ics"):
+        # 20250126, 20250126T000000 or 20250126T000000Z: the date comes first
+        values = [line.rpartition(":")[2][:8] for line in lines if line.startswith("DTSTART")]
+        dates = pd.to_datetime(pd.Series(values, dtype=str), errors="coerce", format="%Y%m%d")
+    else:
+        values = [
+            line.split(",")[0].strip() for line in lines if line and not line.startswith("#")
+        ]
+        dates = pd.to_datetime(pd.Series(values, dtype=str), errors="coerce", format="ISO8601")
+    return np.unique(dates.dropna().to_numpy(dtype="datetime64[D]"))
+
+
+def second_and_fourth_saturdays(start, end):
+    """The second and fourth Saturdays of every month from ``start`` to ``end``."""
+    months = np.arange(
+        _to_days(start).astype("datetime64[M]"), _to_days(end).astype("datetime64[M]") + 1
+    )
+    first = np.busday_offset(months.astype("datetime64[D]"), 0, roll="forward", weekmask="Sat")
+    return np.sort(np.concatenate([first + 7, first + 21]))
+
+
+class BusinessCalendar:
+    """Business days of a bank and the convention moving payments onto them."""
+
+    def __init__(
+        self, holidays=(), convention="following", weekmask=BANK_WEEKMASK, bank_saturdays=True
+    ):
+        if convention not in CONVENTIONS:
+            raise ValueError(
+                f"Unknown convention {convention!r}, expected one of {', '.join(CONVENTIONS)}"
+            )
+        self.convention = convention
+        self.weekmask = weekmask
+        self.roll = CONVENTIONS[convention]
+
+        holidays = np.unique(_to_days(holidays))
+        start, end = TABLE_START, TABLE_END
+        if len(holidays):
+            start = min(start, holidays[0].astype("datetime64[Y]").astype("datetime64[D]"))
+            end = max(end, (holidays[-1].astype("datetime64[Y]") + 1).astype("datetime64[D]"))
+        if bank_saturdays:
+            holidays = np.union1d(holidays, second_and_fourth_saturdays(start, end))
+        self.holidays = holidays
+        self.busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=holidays)
+
+        days = np.arange(start, end)
+        self.table_start = start
+        self.table = np.busday_offset(days, 0, roll=self.roll, busdaycal=self.busdaycal)
+        # Largest move of any date, either way; window queries are padded by it
+        self.max_shift = int(np.abs((self.table - days).astype(np.int64)).max())
+
+    @classmethod
+    def from_file(cls, path, convention="following", **kwargs):
+        return cls(load_holidays(path), convention, **kwargs)
+
+    def adjust(self, dates):
+        """The business day each date is paid on; NaT stays NaT."""
+        dates = _to_days(dates)
+        offsets = (dates - self.table_start).astype(np.int64)
+        inside = (offsets >= 0) & (offsets < len(self.table))
+        if inside.all():
+            return self.table[offsets]
+
+        result = dates.copy()
+        result[inside] = self.table[offsets[inside]]
+        outside = ~inside & ~np.isnat(dates)
+        result[outside] = np.busday_offset(
+            dates[outside], 0, roll=self.roll, busdaycal=self.busdaycal
+        )
+        return result
+
+    def is_business_day(self, dates):
+        return np.is_busday(_to_days(dates), busdaycal=self.busdaycal)
+
+    def digest(self):
+        """A hex digest of everything that decides the adjusted dates."""
+        sha = hashlib.sha256(f"{self.convention}\0{self.weekmask}\0".encode())
+        sha.update(self.holidays.astype(np.int64).tobytes())
+        return sha.hexdigest()
+
+
+def widen(window_start, window_end, calendar=None):
+    """
+    A (start, end) window padded by the calendar's largest shift, to select
+    the deposits whose adjusted payments may fall in [window_start, window_end].
+    Either bound may be None.
+    """
+    if calendar is None or not calendar.max_shift:
+        return window_start, window_end
+    pad = pd.Timedelta(calendar.max_shift, unit="D")
+    return (
+        None if window_start is None else pd.Timestamp(window_start) - pad,
+        None if window_end is None else pd.Timestamp(window_end) + pad,
+    )
+
+
+def recurrence_adjustments(start_date, until, interval, calendar):
+    """
+    The EXDATE and RDATE dates moving the occurrences of a monthly RRULE (the
+    start date's day every ``interval`` months, up to ``until``) onto business
+    days: occurrences that move are excluded and their adjusted dates added.
+    """
+    start = np.datetime64(pd.Timestamp(start_date), "D")
+    until = np.datetime64(pd.Timestamp(until), "D")
+    day = int((start - start.astype("datetime64[M]")).astype(np.int64)) + 1
+
+    months = np.arange(
+        start.astype("datetime64[M]").astype(np.int64),
+        until.astype("datetime64[M]").astype(np.int64) + 1,
+        interval,
+    )
+    # Like RFC 5545, months without the start date's day have no occurrence
+    months = months[days_in_month(months) >= day]
+    dates = months.astype("datetime64[M]").astype("datetime64[D]") + (day - 1)
+    dates = dates[dates <= until]
+
+    adjusted = calendar.adjust(dates)
+    moved = adjusted != dates
+    return pd.to_datetime(dates[moved]), pd.to_datetime(adjusted[moved])
@@ -0,0 +1,106 @@
+import decimal
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# en_IN currency pattern: "¤#,##,##0.00" with a "-" prefix for negatives
+CURRENCY_SYMBOL = "₹"
+_PAISA = decimal.Decimal("0.01")
+
+# Values at or beyond this magnitude are rare enough to leave to Babel, whose
+# decimal context then starts to round significant digits.
+_LARGE = 10**15
+
+
+def group_lakh(digits):
+    """Group an unsigned digit string the Indian way: 1,23,45,678."""
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    if len(head) % 2:
+        head = "0" + head
+        groups = [head[i:i + 2] for i in range(0, len(head), 2)]
+        groups[0] = groups[0][1:]
+    else:
+        groups = [head[i:i + 2] for i in range(0, len(head), 2)]
+    return ",".join(groups) + "," + tail
+
+
+def _format_with_babel(value):
+    from babel.numbers import format_currency
+
+    return format_currency(value, "INR", locale="en_IN")
+
+
+def format_inr(value):
+    """
+    Format a number as Indian rupees, e.g. 1234567.891 -> "₹12,34,567.89".
+
+    Produces the same output as Babel's ``format_currency(value, "INR",
+    locale="en_IN")`` (same str -> Decimal conversion and half-even rounding)
+    without resolving locale data on every call.
+    """
+    if isinstance(value, decimal.Decimal):
+        return _format_decimal(value)
+    return _format_number_string(str(value))
+
+
+@lru_cache(maxsize=65536)
+def _format_number_string(text):
+    # Keyed on the string so that 0.0 and -0.0 are cached separately
+    return _format_decimal(decimal.Decimal(text))
+
+
+def _format_decimal(number):
+    if not number.is_finite() or abs(number) >= _LARGE:
+        return _format_with_babel(number)
+
+    sign = "-" if number.is_signed() else ""
+    paise = int(abs(number).quantize(_PAISA, rounding=decimal.ROUND_HALF_EVEN) * 100)
+    rupees, paise = divmod(paise, 100)
+    return f"{sign}{CURRENCY_SYMBOL}{group_lakh(str(rupees))}.{paise:02d}"
+
+
+def format_inr_array(values):
+    """
+    Vectorized format_inr for a whole NumPy array or pandas column.
+
+    Rounding to paise is done in one NumPy pass; only values sitting within
+    floating point error of a half paisa (where half-even rounding of the
+    decimal string matters) or outside the fast range go through format_inr.
+    Returns a Series with the same index for a Series, otherwise an object array.
+    """
+    index = values.index if isinstance(values, pd.Series) else None
+    array = np.asarray(values, dtype=float)
+
+    with np.errstate(invalid="ignore"):
+        scaled = np.abs(array) * 100
+        floor = np.floor(scaled)
+        fraction = scaled - floor
+        tolerance = 1e-7 + scaled * 1e-14
+        exact = (
+            np.isfinite(array)
+            & (np.abs(array) < _LARGE)
+            & (np.abs(fraction - 0.5) > tolerance)
+        )
+
+    paise = np.where(exact, floor + (fraction > 0.5), 0).astype(np.int64)
+    rupees, paise = np.divmod(paise, 100)
+    signs = np.where(np.signbit(array), "-", "")
+
+    result = np.empty(array.shape, dtype=object)
+    result.flat[:] = [
+        f"{sign}{CURRENCY_SYMBOL}{group_lakh(str(r))}.{p:02d}" if ok else format_inr(v)
+        for ok, sign, r, p, v in zip(
+            exact.ravel().tolist(),
+            signs.ravel().tolist(),
+            rupees.ravel().tolist(),
+            paise.ravel().tolist(),
+            array.ravel().tolist(),
+        )
+    ]
+
+    if index is not None:
+        return pd.Series(result, index=index)
+    return result
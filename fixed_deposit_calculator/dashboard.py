@@ -0,0 +1,526 @@
+import os
+import threading
+
+import streamlit as st
+import pandas as pd
+import datetime
+
+from fixed_deposit_calculator.auth import load_keys
+from fixed_deposit_calculator.business_days import BusinessCalendar, widen
+from fixed_deposit_calculator.formatter import my_column_config, format_currency_to_inr
+from fixed_deposit_calculator.projection import maturity_ladder
+from fixed_deposit_calculator.query import PaymentIndex, due_between
+from fixed_deposit_calculator.reports import (
+    ARTIFACTS_DIR,
+    publish_report,
+    read_artifact,
+    report_windows,
+    with_next_interest,
+    with_window_interest,
+)
+from fixed_deposit_calculator.storage import open_store
+from fixed_deposit_calculator.tds import TDS_THRESHOLD, tds_summary
+from fixed_deposit_calculator.watcher import BackgroundWatcher, related_paths
+
+
+enc_path = os.path.join(os.path.dirname(__file__), "data.xlsx.enc")
+
+
+def storage_path():
+    """
+    The portfolio to load: ``[storage] path`` from secrets (an encrypted
+    workbook or an SQLite database, relative to this package), else data.xlsx.enc.
+    """
+    path = st.secrets.get("storage", {}).get("path")
+    if path is None:
+        return enc_path
+    return os.path.join(os.path.dirname(__file__), path)
+
+
+@st.cache_resource(show_spinner=False)
+def get_store(path, key, modified):
+    """
+    One store per portfolio, shared across reruns. ``modified`` is only part
+    of the cache key, so a replaced workbook is decrypted again; so is
+    ``key``, read from the secrets on every rerun, so a store opens again
+    under rotated keys.
+    """
+    return open_store(path, key)
+
+
+def artifacts_dir():
+    """Where report artifacts are kept: ``[reports] dir`` from secrets, relative to this package."""
+    directory = st.secrets.get("reports", {}).get("dir")
+    if directory is None:
+        return ARTIFACTS_DIR
+    return os.path.join(os.path.dirname(__file__), directory)
+
+
+@st.cache_resource(show_spinner=False)
+def get_business_calendar(path, convention, modified):
+    """One calendar per holiday file and convention; ``modified`` only keys the cache."""
+    return BusinessCalendar.from_file(path, convention)
+
+
+def calendar_settings():
+    """
+    ``[business_days] holidays`` (a holiday file relative to this package)
+    and ``convention`` (following or modified_following) from secrets, as
+    (path, convention, modified), or None when no holiday file is configured.
+    """
+    settings = st.secrets.get("business_days", {})
+    if settings.get("holidays") is None:
+        return None
+    path = os.path.join(os.path.dirname(__file__), settings["holidays"])
+    return path, settings.get("convention", "following"), os.path.getmtime(path)
+
+
+def business_calendar():
+    """
+    The calendar payments are moved onto, from calendar_settings. None,
+    paying on the exact dates, when no holiday file is configured.
+    """
+    settings = calendar_settings()
+    if settings is None:
+        return None
+    return get_business_calendar(*settings)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_payment_index(digest, active_between, settings, _df, _calendar=None):
+    """
+    The PaymentIndex of ``_df``, the deposits a store with ``digest`` returns
+    for ``active_between`` under the calendar ``settings``. Those arguments
+    only key the cache, so the index is built once per data version rather
+    than on every rerun.
+    """
+    return PaymentIndex.from_frame(_df, calendar=_calendar)
+
+
+# The running refresher of each portfolio, stopped when a new one replaces it
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+@st.cache_resource(show_spinner=False, validate=lambda watcher: not watcher.stopping.is_set())
+def start_refresher(path, key, directory, settings=None):
+    """
+    One watcher thread per server that re-opens the portfolio once it has
+    been replaced, so the decryption and the day's report are done before
+    the next visitor rather than during their first rerun. A new ``key``
+    (rotation) or calendar ``settings`` (see calendar_settings) starts a new
+    watcher and stops the previous one of ``path``; a stopped watcher is
+    never served from the cache.
+    """
+    calendar = None if settings is None else get_business_calendar(*settings)
+
+    def refresh():
+        store = get_store(path, key, os.path.getmtime(path))
+        publish_report(store, key, datetime.date.today(), directory, calendar)
+
+    watcher = BackgroundWatcher(related_paths(path), refresh)
+    with _refreshers_lock:
+        previous = _refreshers.get(path)
+        if previous is not None:
+            previous.stop()
+        _refreshers[path] = watcher
+        watcher.start()
+    return watcher
+
+
+def render_report(entry, key, directory):
+    """Show a pre-rendered report and offer its files for download."""
+    st.caption(f"Pre-rendered report, data version {entry['digest'][:12]}")
+    st.html(read_artifact(entry, "report.html", key, directory).decode())
+
+    columns = st.columns(len(entry["files"]) - 1)
+    downloads = [name for name in entry["files"] if name != "report.html"]
+    for column, name in zip(columns, downloads):
+        with column:
+            st.download_button(
+                f"Download {name}",
+                data=read_artifact(entry, name, key, directory),
+                file_name=f"{entry['date']}-{name}",
+            )
+
+
+def render_dashboard():
+    """Render the calculator for an authenticated user."""
+    st.title("Fixed Deposit Interest Calculator")
+
+    # Display current date
+    today = datetime.date.today()
+    st.write(f"Current Date: {today.strftime('%B %d, %Y')}")
+
+    # Financial year, and the date range for the Date Based Interest Summary
+    # (April 1 to March 31 of current year)
+    fy_start, fy_end, date_range_start, date_range_end = report_windows(today)
+
+    try:
+        # Load the keys
+        key = load_keys()
+
+        path = storage_path()
+        if not os.path.exists(path):
+            st.error(f"Portfolio `{path}` not found.")
+            return
+        store = get_store(path, key, os.path.getmtime(path))
+        calendar = business_calendar()
+
+        # Shown on the report view too: the excluded deposits are missing there as well
+        if not store.problems.empty:
+            st.warning(
+                f"{store.problems['PROBLEM'].count()} problem(s) found in the data. "
+                "The affected deposits are excluded below."
+            )
+            with st.expander("Data problems"):
+                st.dataframe(store.problems.astype(str), hide_index=True, use_container_width=True)
+
+        # Serve the summaries from the report artifacts when they are current,
+        # rendering them once for each data version and day
+        directory = artifacts_dir()
+        if st.secrets.get("refresher", {}).get("enabled", False):
+            start_refresher(path, key, directory, calendar_settings())
+        try:
+            report = publish_report(store, key, today, directory, calendar)
+        except OSError as e:
+            report = None
+            st.caption(f"Reports could not be saved ({e}); showing the live dashboard.")
+        if report is not None and not st.toggle(
+            "Live dashboard", help="Show every deposit, the monthly tabs and the TDS projection"
+        ):
+            render_report(report, key, directory)
+            return
+
+        # Every deposit, for the full listing and the portfolio totals
+        df = with_next_interest(store.deposits(), today, calendar)
+
+        # The monthly, FY and date range views only load the deposits that can
+        # pay interest in their window (widened by the business-day shifts).
+        # The monthly tabs compare against the previous month, so deposits that
+        # matured then are kept.
+        previous_month_start = pd.Timestamp(today.year, today.month, 1) - pd.DateOffset(months=1)
+        upcoming_df = with_next_interest(
+            store.deposits(active_between=widen(previous_month_start, None, calendar)),
+            today,
+            calendar,
+        )
+
+        # Payment indexes are cached per data version and window
+        digest = store.digest()
+        fy_window = widen(fy_start, fy_end, calendar)
+        fy_deposits_df = store.deposits(active_between=fy_window)
+        fy_deposits_df = with_window_interest(
+            fy_deposits_df,
+            fy_start,
+            fy_end,
+            "FY",
+            calendar,
+            get_payment_index(digest, fy_window, calendar_settings(), fy_deposits_df, calendar),
+        )
+        range_window = widen(date_range_start, date_range_end, calendar)
+        range_deposits_df = store.deposits(active_between=range_window)
+        range_index = get_payment_index(
+            digest, range_window, calendar_settings(), range_deposits_df, calendar
+        )
+
+        # Format currency columns for display
+        display_df = df.copy()
+
+        # Convert frequency codes to full text
+        frequency_map = {
+            "M": "Monthly",
+            "Q": "Quarterly",
+            "H": "Half-yearly",
+            "Y": "Yearly",
+            "C": "Cumulative",
+        }
+        display_df["INTEREST PAYABLE"] = display_df["INTEREST PAYABLE"].map(
+            frequency_map
+        )
+        upcoming_display_df = upcoming_df.copy()
+        upcoming_display_df["INTEREST PAYABLE"] = upcoming_display_df["INTEREST PAYABLE"].map(
+            frequency_map
+        )
+
+        # Display all deposits
+        st.header("All Fixed Deposits")
+        st.dataframe(
+            display_df[
+                [
+                    "DEP NO",
+                    "NAME OF THE DEPOSITEE",
+                    "DATE",
+                    "MATURITY DATE",
+                    "DEPOSIT AMT",
+                    "RATE OF INT",
+                    "INTEREST PAYABLE",
+                    "NEXT INTEREST DATE",
+                    "INTEREST AMOUNT",
+                ]
+            ].astype(str),
+            hide_index=True,
+            use_container_width=True,
+            column_config=my_column_config
+        )
+
+        # Filter deposits with interest due this month
+        this_month_df = upcoming_df[upcoming_df["DUE THIS MONTH"] == True]
+
+        # Summary section
+        st.markdown("---")
+        st.header(f"Interest Summary for {today.strftime('%B %Y')}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Total Deposits", len(df))
+            st.metric("Deposits with Interest Due This Month", len(this_month_df))
+
+        with col2:
+            total_deposit = df["DEPOSIT AMT"].sum()
+            st.metric("Total Deposit Amount", format_currency_to_inr(total_deposit))
+            total_interest = this_month_df["INTEREST AMOUNT"].sum()
+            st.metric("Total Interest Due This Month", format_currency_to_inr(total_interest))
+
+        # Create tabs for all months with interest due
+        st.markdown("---")
+        
+        # Get all unique months where deposits have interest due (current and future)
+        # First, filter out nulls and get all unique next interest dates
+        interest_months = upcoming_df["NEXT INTEREST MONTH"].dropna().unique()
+
+        # Filter to include only current and future months
+        future_months = sorted(
+            period for period in interest_months if period >= pd.Period(today, "M")
+        )
+
+        # Create month names for tabs
+        months = [period.strftime('%B %Y') for period in future_months]
+        
+        # Create tabs
+        if months:
+            # Add a heading before the tabs
+            st.header("Deposits with Interest Due")
+            
+            tabs = st.tabs(months)
+            
+            # For each month tab
+            for i, (tab, period) in enumerate(zip(tabs, future_months)):
+                with tab:
+                    month_date = period.start_time
+                    
+                    # Add the month as a subheader inside the tab
+                    st.subheader(f"{month_date.strftime('%B %Y')}")
+                    
+                    # Filter deposits with interest due in this month
+                    in_month = upcoming_df["NEXT INTEREST MONTH"] == period
+                    month_df = upcoming_df[in_month]
+                    display_month_df = upcoming_display_df[in_month]
+                    
+                    if not month_df.empty:
+                        st.dataframe(
+                            display_month_df[
+                                [
+                                    "DEP NO",
+                                    "NAME OF THE DEPOSITEE",
+                                    "DATE",
+                                    "DEPOSIT AMT",
+                                    "RATE OF INT",
+                                    "INTEREST PAYABLE",
+                                    "NEXT INTEREST DATE",
+                                    "INTEREST AMOUNT",
+                                ]
+                            ].astype(str),
+                            hide_index=True,
+                            use_container_width=True,
+                            column_config=my_column_config,
+                        )
+                        
+                        # Calculate total interest for this month
+                        month_total_interest = month_df["INTEREST AMOUNT"].sum()
+                        
+                        # Calculate interest for the previous month
+                        prev_month_date = month_date - pd.DateOffset(months=1)
+                        prev_month_df = upcoming_df[upcoming_df["NEXT INTEREST MONTH"] == period - 1]
+                        
+                        prev_month_total_interest = prev_month_df["INTEREST AMOUNT"].sum() if not prev_month_df.empty else 0
+                        
+                        # Calculate difference and determine arrow direction
+                        interest_diff = month_total_interest - prev_month_total_interest
+                        diff_percentage = (interest_diff / prev_month_total_interest * 100) if prev_month_total_interest > 0 else 0
+                        
+                        # Format the difference message with arrows
+                        if interest_diff > 0:
+                            diff_message = f"↑ {format_currency_to_inr(interest_diff)} (+{diff_percentage:.2f}%) compared to {prev_month_date.strftime('%B %Y')}"
+                            diff_color = "green"
+                        elif interest_diff < 0:
+                            diff_message = f"↓ {format_currency_to_inr(abs(interest_diff))} (-{abs(diff_percentage):.2f}%) compared to {prev_month_date.strftime('%B %Y')}"
+                            diff_color = "red"
+                        else:
+                            diff_message = f"No change compared to {prev_month_date.strftime('%B %Y')}"
+                            diff_color = "gray"
+                        
+                        # Display interest metrics
+                        st.success(
+                            f"Total interest to be received in {month_date.strftime('%B %Y')}: {format_currency_to_inr(month_total_interest)}"
+                        )
+                        
+                        # Display the comparison with previous month
+                        if prev_month_total_interest > 0 or interest_diff != 0:
+                            st.markdown(f"<span style='color:{diff_color};'>{diff_message}</span>", unsafe_allow_html=True)
+                        else:
+                            st.info(f"No interest data available for {prev_month_date.strftime('%B %Y')} for comparison")
+                    else:
+                        st.info(f"No deposits will pay interest in {month_date.strftime('%B %Y')}")
+        else:
+            st.info("No deposits with future interest payments found")
+
+        # Display financial year interest summary
+        st.markdown("---")
+        st.header(
+            f"Financial Year Interest Summary ({fy_start.strftime('%b %d, %Y')} to {fy_end.strftime('%b %d, %Y')})"
+        )
+
+        # Create a dataframe with just FY interest info
+        fy_df = fy_deposits_df[fy_deposits_df["FY_INTEREST_AMOUNT"] > 0].copy()
+
+        if not fy_df.empty:
+            # Format for display
+            fy_display_df = fy_df.copy()
+
+            fy_display_df["INTEREST PAYABLE"] = fy_display_df["INTEREST PAYABLE"].map(
+                frequency_map
+            )
+            fy_display_df["INTEREST FREQUENCY"] = fy_display_df["FY_PAYMENTS"].map(
+                lambda count: f"{count} payment(s)"
+            )
+
+            # Show the table
+            st.dataframe(
+                fy_display_df[
+                    [
+                        "DEP NO",
+                        "NAME OF THE DEPOSITEE",
+                        "DEPOSIT AMT",
+                        "RATE OF INT",
+                        "INTEREST PAYABLE",
+                        "INTEREST FREQUENCY",
+                        "FY_INTEREST_AMOUNT",
+                    ]
+                ].astype(str),
+                hide_index=True,
+                use_container_width=True,
+                column_config=my_column_config,
+            )
+
+            # Show total FY interest
+            total_fy_interest = fy_df["FY_INTEREST_AMOUNT"].sum()
+            st.success(
+                f"Total interest earned in financial year {fy_start.year}-{fy_end.year}: {format_currency_to_inr(total_fy_interest)}"
+            )
+        else:
+            st.info(
+                f"No interest earned in financial year {fy_start.year}-{fy_end.year}"
+            )
+
+        # Display TDS projection per depositee
+        st.subheader(f"TDS Projection for financial year {fy_start.year}-{fy_end.year}")
+        senior_citizens = st.secrets.get("tds", {}).get("senior_citizens", [])
+        tds_df = tds_summary(
+            fy_deposits_df, fy_start, fy_end, senior_citizens=senior_citizens, calendar=calendar
+        )
+
+        if not tds_df.empty:
+            tds_display_df = tds_df.copy()
+            tds_display_df["THRESHOLD CROSSED"] = tds_display_df["THRESHOLD CROSSED"].map(
+                {True: "Yes", False: "No"}
+            )
+            tds_display_df["CROSSING MONTH"] = tds_display_df["CROSSING MONTH"].fillna("-")
+            for column in [
+                "PROJECTED FY INTEREST",
+                "ESTIMATED TDS",
+                "TDS PER PAYMENT AFTER CROSSING",
+            ]:
+                tds_display_df[column] = tds_display_df[column].apply(format_currency_to_inr)
+
+            st.dataframe(
+                tds_display_df.astype(str),
+                hide_index=True,
+                use_container_width=True,
+                column_config=my_column_config,
+            )
+
+            crossed = tds_df[tds_df["THRESHOLD CROSSED"]]
+            if not crossed.empty:
+                st.warning(
+                    f"{len(crossed)} depositee(s) cross the TDS threshold of "
+                    f"{format_currency_to_inr(TDS_THRESHOLD)} this year. Estimated TDS: "
+                    f"{format_currency_to_inr(crossed['ESTIMATED TDS'].sum())}"
+                )
+        else:
+            st.info(f"No interest payments in financial year {fy_start.year}-{fy_end.year}")
+
+        # Display date based interest summary
+        st.markdown("---")
+        st.header(
+            f"Date Based Interest Summary ({date_range_start.strftime('%b %d, %Y')} to {date_range_end.strftime('%b %d, %Y')})"
+        )
+
+        # Every interest payment in the date range, from the payment index
+        payments_df = due_between(
+            range_deposits_df, date_range_start, date_range_end, range_index, calendar
+        )
+        payments_df = payments_df.loc[
+            payments_df["INTEREST AMOUNT"] > 0,
+            ["PAYMENT DATE", "DEP NO", "NAME OF THE DEPOSITEE", "INTEREST AMOUNT"],
+        ]
+
+        if not payments_df.empty:
+            # Show the payments in a single table
+            st.dataframe(
+                payments_df,
+                hide_index=True,
+                use_container_width=True,
+                column_config=my_column_config,
+            )
+
+            # Calculate total interest for the entire period
+            total_date_range_interest = payments_df["INTEREST AMOUNT"].sum()
+
+            # Show total at the bottom
+            st.success(
+                f"Total interest earned in financial year {date_range_start.strftime('%b %d, %Y')} - {date_range_end.strftime('%b %d, %Y')}: {format_currency_to_inr(total_date_range_interest)}"
+            )
+        else:
+            st.info(
+                f"No interest earned in financial year {date_range_start.strftime('%b %d, %Y')} - {date_range_end.strftime('%b %d, %Y')}"
+            )
+
+        # Display the cash flow ladder for liquidity planning
+        st.markdown("---")
+        st.header("Cash Flow Ladder")
+        years = st.slider("Years ahead", min_value=1, max_value=10, value=3)
+        reinvest_rate = None
+        if st.toggle("Reinvest maturing deposits"):
+            reinvest_rate = (
+                st.number_input("Reinvestment rate (%)", min_value=0.0, max_value=99.0, value=7.0)
+                / 100
+            )
+        ladder_df = maturity_ladder(df, today, years, reinvest_rate)
+        ladder_df = ladder_df[(ladder_df["CASH"] > 0) | (ladder_df["REINVESTED"] > 0)]
+        if not ladder_df.empty:
+            ladder_display_df = ladder_df.reset_index()
+            ladder_display_df["MONTH"] = ladder_display_df["MONTH"].dt.strftime("%B %Y")
+            for column in ladder_df.columns:
+                ladder_display_df[column] = ladder_display_df[column].apply(format_currency_to_inr)
+            st.dataframe(
+                ladder_display_df.astype(str),
+                hide_index=True,
+                use_container_width=True,
+                column_config=my_column_config,
+            )
+        else:
+            st.info(f"No cash flows in the next {years} year(s)")
+
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
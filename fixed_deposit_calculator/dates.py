@@ -0,0 +1,7 @@
+import pandas as pd
+
+
+def financial_year(today):
+    """The (start, end) of the Indian financial year containing ``today``."""
+    year = today.year if today.month >= 4 else today.year - 1
+    return pd.Timestamp(year, 4, 1), pd.Timestamp(year + 1, 3, 31)
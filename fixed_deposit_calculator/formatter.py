@@ -1,5 +1,7 @@
+import pandas as pd
 import streamlit as st
-from babel.numbers import format_currency
+
+from fixed_deposit_calculator.currency import format_inr, format_inr_array
 
 date_format = "MMM DD, Y"
 
@@ -16,4 +18,22 @@ my_column_config = {
 }
 
 def format_currency_to_inr(value):
-    return format_currency(value, 'INR', locale='en_IN')
\ No newline at end of file
+    return format_inr(value)
+
+# How my_column_config displays each column, for tables rendered outside Streamlit
+currency_columns = ["DEPOSIT AMT", "INTEREST AMOUNT", "FY_INTEREST_AMOUNT"]
+percent_columns = ["RATE OF INT"]
+date_columns = ["DATE", "MATURITY DATE", "NEXT INTEREST DATE", "PAYMENT DATE"]
+
+
+def format_report_table(df):
+    """Format a table as strings the way the app shows it, for static reports."""
+    df = df.copy()
+    for column in df.columns:
+        if column in currency_columns:
+            df[column] = format_inr_array(df[column])
+        elif column in percent_columns:
+            df[column] = df[column].map(lambda rate: f"{rate:.2%}")
+        elif column in date_columns:
+            df[column] = pd.to_datetime(df[column]).dt.strftime("%b %d, %Y")
+    return df.astype(str)
@@ -0,0 +1,248 @@
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# Column that records which workbook and sheet each row came from
+SOURCE_COLUMN = "SOURCE"
+
+# Columns the fixed deposit calculator relies on
+DEPOSIT_COLUMNS = [
+    "DEP NO",
+    "NAME OF THE DEPOSITEE",
+    "DATE",
+    "MATURITY DATE",
+    "DEPOSIT AMT",
+    "RATE OF INT",
+    "INTEREST PAYABLE",
+]
+
+# Columns loaded when a sheet has them and left empty otherwise
+DEPOSIT_OPTIONAL_COLUMNS = ["CUST ID"]
+
+DATE_COLUMNS = ["DATE", "MATURITY DATE"]
+NUMERIC_COLUMNS = ["DEPOSIT AMT", "RATE OF INT"]
+
+WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm")
+
+# Rows per streamed chunk
+CHUNK_ROWS = 50_000
+
+
+def normalize_column_name(name, columns=None):
+    """
+    Collapse stray whitespace in a header and, when a list of canonical columns
+    is given, map it onto the canonical spelling case-insensitively.
+    """
+    normalized = re.sub(r"\s+", " ", str(name)).strip()
+    for column in columns or []:
+        if normalized.casefold() == column.casefold():
+            return column
+    return normalized
+
+
+def normalize_frame(df, columns=None):
+    """
+    Normalize the column names and dtypes of a freshly parsed sheet.
+    """
+    df = df.rename(columns=lambda name: normalize_column_name(name, columns))
+    df = df.dropna(how="all")
+
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    if "INTEREST PAYABLE" in df.columns:
+        df["INTEREST PAYABLE"] = df["INTEREST PAYABLE"].astype(str).str.strip().str.upper()
+
+    return df
+
+
+def _open_source(source):
+    """Return something pandas/openpyxl can read for a path or in-memory workbook."""
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    return source
+
+
+def _expand_paths(paths):
+    """Expand directories into the workbooks they contain, skipping Excel lock files."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for file_name in sorted(files):
+                    if file_name.endswith(WORKBOOK_EXTENSIONS) and not file_name.startswith("~$"):
+                        yield os.path.join(root, file_name)
+        else:
+            yield path
+
+
+def discover_sources(sources, sheet_names=None):
+    """
+    Discover every (label, source, sheet name) triple for a portfolio.
+
+    Each entry of ``sources`` is either a path to a workbook, a directory of
+    workbooks, or a ``(label, bytes)`` pair for an in-memory (e.g. decrypted)
+    workbook. ``sheet_names`` optionally restricts discovery to those sheets.
+    """
+    workbooks = []
+    for source in sources:
+        if isinstance(source, tuple):
+            workbooks.append(source)
+        else:
+            workbooks.extend((path, path) for path in _expand_paths([source]))
+
+    tasks = []
+    for label, source in workbooks:
+        wb = load_workbook(_open_source(source), read_only=True)
+        try:
+            names = wb.sheetnames
+        finally:
+            wb.close()
+        for sheet_name in names:
+            if sheet_names is None or sheet_name in sheet_names:
+                tasks.append((label, source, sheet_name))
+    return tasks
+
+
+def iter_sheet_chunks(
+    source, sheet_name, columns=None, chunksize=CHUNK_ROWS, optional_columns=None
+):
+    """
+    Stream a sheet as normalized frames of at most ``chunksize`` rows.
+
+    The workbook is opened in openpyxl's ``read_only`` mode and rows are
+    iterated as plain values, so only the projected ``columns`` of one chunk
+    are held in memory at a time instead of the whole workbook object model.
+    Nothing is yielded when the sheet does not contain all of ``columns``.
+    ``optional_columns`` are projected too when present, and left empty otherwise.
+    """
+    optional_columns = optional_columns or []
+    wb = load_workbook(_open_source(source), read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+
+        # The first non-empty row is the header
+        header = next((row for row in rows if any(v is not None for v in row)), None)
+        if header is None:
+            return
+        names = [
+            normalize_column_name(name, (columns or []) + optional_columns)
+            if name is not None
+            else None
+            for name in header
+        ]
+        wanted = columns if columns is not None else [n for n in names if n is not None]
+        if not set(wanted).issubset(names):
+            return
+        wanted = wanted + [c for c in optional_columns if c in names and c not in wanted]
+        missing = [c for c in optional_columns if c not in wanted]
+        positions = [names.index(column) for column in wanted]
+
+        def chunk(buffer):
+            df = pd.DataFrame(buffer, columns=wanted)
+            for column in missing:
+                df[column] = None
+            return normalize_frame(df)
+
+        buffer = []
+        for row in rows:
+            buffer.append([row[i] if i < len(row) else None for i in positions])
+            if len(buffer) >= chunksize:
+                yield chunk(buffer)
+                buffer = []
+        if buffer:
+            yield chunk(buffer)
+    finally:
+        wb.close()
+
+
+def source_label(label, sheet_name):
+    """The SOURCE of the rows of one sheet of a workbook."""
+    return f"{os.path.basename(label)}:{sheet_name}"
+
+
+def parse_sheet(label, source, sheet_name, columns=None, optional_columns=None):
+    """
+    Parse one sheet into a normalized frame tagged with its source.
+
+    Returns None when the sheet does not contain all of ``columns`` (e.g. a
+    summary sheet sitting next to the deposit sheets). The whole sheet ends
+    up in memory; iter_portfolio_chunks streams it instead.
+    """
+    chunks = list(
+        iter_sheet_chunks(source, sheet_name, columns, optional_columns=optional_columns)
+    )
+    if not chunks:
+        return None
+
+    df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    df[SOURCE_COLUMN] = source_label(label, sheet_name)
+    return df
+
+
+def iter_portfolio_chunks(
+    sources,
+    sheet_names=None,
+    columns=None,
+    optional_columns=None,
+    chunksize=CHUNK_ROWS,
+    tasks=None,
+):
+    """
+    Stream every sheet of every workbook of a portfolio, one after the other,
+    as normalized frames of at most ``chunksize`` rows tagged with their
+    source. Only one chunk is held in memory at a time, however large the
+    workbooks are. ``tasks`` skips discovery when discover_sources has
+    already been run on ``sources``.
+    """
+    if tasks is None:
+        tasks = discover_sources(sources, sheet_names)
+    for label, source, sheet_name in tasks:
+        for chunk in iter_sheet_chunks(source, sheet_name, columns, chunksize, optional_columns):
+            chunk[SOURCE_COLUMN] = source_label(label, sheet_name)
+            yield chunk
+
+
+def _parse_task(task):
+    return parse_sheet(*task)
+
+
+def load_portfolio(
+    sources, sheet_names=None, columns=None, max_workers=1, optional_columns=None
+):
+    """
+    Load every sheet of every workbook of a portfolio into a single frame.
+
+    The frame holds the whole portfolio; iter_portfolio_chunks streams it
+    instead. Sheets are parsed one after the other by default, which is what
+    the app wants: it runs in a threaded server, and worker processes would
+    each be sent the whole decrypted workbook. Command line tools pass
+    ``max_workers=None`` to parse sheets in one worker process per core, so
+    the total load time is bounded by the slowest sheet.
+    """
+    tasks = [
+        (label, source, sheet_name, columns, optional_columns)
+        for label, source, sheet_name in discover_sources(sources, sheet_names)
+    ]
+
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+
+    if len(tasks) <= 1 or max_workers <= 1:
+        frames = [_parse_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(_parse_task, tasks))
+
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return pd.DataFrame(
+            columns=(columns or []) + (optional_columns or []) + [SOURCE_COLUMN]
+        )
+    return pd.concat(frames, ignore_index=True)
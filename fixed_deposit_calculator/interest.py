@@ -0,0 +1,169 @@
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+
+# Function to calculate next interest date based on frequency and start date
+def calculate_next_interest_date(start_date, frequency, today, maturity_date):
+    if frequency not in ["H", "Y", "Q", "M", "C"]:
+        return None
+
+    if frequency == "C":  # Cumulative - interest paid at maturity
+        return maturity_date  # Interest paid at maturity for cumulative deposits
+
+    # Convert start_date to datetime if it's not already
+    if isinstance(start_date, str):
+        start_date = pd.to_datetime(start_date)
+
+    # Initialize the next interest date to the start date
+    next_date = start_date
+
+    # Define the delta based on frequency
+    if frequency == "M":  # Monthly
+        delta = relativedelta(months=1)
+    elif frequency == "Q":  # Quarterly
+        delta = relativedelta(months=3)
+    elif frequency == "H":  # Half-yearly
+        delta = relativedelta(months=6)
+    elif frequency == "Y":  # Yearly
+        delta = relativedelta(years=1)
+
+    # Convert today to pandas Timestamp for comparison
+    today_ts = pd.Timestamp(today)
+    maturity_ts = (
+        pd.Timestamp(maturity_date)
+        if not isinstance(maturity_date, pd.Timestamp)
+        else maturity_date
+    )
+
+    # Find the next interest date after today
+    while next_date <= today_ts:
+        next_date += delta
+        # If next interest date exceeds maturity date, interest will be paid at maturity
+        if next_date > maturity_ts:
+            return maturity_date
+
+    return next_date
+
+
+# Function to calculate all interest dates for a financial year
+def calculate_financial_year_interest_dates(
+    start_date, frequency, fy_start, fy_end, maturity_date
+):
+    if frequency not in ["H", "Y", "Q", "M", "C"]:
+        return []
+
+    # Convert all dates to pandas Timestamp for consistent comparison
+    start_date_ts = pd.Timestamp(start_date)
+    fy_start_ts = pd.Timestamp(fy_start)
+    fy_end_ts = pd.Timestamp(fy_end)
+    maturity_date_ts = pd.Timestamp(maturity_date)
+
+    if frequency == "C":  # Cumulative - only if maturity is within the financial year
+        if fy_start_ts <= maturity_date_ts <= fy_end_ts:
+            return [maturity_date_ts]
+        return []
+
+    # Define the delta based on frequency
+    if frequency == "M":  # Monthly
+        delta = relativedelta(months=1)
+    elif frequency == "Q":  # Quarterly
+        delta = relativedelta(months=3)
+    elif frequency == "H":  # Half-yearly
+        delta = relativedelta(months=6)
+    elif frequency == "Y":  # Yearly
+        delta = relativedelta(years=1)
+
+    # Initialize dates list and the current date
+    interest_dates = []
+    current_date = start_date_ts
+
+    # Find all interest dates that fall within the financial year
+    while current_date <= fy_end_ts:
+        if current_date >= fy_start_ts and current_date <= fy_end_ts:
+            if (
+                current_date <= maturity_date_ts
+            ):  # Only include if before or equal to maturity
+                interest_dates.append(current_date)
+
+        current_date += delta
+        if current_date > maturity_date_ts:
+            # If maturity is within financial year, add it as the final payment
+            if (
+                maturity_date_ts >= fy_start_ts
+                and maturity_date_ts <= fy_end_ts
+                and maturity_date_ts not in interest_dates
+            ):
+                interest_dates.append(maturity_date_ts)
+            break
+
+    return interest_dates
+
+
+# Function to calculate all interest dates for a date range
+def calculate_date_range_interest_dates(
+    start_date, frequency, range_start, range_end, maturity_date
+):
+    """Calculate all interest dates that fall within a specified date range."""
+    if frequency not in ["H", "Y", "Q", "M", "C"]:
+        return []
+
+    # Convert all dates to pandas Timestamp for consistent comparison
+    start_date_ts = pd.Timestamp(start_date)
+    range_start_ts = pd.Timestamp(range_start)
+    range_end_ts = pd.Timestamp(range_end)
+    maturity_date_ts = pd.Timestamp(maturity_date)
+
+    if frequency == "C":  # Cumulative - only if maturity is within the date range
+        if range_start_ts <= maturity_date_ts <= range_end_ts:
+            return [maturity_date_ts]
+        return []
+
+    # Define the delta based on frequency
+    if frequency == "M":  # Monthly
+        delta = relativedelta(months=1)
+    elif frequency == "Q":  # Quarterly
+        delta = relativedelta(months=3)
+    elif frequency == "H":  # Half-yearly
+        delta = relativedelta(months=6)
+    elif frequency == "Y":  # Yearly
+        delta = relativedelta(years=1)
+
+    # Initialize dates list and the current date
+    interest_dates = []
+    current_date = start_date_ts
+
+    # Find all interest dates that fall within the date range
+    while current_date <= range_end_ts:
+        if current_date >= range_start_ts and current_date <= range_end_ts:
+            if current_date <= maturity_date_ts:  # Only include if before or equal to maturity
+                interest_dates.append(current_date)
+
+        current_date += delta
+        if current_date > maturity_date_ts:
+            # If maturity is within date range, add it as the final payment
+            if (
+                maturity_date_ts >= range_start_ts
+                and maturity_date_ts <= range_end_ts
+                and maturity_date_ts not in interest_dates
+            ):
+                interest_dates.append(maturity_date_ts)
+            break
+
+    return interest_dates
+
+
+# Function to calculate interest amount for a single payment
+def calculate_interest_amount(deposit_amt, rate, frequency):
+    # Convert annual rate to the rate for the specific frequency
+    if frequency == "M":
+        return deposit_amt * rate / 12
+    elif frequency == "Q":
+        return deposit_amt * rate / 4
+    elif frequency == "H":
+        return deposit_amt * rate / 2
+    elif frequency == "Y":
+        return deposit_amt * rate
+    elif frequency == "C":  # For cumulative, show simple interest for now
+        return deposit_amt * rate
+    else:
+        return 0
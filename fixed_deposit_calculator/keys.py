@@ -0,0 +1,46 @@
+"""
+Fernet keys and key rotation.
+
+Everything the app encrypts (portfolios, SQLite rows, report artifacts, the
+password hash) is encrypted with the current key. While a rotation is rolled
+out, the keys it replaces stay listed after it, newest first, so whatever has
+not been re-encrypted yet still decrypts:
+
+    [cryptography]
+    fernet_key = "<new key>"
+    previous_fernet_keys = ["<old key>"]
+
+Functions taking a ``key`` accept one key or such a sequence of keys.
+"""
+import getpass
+import os
+
+from cryptography.fernet import Fernet, MultiFernet
+
+
+def key_list(keys):
+    """``keys`` (one key or a sequence, newest first) as a tuple of bytes."""
+    if isinstance(keys, (bytes, str)):
+        keys = [keys]
+    return tuple(key.encode() if isinstance(key, str) else key for key in keys)
+
+
+def primary_key(keys):
+    """The key new data is encrypted with."""
+    return key_list(keys)[0]
+
+
+def fernet(keys):
+    """Encrypts with the primary key and decrypts with any of ``keys``."""
+    return MultiFernet([Fernet(key) for key in key_list(keys)])
+
+
+def keys_from_environment():
+    """
+    The keys of the command line tools: FERNET_KEY (or a prompt) and the
+    comma-separated FERNET_PREVIOUS_KEYS still accepted during a rotation.
+    """
+    # Same keys as [cryptography] in .streamlit/secrets.toml
+    key = os.environ.get("FERNET_KEY") or getpass.getpass("Enter your fernet_key: ")
+    previous = os.environ.get("FERNET_PREVIOUS_KEYS", "")
+    return key_list([key] + [k.strip() for k in previous.split(",") if k.strip()])
@@ -0,0 +1,74 @@
+import base64
+import hashlib
+import hmac
+import os
+
+# scrypt cost parameters; raise SCRYPT_N to make each guess more expensive
+SCRYPT_N = 2**15
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+
+SCRYPT_PREFIX = "scrypt"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int, dklen: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        dklen=dklen,
+        # scrypt needs roughly 128 * r * n bytes; leave headroom above that
+        maxmem=256 * r * n + 1024 * 1024,
+    )
+
+
+def hash_password(password: str, n: int = SCRYPT_N, r: int = SCRYPT_R, p: int = SCRYPT_P) -> str:
+    """
+    Hash a password with scrypt and a random salt.
+
+    The result records its parameters, e.g. ``scrypt$n=32768,r=8,p=1$<salt>$<hash>``,
+    so they can be tuned later without invalidating existing hashes.
+    """
+    salt = os.urandom(16)
+    derived = _scrypt(password, salt, n, r, p, SCRYPT_DKLEN)
+    return f"{SCRYPT_PREFIX}$n={n},r={r},p={p}${_b64encode(salt)}${_b64encode(derived)}"
+
+
+def verify_password_hash(password: str, stored_hash: str) -> bool:
+    """
+    Check a password against a stored hash in constant time.
+
+    Accepts the scrypt format produced by hash_password as well as the legacy
+    plain SHA-256 hex digests written by earlier versions.
+    """
+    if stored_hash.startswith(SCRYPT_PREFIX + "$"):
+        try:
+            _, params, salt, expected = stored_hash.split("$")
+            params = dict(item.split("=") for item in params.split(","))
+            expected = _b64decode(expected)
+            derived = _scrypt(
+                password,
+                _b64decode(salt),
+                int(params["n"]),
+                int(params["r"]),
+                int(params["p"]),
+                len(expected),
+            )
+        except (ValueError, KeyError):
+            return False
+        return hmac.compare_digest(derived, expected)
+
+    legacy = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(legacy.encode(), stored_hash.encode())
+
@@ -0,0 +1,126 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from fixed_deposit_calculator.scenarios import Scenario, apply_scenario, portfolio_arrays
+from fixed_deposit_calculator.schedule import DepositSchedule
+from fixed_deposit_calculator.schema import interest_per_payment
+
+
+def _month_index(dates):
+    return np.asarray(dates, dtype="datetime64[M]").astype(np.int64)
+
+
+def _tenor_months(start, maturity):
+    """Whole months between start and maturity, like relativedelta years * 12 + months."""
+    months = _month_index(maturity) - _month_index(start)
+    start_day = (start - start.astype("datetime64[M]")).astype(np.int64)
+    maturity_day = (maturity - maturity.astype("datetime64[M]")).astype(np.int64)
+    return months - (maturity_day < start_day)
+
+
+def cash_flow_matrix(df, start=None, years=10, reinvest_rate=None):
+    """
+    Every cash flow of the portfolio over the horizon as a sparse
+    (deposit x month) matrix in coordinate form.
+
+    Returns a frame with one row per non-zero cell: DEPOSIT (position in the
+    portfolio, renewals appended after the original deposits), MONTH (offset
+    from the first month of the horizon), INTEREST, PRINCIPAL (paid out at
+    maturity) and REINVESTED (principal rolled over into a renewal).
+
+    With ``reinvest_rate``, deposits maturing inside the horizon are renewed
+    for the same tenor at that rate instead of paying out their principal.
+    Money is only received for time on deposit, so neither deposits placed
+    during the horizon nor renewals pay interest on the day they start.
+    """
+    start = pd.Timestamp(start or datetime.date.today())
+    horizon_start = np.datetime64(start, "M").astype("datetime64[D]")
+    horizon_end = (np.datetime64(start, "M") + years * 12).astype("datetime64[D]") - 1
+
+    columns = portfolio_arrays(df)
+    if reinvest_rate is not None:
+        columns, _ = apply_scenario(
+            columns,
+            Scenario(
+                "reinvest",
+                renewal_rate=reinvest_rate,
+                renew_from=horizon_start,
+                renew_until=horizon_end,
+            ),
+        )
+
+    schedule = DepositSchedule(
+        columns["DATE"], columns["MATURITY DATE"], columns["CODES"], first_payment=1
+    )
+    amount = columns["DEPOSIT AMT"]
+    per_payment = interest_per_payment(amount, columns["RATE OF INT"], columns["CODES"])
+    # Cumulative deposits pay all their (simple) interest at maturity
+    tenor = _tenor_months(schedule.start, schedule.maturity)
+    accrued = amount * columns["RATE OF INT"] / 12 * tenor
+    per_payment = np.where(schedule.cumulative, accrued, per_payment)
+
+    rows, dates = schedule.window_ledger(horizon_start, horizon_end)
+    interest_month = _month_index(dates) - _month_index(horizon_start)
+
+    maturity = schedule.maturity
+    matures = np.flatnonzero((maturity >= horizon_start) & (maturity <= horizon_end))
+    rolled = np.zeros(len(matures), dtype=bool)
+    if reinvest_rate is not None:
+        rolled = maturity[matures] < horizon_end
+    maturity_month = _month_index(maturity[matures]) - _month_index(horizon_start)
+
+    return pd.DataFrame(
+        {
+            "DEPOSIT": np.concatenate([rows, matures]),
+            "MONTH": np.concatenate([interest_month, maturity_month]),
+            "INTEREST": np.concatenate([per_payment[rows], np.zeros(len(matures))]),
+            "PRINCIPAL": np.concatenate(
+                [np.zeros(len(rows)), np.where(rolled, 0.0, amount[matures])]
+            ),
+            "REINVESTED": np.concatenate(
+                [np.zeros(len(rows)), np.where(rolled, amount[matures], 0.0)]
+            ),
+        }
+    )
+
+
+def maturity_ladder(df, start=None, years=10, reinvest_rate=None):
+    """
+    Month-by-month cash-flow ladder of interest payouts and principal
+    maturities over a ``years`` horizon, for liquidity planning.
+
+    Monthly totals are bincounts over the sparse cash flow matrix and running
+    totals are cumulative sums, so the cost is linear in the number of cash
+    flows. OUTSTANDING is the principal still on deposit at each month end.
+    """
+    start = pd.Timestamp(start or datetime.date.today())
+    months = years * 12
+    flows = cash_flow_matrix(df, start, years, reinvest_rate)
+
+    ladder = pd.DataFrame(
+        {
+            column: np.bincount(flows["MONTH"], weights=flows[column], minlength=months)
+            for column in ["INTEREST", "PRINCIPAL", "REINVESTED"]
+        },
+        index=pd.period_range(start, periods=months, freq="M", name="MONTH"),
+    )
+    ladder["CASH"] = ladder["INTEREST"] + ladder["PRINCIPAL"]
+    ladder["CUMULATIVE CASH"] = ladder["CASH"].cumsum()
+
+    # Principal on deposit at the start of the horizon, plus deposits placed
+    # during it, less what has been paid out
+    first_day = pd.Timestamp(start.year, start.month, 1)
+    alive = (df["DATE"] < first_day) & (df["MATURITY DATE"] >= first_day)
+    placed_month = _month_index(df["DATE"].to_numpy(dtype="datetime64[D]")) - _month_index(
+        first_day.to_datetime64()
+    )
+    placed = (placed_month >= 0) & (placed_month < months)
+    new_money = np.bincount(
+        placed_month[placed], weights=df["DEPOSIT AMT"].to_numpy()[placed], minlength=months
+    )
+    ladder["OUTSTANDING"] = (
+        df.loc[alive, "DEPOSIT AMT"].sum() + new_money.cumsum() - ladder["PRINCIPAL"].cumsum()
+    )
+    return ladder
@@ -0,0 +1,190 @@
+"""
+Range queries over a deposit book: which deposits are alive in a window and
+which interest payments fall inside it.
+
+Deposits are kept sorted by start date with, for fixed-size blocks of that
+order, the latest maturity in the block. A window [X, Y] only needs deposits
+started on or before Y (a binary search gives that prefix) whose block holds
+a deposit maturing on or after X, so long-matured history is skipped a block
+at a time.
+
+Payments are also frequency aware. Payment k of a deposit always falls in
+month start_month + k * step (only the day of month drifts), so periodic
+deposits are further bucketed by frequency and start month modulo step: a
+one-month window only visits the quarterly deposits of one residue in three,
+the yearly ones of one in twelve, and so on. Cumulative deposits, and the
+final payment of periodic ones, are found through the maturity dates. The
+hits of the surviving deposits come from the closed-form schedule. When the
+schedule adjusts payments to business days, the window searched is widened
+by the largest shift and the adjusted payments are clipped to the window.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from fixed_deposit_calculator.schedule import CUMULATIVE, STEP_MONTHS, DepositSchedule
+from fixed_deposit_calculator.schema import per_payment_interest
+
+# Deposits per block of the start-date order
+BLOCK_SIZE = 1024
+
+
+def _day(value):
+    return np.datetime64(pd.Timestamp(value), "D")
+
+
+def _month(day):
+    return day.astype("datetime64[M]").astype(np.int64)
+
+
+class IntervalBlocks:
+    """Deposit positions sorted by start date, with the latest maturity per block."""
+
+    def __init__(self, positions, start, maturity, block_size=BLOCK_SIZE):
+        order = np.argsort(start[positions], kind="stable")
+        self.positions = positions[order]
+        self.start = start[self.positions]
+        self.maturity = maturity[self.positions]
+        self.block_size = block_size
+        if len(self.positions):
+            self.block_max_maturity = np.maximum.reduceat(
+                self.maturity, np.arange(0, len(self.positions), block_size)
+            )
+        else:
+            self.block_max_maturity = self.maturity[:0]
+
+    def alive(self, window_start, window_end):
+        """Positions of deposits alive at some point of [window_start, window_end]."""
+        end = np.searchsorted(self.start, window_end, side="right")
+        blocks = np.flatnonzero(
+            self.block_max_maturity[: -(-end // self.block_size)] >= window_start
+        )
+        starts = blocks * self.block_size
+        lengths = np.minimum(starts + self.block_size, end) - starts
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        candidates = np.arange(lengths.sum()) + offsets
+        return self.positions[candidates[self.maturity[candidates] >= window_start]]
+
+
+class PaymentIndex:
+    """Interval index over the [DATE, MATURITY DATE] life of each deposit."""
+
+    def __init__(self, schedule, per_payment, block_size=BLOCK_SIZE):
+        self.schedule = schedule
+        self.per_payment = np.asarray(per_payment, dtype=float)
+        everything = np.arange(len(schedule))
+        self.lives = IntervalBlocks(everything, schedule.start, schedule.maturity, block_size)
+
+        # Periodic deposits by (frequency code, start month modulo step)
+        residue = schedule.start_month % np.maximum(schedule.step, 1)
+        self.buckets = {}
+        for code, step in enumerate(STEP_MONTHS):
+            if code == CUMULATIVE:
+                continue
+            for r in range(step):
+                positions = np.flatnonzero((schedule.codes == code) & (residue == r))
+                if len(positions):
+                    self.buckets[code, r] = IntervalBlocks(
+                        positions, schedule.start, schedule.maturity, block_size
+                    )
+
+        self.by_maturity = np.argsort(schedule.maturity, kind="stable")
+        self.sorted_maturity = schedule.maturity[self.by_maturity]
+
+    @classmethod
+    def from_frame(cls, df, block_size=BLOCK_SIZE, calendar=None):
+        return cls(
+            DepositSchedule.from_frame(df, calendar), per_payment_interest(df), block_size
+        )
+
+    def __len__(self):
+        return len(self.schedule)
+
+    def alive(self, window_start, window_end):
+        """
+        Row positions (ascending) of deposits started on or before window_end
+        and maturing on or after window_start.
+        """
+        return np.sort(self.lives.alive(_day(window_start), _day(window_end)))
+
+    def candidates(self, window_start, window_end):
+        """
+        Row positions (ascending) of every deposit that may pay interest in
+        the window: a superset of the payers, much smaller than the book.
+        """
+        shift = self.schedule.max_shift
+        window_start, window_end = _day(window_start) - shift, _day(window_end) + shift
+        first_month, last_month = _month(window_start), _month(window_end)
+
+        found = []
+        for (code, r), blocks in self.buckets.items():
+            step = STEP_MONTHS[code]
+            # Does any month of the window fall on this residue?
+            months = last_month - first_month
+            if months + 1 >= step or (r - first_month) % step <= months:
+                found.append(blocks.alive(window_start, window_end))
+
+        # Deposits maturing in the window pay (or may pay) on maturity
+        low = np.searchsorted(self.sorted_maturity, window_start, side="left")
+        high = np.searchsorted(self.sorted_maturity, window_end, side="right")
+        found.append(self.by_maturity[low:high])
+        return np.unique(np.concatenate(found))
+
+    def payments(self, window_start, window_end):
+        """
+        Every interest payment in the window as (rows, dates, amounts), with
+        rows being positions in the indexed frame, ordered by date then row.
+        """
+        positions = self.candidates(window_start, window_end)
+        local_rows, dates = self.schedule.take(positions).window_ledger(window_start, window_end)
+        rows = positions[local_rows]
+        return rows, dates, self.per_payment[rows]
+
+    def interest(self, window_start, window_end):
+        """
+        (rows, payment counts, interest) of the deposits paying interest in
+        the window, rows ascending; the amounts of DepositSchedule.window_interest.
+        """
+        positions = self.candidates(window_start, window_end)
+        schedule = self.schedule.take(positions)
+        counts = schedule.window_payment_counts(window_start, window_end)
+        interest = schedule.window_interest(window_start, window_end, self.per_payment[positions])
+        paying = counts > 0
+        return positions[paying], counts[paying], interest[paying]
+
+
+def due_between(df, window_start, window_end, index=None, calendar=None):
+    """
+    The interest payments of a validated deposit frame between two dates, one
+    row per payment, like schedule.payment_ledger but only touching deposits
+    alive in the window.
+    """
+    if index is None:
+        index = PaymentIndex.from_frame(df, calendar=calendar)
+    rows, dates, amounts = index.payments(window_start, window_end)
+    ledger = df.iloc[rows][["DEP NO", "NAME OF THE DEPOSITEE", "CUST ID"]].reset_index(drop=True)
+    ledger.insert(0, "PAYMENT DATE", pd.to_datetime(dates))
+    ledger["INTEREST AMOUNT"] = amounts
+    return ledger
+
+
+if __name__ == "__main__":
+    from fixed_deposit_calculator.keys import keys_from_environment
+    from fixed_deposit_calculator.storage import open_store
+
+    parser = argparse.ArgumentParser(description="List interest payments due between two dates")
+    parser.add_argument("portfolio", help="encrypted workbook or SQLite store")
+    parser.add_argument("start", type=pd.Timestamp, help="first day, e.g. 2025-04-01")
+    parser.add_argument("end", type=pd.Timestamp, help="last day, e.g. 2025-04-30")
+    parser.add_argument("--csv", metavar="PATH", help="write the payments to a CSV file")
+    args = parser.parse_args()
+
+    key = keys_from_environment()
+    df = open_store(args.portfolio, key).deposits(active_between=(args.start, args.end))
+    ledger = due_between(df, args.start, args.end)
+    if args.csv:
+        ledger.to_csv(args.csv, index=False)
+    else:
+        print(ledger.to_string(index=False))
+    print(f"{len(ledger)} payments, {ledger['INTEREST AMOUNT'].sum():,.2f} interest")
@@ -0,0 +1,383 @@
+"""
+Pre-rendered reports.
+
+The monthly summary, FY summary and date based ledger of the app are
+rendered once per data version and day into HTML, XLSX and CSV artifacts.
+Artifacts are Fernet encrypted with the portfolio key, since they hold the
+same data as the portfolio, and listed in a manifest keyed by the data
+digest and the report date. The app serves a matching artifact instead of
+recomputing the page. Reports on business days fold the calendar's digest
+into the data digest, so changing the holidays renders a new report.
+"""
+import argparse
+import contextlib
+import datetime
+import hashlib
+import html
+import io
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from fixed_deposit_calculator.business_days import CONVENTIONS, BusinessCalendar, widen
+from fixed_deposit_calculator.dates import financial_year
+from fixed_deposit_calculator.formatter import format_currency_to_inr, format_report_table
+from fixed_deposit_calculator.keys import fernet, keys_from_environment
+from fixed_deposit_calculator.query import PaymentIndex, due_between
+from fixed_deposit_calculator.schedule import DepositSchedule
+from fixed_deposit_calculator.schema import per_payment_interest
+
+try:
+    import fcntl
+except ImportError:  # Windows: publishers of one directory are not serialized
+    fcntl = None
+
+ARTIFACTS_DIR = os.path.join(os.path.dirname(__file__), "artifacts")
+MANIFEST_NAME = "manifest.json"
+
+# Reports kept on disk; older ones are deleted when a new one is published
+KEEP_REPORTS = 10
+
+FREQUENCY_NAMES = {
+    "M": "Monthly",
+    "Q": "Quarterly",
+    "H": "Half-yearly",
+    "Y": "Yearly",
+    "C": "Cumulative",
+}
+
+
+@dataclass
+class ReportSection:
+    # Short name, used for the CSV file and XLSX sheet
+    name: str
+    title: str
+    table: pd.DataFrame
+    # Label -> formatted value, shown under the table
+    totals: dict = field(default_factory=dict)
+
+
+def with_next_interest(df, today, calendar=None):
+    """
+    Add the per-payment interest, next interest date and due this month flag,
+    on business days of ``calendar`` when one is given.
+    """
+    df["INTEREST AMOUNT"] = per_payment_interest(df)
+    df["NEXT INTEREST DATE"] = pd.to_datetime(
+        DepositSchedule.from_frame(df, calendar).next_interest_dates(today)
+    )
+    df["NEXT INTEREST MONTH"] = df["NEXT INTEREST DATE"].dt.to_period("M")
+    # Create a column to flag deposits with interest due this month
+    df["DUE THIS MONTH"] = df["NEXT INTEREST MONTH"] == pd.Period(today, "M")
+    return df
+
+
+def with_window_interest(df, window_start, window_end, prefix, calendar=None, index=None):
+    """
+    Add the number of interest payments (``<prefix>_PAYMENTS``) and the
+    interest (``<prefix>_INTEREST_AMOUNT``) of each deposit in the window,
+    using ``index`` (a PaymentIndex of ``df``) when one is given.
+    """
+    df["INTEREST AMOUNT"] = per_payment_interest(df)
+    if index is None:
+        index = PaymentIndex.from_frame(df, calendar=calendar)
+    rows, counts, interest = index.interest(window_start, window_end)
+    payments = np.zeros(len(df), dtype=np.int64)
+    amounts = np.zeros(len(df))
+    payments[rows] = counts
+    amounts[rows] = interest
+    df[f"{prefix}_PAYMENTS"] = payments
+    df[f"{prefix}_INTEREST_AMOUNT"] = amounts
+    return df
+
+
+def report_windows(today):
+    """
+    The FY window and the date based summary window of the app: the
+    financial year containing ``today``, and April 1 of this calendar year
+    to March 31 of the next.
+    """
+    fy_start, fy_end = financial_year(today)
+    return fy_start, fy_end, pd.Timestamp(today.year, 4, 1), pd.Timestamp(today.year + 1, 3, 31)
+
+
+def build_report(store, today, calendar=None):
+    """
+    The report sections for the deposits in ``store`` as of ``today``, with
+    payments on business days of ``calendar`` when one is given.
+    """
+    fy_start, fy_end, range_start, range_end = report_windows(today)
+
+    df = store.deposits()
+    month_start = pd.Timestamp(today.year, today.month, 1)
+    upcoming_df = with_next_interest(
+        store.deposits(active_between=widen(month_start, None, calendar)), today, calendar
+    )
+    due_df = upcoming_df[upcoming_df["DUE THIS MONTH"]].copy()
+    due_df["INTEREST PAYABLE"] = due_df["INTEREST PAYABLE"].map(FREQUENCY_NAMES)
+    monthly = ReportSection(
+        "monthly",
+        f"Interest Summary for {today.strftime('%B %Y')}",
+        due_df[
+            [
+                "DEP NO",
+                "NAME OF THE DEPOSITEE",
+                "DATE",
+                "DEPOSIT AMT",
+                "RATE OF INT",
+                "INTEREST PAYABLE",
+                "NEXT INTEREST DATE",
+                "INTEREST AMOUNT",
+            ]
+        ],
+        {
+            "Total Deposits": str(len(df)),
+            "Deposits with Interest Due This Month": str(len(due_df)),
+            "Total Deposit Amount": format_currency_to_inr(df["DEPOSIT AMT"].sum()),
+            "Total Interest Due This Month": format_currency_to_inr(due_df["INTEREST AMOUNT"].sum()),
+        },
+    )
+
+    fy_df = with_window_interest(
+        store.deposits(active_between=widen(fy_start, fy_end, calendar)),
+        fy_start,
+        fy_end,
+        "FY",
+        calendar,
+    )
+    fy_df = fy_df[fy_df["FY_INTEREST_AMOUNT"] > 0].copy()
+    fy_df["INTEREST PAYABLE"] = fy_df["INTEREST PAYABLE"].map(FREQUENCY_NAMES)
+    fy_df["INTEREST FREQUENCY"] = fy_df["FY_PAYMENTS"].map(lambda count: f"{count} payment(s)")
+    fy = ReportSection(
+        "fy",
+        f"Financial Year Interest Summary ({fy_start.strftime('%b %d, %Y')} to {fy_end.strftime('%b %d, %Y')})",
+        fy_df[
+            [
+                "DEP NO",
+                "NAME OF THE DEPOSITEE",
+                "DEPOSIT AMT",
+                "RATE OF INT",
+                "INTEREST PAYABLE",
+                "INTEREST FREQUENCY",
+                "FY_INTEREST_AMOUNT",
+            ]
+        ],
+        {
+            f"Total interest earned in financial year {fy_start.year}-{fy_end.year}": (
+                format_currency_to_inr(fy_df["FY_INTEREST_AMOUNT"].sum())
+            )
+        },
+    )
+
+    payments_df = due_between(
+        store.deposits(active_between=widen(range_start, range_end, calendar)),
+        range_start,
+        range_end,
+        calendar=calendar,
+    )
+    payments_df = payments_df.loc[
+        payments_df["INTEREST AMOUNT"] > 0,
+        ["PAYMENT DATE", "DEP NO", "NAME OF THE DEPOSITEE", "INTEREST AMOUNT"],
+    ]
+    ledger = ReportSection(
+        "ledger",
+        f"Date Based Interest Summary ({range_start.strftime('%b %d, %Y')} to {range_end.strftime('%b %d, %Y')})",
+        payments_df,
+        {
+            f"Total interest earned in financial year {range_start.strftime('%b %d, %Y')} - {range_end.strftime('%b %d, %Y')}": (
+                format_currency_to_inr(payments_df["INTEREST AMOUNT"].sum())
+            )
+        },
+    )
+    return [monthly, fy, ledger]
+
+
+HTML_STYLE = """
+body { font-family: sans-serif; margin: 2rem; color: #262730; }
+table { border-collapse: collapse; margin: 0.5rem 0 1rem; font-size: 0.9rem; }
+th, td { border-bottom: 1px solid #e6e9ef; padding: 0.3rem 0.7rem; text-align: left; }
+th { background: #f0f2f6; }
+.totals { list-style: none; padding: 0; }
+.totals li { margin: 0.2rem 0; }
+"""
+
+
+def render_html(sections, today):
+    parts = [
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8">',
+        "<title>Fixed Deposit Interest Report</title>",
+        f"<style>{HTML_STYLE}</style></head><body>",
+        "<h1>Fixed Deposit Interest Report</h1>",
+        f"<p>Current Date: {today.strftime('%B %d, %Y')}</p>",
+    ]
+    for section in sections:
+        parts.append(f"<h2>{html.escape(section.title)}</h2>")
+        if section.table.empty:
+            parts.append("<p>No deposits.</p>")
+        else:
+            parts.append(format_report_table(section.table).to_html(index=False, border=0))
+        parts.append('<ul class="totals">')
+        for label, value in section.totals.items():
+            parts.append(f"<li><b>{html.escape(label)}:</b> {html.escape(value)}</li>")
+        parts.append("</ul>")
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def render_xlsx(sections):
+    """One sheet per section, with numbers and dates kept as such."""
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for section in sections:
+            section.table.to_excel(writer, sheet_name=section.name, index=False)
+            totals = pd.DataFrame(list(section.totals.items()), columns=["TOTAL", "VALUE"])
+            totals.to_excel(
+                writer, sheet_name=section.name, index=False, startrow=len(section.table) + 2
+            )
+    return buffer.getvalue()
+
+
+def render_artifacts(sections, today):
+    """Artifact name -> bytes for every format."""
+    artifacts = {
+        "report.html": render_html(sections, today).encode(),
+        "report.xlsx": render_xlsx(sections),
+    }
+    for section in sections:
+        artifacts[f"{section.name}.csv"] = section.table.to_csv(index=False).encode()
+    return artifacts
+
+
+def _write_atomic(path, data):
+    # A unique temporary name: sessions of one server publish from different
+    # threads, and several servers may share the directory
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+@contextlib.contextmanager
+def _manifest_lock(directory):
+    """Hold an exclusive lock on the directory's manifest across processes."""
+    with open(os.path.join(directory, f"{MANIFEST_NAME}.lock"), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def read_manifest(directory=ARTIFACTS_DIR):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"reports": []}
+
+
+def find_report(digest, today, directory=ARTIFACTS_DIR):
+    """The manifest entry of the report for this data digest and date, if any."""
+    for entry in read_manifest(directory)["reports"]:
+        if entry["digest"] == digest and entry["date"] == today.isoformat():
+            return entry
+    return None
+
+
+def read_artifact(entry, name, key, directory=ARTIFACTS_DIR):
+    with open(os.path.join(directory, entry["files"][name]), "rb") as f:
+        return fernet(key).decrypt(f.read())
+
+
+def report_digest(store, calendar=None):
+    """The store's data digest, combined with the calendar's when there is one."""
+    digest = store.digest()
+    if calendar is None:
+        return digest
+    return hashlib.sha256(f"{digest}\0{calendar.digest()}".encode()).hexdigest()
+
+
+def publish_report(store, key, today=None, directory=ARTIFACTS_DIR, calendar=None):
+    """
+    Render the report of ``store`` for ``today`` unless the manifest already
+    has one for the same data digest and date. Returns the manifest entry.
+    """
+    today = today or datetime.date.today()
+    digest = report_digest(store, calendar)
+    entry = find_report(digest, today, directory)
+    if entry is not None:
+        return entry
+
+    os.makedirs(directory, exist_ok=True)
+    encryption = fernet(key)
+    prefix = f"{today.isoformat()}-{digest[:16]}"
+    files = {}
+    for name, data in render_artifacts(build_report(store, today, calendar), today).items():
+        files[name] = f"{prefix}-{name}.enc"
+        _write_atomic(os.path.join(directory, files[name]), encryption.encrypt(data))
+
+    entry = {
+        "digest": digest,
+        "date": today.isoformat(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "files": files,
+    }
+    # Read, prune and write under the lock, or a concurrent publisher's entry
+    # could be dropped or its files pruned while it is listed
+    with _manifest_lock(directory):
+        manifest = read_manifest(directory)
+        reports = [entry] + [
+            e for e in manifest["reports"] if (e["digest"], e["date"]) != (digest, entry["date"])
+        ]
+        for stale in reports[KEEP_REPORTS:]:
+            for file_name in stale["files"].values():
+                try:
+                    os.remove(os.path.join(directory, file_name))
+                except FileNotFoundError:
+                    pass
+        manifest["reports"] = reports[:KEEP_REPORTS]
+        _write_atomic(
+            os.path.join(directory, MANIFEST_NAME), json.dumps(manifest, indent=2).encode()
+        )
+    return entry
+
+
+if __name__ == "__main__":
+    from fixed_deposit_calculator.storage import open_store
+
+    parser = argparse.ArgumentParser(description="Pre-render the report artifacts of a portfolio")
+    parser.add_argument("portfolio", help="encrypted workbook or SQLite store")
+    parser.add_argument(
+        "--date", type=datetime.date.fromisoformat, help="report date (default today)"
+    )
+    parser.add_argument("--out", default=ARTIFACTS_DIR, help="artifacts directory")
+    parser.add_argument(
+        "--holidays", metavar="PATH", help="holiday file; payments move to business days"
+    )
+    parser.add_argument(
+        "--convention",
+        choices=list(CONVENTIONS),
+        default="following",
+        help="business-day convention used with --holidays",
+    )
+    args = parser.parse_args()
+
+    calendar = None
+    if args.holidays:
+        calendar = BusinessCalendar.from_file(args.holidays, args.convention)
+
+    key = keys_from_environment()
+    entry = publish_report(
+        open_store(args.portfolio, key), key, args.date, args.out, calendar
+    )
+    print(f"Report for {entry['date']} (data {entry['digest'][:16]}):")
+    for name, file_name in entry["files"].items():
+        print(f"  {name}: {os.path.join(args.out, file_name)}")
@@ -0,0 +1,293 @@
+import argparse
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from fixed_deposit_calculator.dates import financial_year
+from fixed_deposit_calculator.keys import keys_from_environment
+from fixed_deposit_calculator.schedule import DepositSchedule, payment_dates
+from fixed_deposit_calculator.schema import interest_per_payment
+from fixed_deposit_calculator.storage import open_store
+
+# Renewal chains longer than this are cut off (e.g. a 1-day deposit renewed forever)
+MAX_RENEWAL_GENERATIONS = 100
+
+
+@dataclass
+class Scenario:
+    """
+    A set of what-if overrides applied on top of the base portfolio.
+
+    Overrides apply to every deposit, or only to those of ``depositees`` /
+    ``deposits`` (DEP NO) when given.
+    """
+
+    name: str
+    # Replace the rate of interest, or shift it by ``rate_change`` (e.g. -0.005)
+    rate: float = None
+    rate_change: float = 0.0
+    # Replace the tenor: maturity becomes DATE + tenor_months
+    tenor_months: int = None
+    # Break deposits still running on this date, with a rate penalty
+    break_on: datetime.date = None
+    break_penalty: float = 0.0
+    # Renew deposits maturing between renew_from (default today) and
+    # renew_until, for the same tenor, at renewal_rate
+    renewal_rate: float = None
+    renew_until: datetime.date = None
+    renew_from: datetime.date = None
+    depositees: list = None
+    deposits: list = None
+
+
+def portfolio_arrays(df):
+    """
+    The columns of a validated deposit frame that scenarios work on, as arrays.
+    """
+    return {
+        "DEP NO": df["DEP NO"].to_numpy(),
+        "NAME OF THE DEPOSITEE": df["NAME OF THE DEPOSITEE"].to_numpy(),
+        "DATE": df["DATE"].to_numpy(dtype="datetime64[D]"),
+        "MATURITY DATE": df["MATURITY DATE"].to_numpy(dtype="datetime64[D]"),
+        "DEPOSIT AMT": df["DEPOSIT AMT"].to_numpy(dtype=float),
+        "RATE OF INT": df["RATE OF INT"].to_numpy(dtype=float),
+        "CODES": df["INTEREST PAYABLE"].cat.codes.to_numpy().astype(np.int64),
+    }
+
+
+def _selection(base, scenario):
+    selected = np.ones(len(base["DATE"]), dtype=bool)
+    if scenario.depositees is not None:
+        selected &= np.isin(base["NAME OF THE DEPOSITEE"], scenario.depositees)
+    if scenario.deposits is not None:
+        selected &= np.isin(base["DEP NO"], scenario.deposits)
+    return selected
+
+
+def _renewals(columns, renewal_rate, renew_from, renew_until, selected):
+    """
+    Append successive renewal generations of the selected deposits. A renewal
+    starts on the maturity date of the deposit it replaces.
+    """
+    renew_from = np.datetime64(pd.Timestamp(renew_from), "D")
+    renew_until = np.datetime64(pd.Timestamp(renew_until), "D")
+    selected = selected & (columns["MATURITY DATE"] >= renew_from)
+    generation = {name: values[selected] for name, values in columns.items()}
+    generations = [columns]
+
+    for _ in range(MAX_RENEWAL_GENERATIONS):
+        due = generation["MATURITY DATE"] < renew_until
+        if not due.any():
+            break
+        generation = {name: values[due] for name, values in generation.items()}
+        tenor = generation["MATURITY DATE"] - generation["DATE"]
+        generation["DATE"] = generation["MATURITY DATE"]
+        generation["MATURITY DATE"] = generation["DATE"] + tenor
+        generation["RATE OF INT"] = np.full(len(tenor), renewal_rate)
+        generations.append(generation)
+
+    if len(generations) == 1:
+        return columns, 0
+    renewed = sum(len(g["DATE"]) for g in generations[1:])
+    return {
+        name: np.concatenate([g[name] for g in generations]) for name in columns
+    }, renewed
+
+
+def apply_scenario(base, scenario):
+    """
+    Overlay ``scenario`` on the ``base`` arrays.
+
+    The result shares every array the scenario does not touch with ``base``
+    (copy-on-write), so an overlay only costs the columns it changes.
+    Returns (columns, number of renewals); renewals are appended after the
+    deposits of ``base``.
+    """
+    columns = dict(base)
+    selected = _selection(base, scenario)
+
+    if scenario.rate is not None or scenario.rate_change:
+        rate = base["RATE OF INT"]
+        if scenario.rate is not None:
+            rate = np.full(len(selected), scenario.rate)
+        columns["RATE OF INT"] = np.where(
+            selected, rate + scenario.rate_change, base["RATE OF INT"]
+        )
+
+    if scenario.tenor_months is not None:
+        start = base["DATE"]
+        start_month = start.astype("datetime64[M]").astype(np.int64)
+        start_day = (start - start.astype("datetime64[M]")).astype(np.int64) + 1
+        tenor = np.full(len(start), scenario.tenor_months, dtype=np.int64)
+        # Same month arithmetic as adding relativedelta(months=tenor) to DATE
+        maturity = payment_dates(start_month, start_day, tenor, 1)
+        columns["MATURITY DATE"] = np.where(selected, maturity, base["MATURITY DATE"])
+
+    if scenario.break_on is not None:
+        break_on = np.datetime64(pd.Timestamp(scenario.break_on), "D")
+        broken = (
+            selected
+            & (columns["DATE"] < break_on)
+            & (columns["MATURITY DATE"] > break_on)
+        )
+        columns["MATURITY DATE"] = np.where(broken, break_on, columns["MATURITY DATE"])
+        columns["RATE OF INT"] = np.where(
+            broken, columns["RATE OF INT"] - scenario.break_penalty, columns["RATE OF INT"]
+        )
+
+    renewed = 0
+    if scenario.renewal_rate is not None and scenario.renew_until is not None:
+        columns, renewed = _renewals(
+            columns,
+            scenario.renewal_rate,
+            scenario.renew_from or datetime.date.today(),
+            scenario.renew_until,
+            selected,
+        )
+
+    return columns, renewed
+
+
+def scenario_schedule(columns, originals):
+    """
+    The schedule of scenario ``columns`` whose first ``originals`` deposits
+    come from the portfolio. The rest are renewals: the maturing deposit
+    already paid up to the renewal date, so they first pay one period later.
+    """
+    first_payment = np.arange(len(columns["DATE"])) >= originals
+    return DepositSchedule(
+        columns["DATE"], columns["MATURITY DATE"], columns["CODES"], first_payment=first_payment
+    )
+
+
+def evaluate_scenario(base, scenario, windows):
+    """Run the schedule over ``windows`` for one scenario and summarize it."""
+    columns, renewed = apply_scenario(base, scenario)
+    schedule = scenario_schedule(columns, len(base["DATE"]))
+    per_payment = interest_per_payment(
+        columns["DEPOSIT AMT"], columns["RATE OF INT"], columns["CODES"]
+    )
+
+    summary = {
+        "SCENARIO": scenario.name,
+        "DEPOSITS": len(schedule),
+        "RENEWALS": renewed,
+    }
+    for label, (start, end) in windows.items():
+        summary[f"{label} INTEREST"] = schedule.window_interest(start, end, per_payment).sum()
+    return summary
+
+
+# Per-worker copy of the base arrays, sent once instead of with every scenario
+_worker_base = None
+
+
+def _init_worker(base):
+    global _worker_base
+    _worker_base = base
+
+
+def _evaluate_in_worker(scenario, windows):
+    return evaluate_scenario(_worker_base, scenario, windows)
+
+
+def compare_scenarios(df, scenarios, windows=None, max_workers=None):
+    """
+    Evaluate many scenarios against a validated portfolio and return a
+    comparison table with one row per scenario, plus the change of every
+    window's interest against the unmodified base portfolio.
+
+    ``windows`` maps a label to a (start, end) date range; it defaults to the
+    current and next financial year. Scenarios run in parallel processes that
+    receive the base portfolio once.
+    """
+    if windows is None:
+        fy_start, fy_end = financial_year(datetime.date.today())
+        windows = {
+            "THIS FY": (fy_start, fy_end),
+            "NEXT FY": (fy_start + pd.DateOffset(years=1), fy_end + pd.DateOffset(years=1)),
+        }
+
+    base = portfolio_arrays(df)
+    scenarios = [Scenario("Base")] + list(scenarios)
+
+    if max_workers is None:
+        max_workers = min(len(scenarios), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        rows = [evaluate_scenario(base, scenario, windows) for scenario in scenarios]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(base,)
+        ) as executor:
+            rows = list(
+                executor.map(_evaluate_in_worker, scenarios, [windows] * len(scenarios))
+            )
+
+    table = pd.DataFrame(rows).set_index("SCENARIO")
+    for label in windows:
+        column = f"{label} INTEREST"
+        table[f"{label} CHANGE"] = table[column] - table.loc["Base", column]
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare what-if scenarios for a portfolio")
+    parser.add_argument("portfolio", help="encrypted workbook or SQLite database")
+    parser.add_argument(
+        "--rate-change",
+        type=float,
+        action="append",
+        default=[],
+        help="shift every rate by this much (e.g. -0.005); may be repeated",
+    )
+    parser.add_argument(
+        "--renewal-rate",
+        type=float,
+        action="append",
+        default=[],
+        help="renew maturing deposits at this rate until --renew-until; may be repeated",
+    )
+    parser.add_argument(
+        "--renew-until",
+        type=datetime.date.fromisoformat,
+        help="last renewal date (default: end of next financial year)",
+    )
+    parser.add_argument("--break-on", type=datetime.date.fromisoformat)
+    parser.add_argument("--break-penalty", type=float, default=0.01)
+    parser.add_argument("--depositee", action="append", help="only change these depositees")
+    args = parser.parse_args()
+
+    renew_until = args.renew_until
+    if renew_until is None:
+        renew_until = financial_year(datetime.date.today())[1] + pd.DateOffset(years=1)
+    scenarios = [
+        Scenario(f"Rate {change:+.2%}", rate_change=change, depositees=args.depositee)
+        for change in args.rate_change
+    ]
+    scenarios += [
+        Scenario(
+            f"Renew at {rate:.2%}",
+            renewal_rate=rate,
+            renew_until=renew_until,
+            depositees=args.depositee,
+        )
+        for rate in args.renewal_rate
+    ]
+    if args.break_on is not None:
+        scenarios.append(
+            Scenario(
+                f"Break on {args.break_on}",
+                break_on=args.break_on,
+                break_penalty=args.break_penalty,
+                depositees=args.depositee,
+            )
+        )
+
+    store = open_store(args.portfolio, keys_from_environment())
+    table = compare_scenarios(store.deposits(), scenarios)
+    print(table.to_string(float_format="{:,.2f}".format))
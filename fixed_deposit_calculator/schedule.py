@@ -0,0 +1,299 @@
+"""
+Vectorized interest schedules.
+
+Closed-form equivalents of the date functions in interest.py that work on
+whole columns at once. Payment k of a deposit falls k * step months after
+its start. Like the reference functions, which keep adding a relativedelta
+to the previous date, the day of month only ever shrinks: a deposit started
+on Jan 31 pays on Feb 29, Mar 29, Apr 29, ... So the day of payment k is
+the smallest month length seen along the way, capped at the starting day.
+
+A schedule built with a business_days.BusinessCalendar pays on business
+days: the payment dates and the windows they fall in are adjusted to it.
+Deposits with ``first_payment`` 1 (renewals and deposits placed in a
+projection) do not pay on their start date.
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from fixed_deposit_calculator.schema import FREQUENCY_DTYPE, per_payment_interest
+
+# Months between payments for each frequency code (in FREQUENCIES order);
+# cumulative deposits only pay at maturity
+STEP_MONTHS = np.array([1, 3, 6, 12, 0])
+CUMULATIVE = 4
+
+_MONTH_LENGTHS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# The (month of year, leap year) pairs along any path repeat within 48 steps,
+# so the smallest month length seen never changes after that
+_PATH_PERIOD = 48
+
+# Month lengths repeat every 400 years
+_CYCLE_MONTHS = 400 * 12
+
+
+def _to_days(values):
+    return np.asarray(values, dtype="datetime64[D]")
+
+
+def _month_index(dates):
+    """Months since 1970-01 for datetime64[D] values."""
+    return dates.astype("datetime64[M]").astype(np.int64)
+
+
+def _day_of_month(dates):
+    return (dates - dates.astype("datetime64[M]")).astype(np.int64) + 1
+
+
+def days_in_month(months):
+    """Number of days in each month index (months since 1970-01)."""
+    months = np.asarray(months, dtype=np.int64)
+    year, month = np.divmod(months, 12)
+    year = year + 1970
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    return _MONTH_LENGTHS[month] + ((month == 1) & leap)
+
+
+@functools.lru_cache(maxsize=None)
+def _path_min_table(step):
+    """
+    table[r, k]: smallest month length among months r + j * step for j in
+    1..k, for every month r of one Gregorian cycle and k up to _PATH_PERIOD.
+    """
+    j = np.arange(1, _PATH_PERIOD + 1)
+    lengths = days_in_month(np.arange(_CYCLE_MONTHS)[:, None] + j * step)
+    table = np.full((_CYCLE_MONTHS, _PATH_PERIOD + 1), 31, dtype=np.int8)
+    table[:, 1:] = np.minimum.accumulate(lengths, axis=1)
+    return table
+
+
+def _path_min_days(start_month, step, k):
+    """Smallest month length among months start_month + j * step for j in 1..k."""
+    result = np.empty(start_month.shape, dtype=np.int64)
+    k = np.minimum(k, _PATH_PERIOD)
+    cycle_month = start_month % _CYCLE_MONTHS
+    for value in np.unique(step):
+        same = step == value
+        result[same] = _path_min_table(int(value))[cycle_month[same], k[same]]
+    return result
+
+
+def payment_dates(start_month, start_day, step, k):
+    """Date of payment ``k`` (0 being the start date) for each deposit."""
+    k = np.broadcast_to(np.asarray(k, dtype=np.int64), np.shape(start_month))
+    day = np.array(start_day, dtype=np.int64, copy=True)
+    late = (start_day > 28) & (k > 0)
+    if late.any():
+        day[late] = np.minimum(
+            start_day[late], _path_min_days(start_month[late], step[late], k[late])
+        )
+    months = (start_month + k * step).astype("datetime64[M]")
+    return months.astype("datetime64[D]") + (day - 1)
+
+
+class DepositSchedule:
+    """
+    Interest schedules of a validated deposit book as flat NumPy arrays.
+
+    Building it costs one pass over the frame; every query afterwards is a
+    handful of array operations with no per-deposit Python code. With a
+    ``calendar``, next_interest_dates and the window queries report payments
+    on the business days they are actually made.
+    """
+
+    def __init__(self, start, maturity, codes, calendar=None, first_payment=0):
+        self.start = _to_days(start)
+        self.maturity = _to_days(maturity)
+        self.codes = np.asarray(codes, dtype=np.int64)
+        # First payment counted for each deposit: 0 is the start date itself
+        self.first_payment = np.broadcast_to(
+            np.asarray(first_payment, dtype=np.int64), self.start.shape
+        )
+        self.step = STEP_MONTHS[self.codes]
+        self.cumulative = self.codes == CUMULATIVE
+        self.start_month = _month_index(self.start)
+        self.start_day = _day_of_month(self.start)
+        self.calendar = calendar
+
+    @classmethod
+    def from_frame(cls, df, calendar=None):
+        frequency = df["INTEREST PAYABLE"]
+        if not isinstance(frequency.dtype, pd.CategoricalDtype):
+            frequency = frequency.astype(FREQUENCY_DTYPE)
+        return cls(
+            df["DATE"].to_numpy(dtype="datetime64[D]"),
+            df["MATURITY DATE"].to_numpy(dtype="datetime64[D]"),
+            frequency.cat.codes.to_numpy(),
+            calendar,
+        )
+
+    def __len__(self):
+        return len(self.start)
+
+    def with_maturity(self, maturity):
+        """A copy sharing every array except the maturity dates."""
+        schedule = object.__new__(DepositSchedule)
+        schedule.__dict__.update(self.__dict__)
+        schedule.maturity = _to_days(maturity)
+        return schedule
+
+    def take(self, indices):
+        """The schedules of the deposits at ``indices`` (positions or a mask)."""
+        schedule = object.__new__(DepositSchedule)
+        schedule.__dict__.update(
+            {
+                name: values[indices] if isinstance(values, np.ndarray) else values
+                for name, values in self.__dict__.items()
+            }
+        )
+        return schedule
+
+    @property
+    def max_shift(self):
+        """Most days a payment moves to reach a business day."""
+        return 0 if self.calendar is None else self.calendar.max_shift
+
+    def adjust(self, dates):
+        """Payment dates moved onto business days, when there is a calendar."""
+        return dates if self.calendar is None else self.calendar.adjust(dates)
+
+    def payment_date(self, k):
+        return payment_dates(self.start_month, self.start_day, self.step, k)
+
+    def first_on_or_after(self, target):
+        """Smallest k >= first_payment with payment k on or after ``target`` (periodic only)."""
+        target = _to_days(target)
+        step = np.maximum(self.step, 1)
+        k = np.maximum(
+            -(-(_month_index(target) - self.start_month) // step), self.first_payment
+        )
+        return np.where(self.payment_date(k) < target, k + 1, k)
+
+    def last_on_or_before(self, target):
+        """Largest k with payment k on or before ``target``, or -1 (periodic deposits only)."""
+        target = _to_days(target)
+        step = np.maximum(self.step, 1)
+        k = (_month_index(target) - self.start_month) // step
+        dates = self.payment_date(np.maximum(k, 0))
+        return np.where((k >= 0) & (dates > target), k - 1, k)
+
+    def _payment_or_maturity(self, k):
+        dates = self.payment_date(k)
+        return np.where(dates > self.maturity, self.maturity, dates)
+
+    def next_interest_dates(self, today):
+        """Vectorized calculate_next_interest_date."""
+        today = np.datetime64(pd.Timestamp(today), "D")
+        shift = self.max_shift
+        # A payment moves by at most ``shift`` days (less than a month), so the
+        # next adjusted one is one of the first two due after today - shift
+        k = self.first_on_or_after(today - shift + 1)
+        result = self.adjust(self._payment_or_maturity(k))
+        if shift:
+            result = np.where(
+                result > today, result, self.adjust(self._payment_or_maturity(k + 1))
+            )
+        pays_on_start = (self.start > today) & (self.first_payment == 0)
+        result = np.where(pays_on_start, self.adjust(self.start), result)
+        return np.where(self.cumulative, self.adjust(self.maturity), result)
+
+    def window(self, window_start, window_end):
+        """
+        Locate the interest payments falling in [window_start, window_end].
+
+        Returns (first_k, count, maturity_payment): payments first_k ..
+        first_k + count - 1 of each periodic deposit fall in the window, and
+        maturity_payment flags deposits that additionally pay at maturity in
+        the window (always the case for cumulative deposits maturing in it).
+        This mirrors calculate_financial_year_interest_dates and
+        calculate_date_range_interest_dates.
+        """
+        window_start = np.datetime64(pd.Timestamp(window_start), "D")
+        window_end = np.datetime64(pd.Timestamp(window_end), "D")
+
+        first_k = self.first_on_or_after(window_start)
+        last_k = self.last_on_or_before(np.minimum(window_end, self.maturity))
+        count = np.maximum(last_k - first_k + 1, 0)
+
+        matures_inside = (self.maturity >= window_start) & (self.maturity <= window_end)
+        last_date = self.payment_date(np.maximum(last_k, 0))
+        paid_on_maturity = (count > 0) & (last_date == self.maturity)
+        maturity_payment = matures_inside & (self.start <= window_end) & ~paid_on_maturity
+
+        count = np.where(self.cumulative, 0, count)
+        maturity_payment = np.where(self.cumulative, matures_inside, maturity_payment)
+        return first_k, count, maturity_payment
+
+    def window_payment_counts(self, window_start, window_end):
+        """Number of interest payments of each deposit inside the window."""
+        if self.calendar is not None:
+            rows, _ = self.window_ledger(window_start, window_end)
+            return np.bincount(rows, minlength=len(self))
+        _, count, maturity_payment = self.window(window_start, window_end)
+        return count + maturity_payment
+
+    def window_interest(self, window_start, window_end, per_payment):
+        """
+        Interest received inside the window, matching the app's FY and date
+        range amounts: payments x per-payment interest for periodic deposits,
+        one year of simple interest for cumulative deposits maturing in it.
+        """
+        counts = self.window_payment_counts(window_start, window_end)
+        per_payment = np.asarray(per_payment, dtype=float)
+        return np.where(
+            self.cumulative, np.where(counts > 0, per_payment, 0.0), counts * per_payment
+        )
+
+    def window_ledger(self, window_start, window_end):
+        """
+        Every payment inside the window as (deposit position, payment date)
+        arrays, ordered by date and then by deposit like the app's ledger.
+        """
+        window_start = np.datetime64(pd.Timestamp(window_start), "D")
+        window_end = np.datetime64(pd.Timestamp(window_end), "D")
+        shift = self.max_shift
+        # Adjusted payments in the window were due at most ``shift`` days
+        # outside it
+        first_k, count, maturity_payment = self.window(window_start - shift, window_end + shift)
+
+        rows = np.repeat(np.arange(len(self)), count)
+        offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        dates = payment_dates(
+            self.start_month[rows],
+            self.start_day[rows],
+            self.step[rows],
+            first_k[rows] + offsets,
+        )
+
+        maturity_rows = np.flatnonzero(maturity_payment)
+        rows = np.concatenate([rows, maturity_rows])
+        dates = np.concatenate([dates, self.maturity[maturity_rows]])
+        if shift:
+            dates = self.adjust(dates)
+            inside = (dates >= window_start) & (dates <= window_end)
+            rows, dates = rows[inside], dates[inside]
+
+        order = np.lexsort((rows, dates))
+        return rows[order], dates[order]
+
+
+def payment_ledger(df, window_start, window_end, schedule=None, calendar=None):
+    """
+    Every interest payment of a validated deposit frame inside the window,
+    one row per payment with the deposit's DEP NO, NAME OF THE DEPOSITEE and
+    CUST ID, in the same order as the app's date based ledger. Payments are
+    on business days of ``calendar`` when one is given.
+    """
+    if schedule is None:
+        schedule = DepositSchedule.from_frame(df, calendar)
+    rows, dates = schedule.window_ledger(window_start, window_end)
+    per_payment = per_payment_interest(df).to_numpy()
+
+    ledger = df.iloc[rows][["DEP NO", "NAME OF THE DEPOSITEE", "CUST ID"]].reset_index(drop=True)
+    ledger.insert(0, "PAYMENT DATE", pd.to_datetime(dates))
+    ledger["INTEREST AMOUNT"] = per_payment[rows]
+    ledger["DEPOSIT"] = rows
+    return ledger
@@ -0,0 +1,539 @@
+"""
+Where portfolios are kept.
+
+A store hands out validated deposit frames and can filter them by depositee,
+deposit number and date window. The encrypted workbook store keeps the
+original single-file layout; the SQLite store keeps deposits in indexed
+tables so a view only loads the rows it needs, and several writers can
+update individual deposits without replacing a whole file.
+"""
+import abc
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+from cryptography.fernet import Fernet, InvalidToken
+
+from fixed_deposit_calculator.ingest import (
+    DEPOSIT_COLUMNS,
+    DEPOSIT_OPTIONAL_COLUMNS,
+    SOURCE_COLUMN,
+    discover_sources,
+    iter_portfolio_chunks,
+    load_portfolio,
+    source_label,
+)
+from fixed_deposit_calculator.keys import fernet, key_list, keys_from_environment, primary_key
+from fixed_deposit_calculator.schema import (
+    DUPLICATE_DEP_NO,
+    REPORT_COLUMNS,
+    dep_no_key,
+    validate_deposits,
+)
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deposits (
+    source TEXT NOT NULL,
+    sealed BLOB NOT NULL,
+    dep_no_index BLOB NOT NULL,
+    name_index BLOB NOT NULL,
+    date TEXT NOT NULL,
+    maturity_date TEXT NOT NULL,
+    rate_of_int REAL NOT NULL,
+    interest_payable TEXT NOT NULL,
+    UNIQUE (source, dep_no_index)
+);
+CREATE INDEX IF NOT EXISTS deposits_dep_no ON deposits (dep_no_index);
+CREATE INDEX IF NOT EXISTS deposits_name ON deposits (name_index);
+CREATE INDEX IF NOT EXISTS deposits_maturity ON deposits (maturity_date, date);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('store_id', lower(hex(randomblob(16))));
+INSERT OR IGNORE INTO meta VALUES ('version', 0);
+"""
+
+
+def _plain(value):
+    """A JSON-serializable Python value for a pandas/NumPy cell."""
+    if pd.isna(value):
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _day(value):
+    return None if value is None else pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _filter(df, depositees=None, dep_nos=None, active_between=None):
+    """The rows of a validated deposit frame matching the PortfolioStore filters."""
+    mask = pd.Series(True, index=df.index)
+    if depositees is not None:
+        mask &= df["NAME OF THE DEPOSITEE"].isin(depositees)
+    if dep_nos is not None:
+        mask &= df["DEP NO"].isin(dep_nos)
+    if active_between is not None:
+        start, end = active_between
+        if end is not None:
+            mask &= df["DATE"] <= pd.Timestamp(end)
+        if start is not None:
+            mask &= df["MATURITY DATE"] >= pd.Timestamp(start)
+    return df[mask].reset_index(drop=True)
+
+
+class PortfolioStore(abc.ABC):
+    """
+    Interface of a deposit store. Filters are optional and combine:
+
+    ``depositees`` and ``dep_nos`` keep deposits of the given names or
+    numbers; ``active_between`` keeps deposits that can pay interest in a
+    (start, end) window, i.e. placed on or before end and maturing on or after
+    start (either bound may be None).
+    """
+
+    # Rows of the underlying data that failed validation
+    problems = pd.DataFrame()
+
+    @abc.abstractmethod
+    def deposits(self, depositees=None, dep_nos=None, active_between=None):
+        """A validated deposit frame of the rows matching the filters."""
+
+    @abc.abstractmethod
+    def digest(self):
+        """A hex digest that changes whenever the stored deposits change."""
+
+    def write(self, df, replace=False):
+        raise NotImplementedError(f"{type(self).__name__} is read-only")
+
+    def write_chunks(self, chunks, replace=False):
+        raise NotImplementedError(f"{type(self).__name__} is read-only")
+
+
+class EncryptedWorkbookStore(PortfolioStore):
+    """
+    A Fernet-encrypted workbook, decrypted and validated once per instance.
+
+    The whole portfolio is held in memory as one frame (each sheet is read in
+    chunks, then joined): the app needs every deposit anyway. Only
+    import_workbooks streams; large portfolios belong in an SQLiteStore.
+    """
+
+    def __init__(self, path, key):
+        self.path = path
+        self.key = key
+        self._frame = None
+        self._problems = None
+        self._digest = None
+
+    @property
+    def problems(self):
+        # Known once the workbook has been validated
+        self.frame()
+        return self._problems
+
+    def frame(self):
+        if self._frame is None:
+            with open(self.path, "rb") as f:
+                decrypted_bytes = fernet(self.key).decrypt(f.read())
+            df = load_portfolio(
+                [(os.path.basename(self.path), decrypted_bytes)],
+                columns=DEPOSIT_COLUMNS,
+                optional_columns=DEPOSIT_OPTIONAL_COLUMNS,
+            )
+            self._frame, self._problems = validate_deposits(df)
+        return self._frame
+
+    def digest(self):
+        if self._digest is None:
+            sha = hashlib.sha256()
+            with open(self.path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            self._digest = sha.hexdigest()
+        return self._digest
+
+    def deposits(self, depositees=None, dep_nos=None, active_between=None):
+        return _filter(self.frame(), depositees, dep_nos, active_between)
+
+
+class SQLiteStore(PortfolioStore):
+    """
+    Deposits in an SQLite database.
+
+    DEP NO, NAME OF THE DEPOSITEE, CUST ID and DEPOSIT AMT of each deposit
+    are sealed together in one Fernet token (one decryption per row loaded
+    rather than one per cell). Lookups by name or number go through blind indexes
+    (an HMAC of the value under a key derived from the Fernet key), so
+    equality filters use an index without the plaintext being stored. Dates,
+    rates and frequencies stay in the clear to serve the window queries.
+
+    With previous keys (see keys.py), rows sealed under them still load and
+    lookups also match their blind indexes, until ``rekey`` moves the store
+    to the current key.
+
+    The decrypted deposits are kept for the current data version, so repeated
+    queries (the app asks for several windows per rerun) are filtered in
+    memory instead of decrypting every row again.
+    """
+
+    def __init__(self, path, key):
+        self.path = path
+        self.fernet = fernet(key)
+        self.index_keys = [
+            hashlib.sha256(b"blind-index\0" + k).digest() for k in key_list(key)
+        ]
+        self.index_key = self.index_keys[0]
+        self.primary_key = primary_key(key)
+        # (digest, every deposit) of the last full load
+        self._loaded = (None, None)
+        with closing(self._connect()) as connection:
+            connection.executescript(SCHEMA)
+
+    def _connect(self):
+        # A connection per call: Streamlit serves reruns from different threads
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def blind_index(self, value, index_key=None):
+        return hmac.new(
+            index_key or self.index_key, str(_plain(value)).strip().encode(), hashlib.sha256
+        ).digest()
+
+    def seal(self, *values):
+        return self.fernet.encrypt(json.dumps([_plain(value) for value in values]).encode())
+
+    def unseal(self, token):
+        return json.loads(self.fernet.decrypt(token))
+
+    def write(self, df, replace=False):
+        """
+        Insert or update validated deposits, matched on (SOURCE, DEP NO).
+        With ``replace``, deposits of the same sources that are not in ``df``
+        are deleted first. Each call is a single transaction.
+        """
+        return self.write_chunks([df], replace)
+
+    def write_chunks(self, chunks, replace=False, sources=()):
+        """
+        ``write`` for an iterable of validated frames, all in one
+        transaction, so an import only holds one chunk in memory. With
+        ``replace``, the deposits of ``sources`` are deleted up front (so a
+        sheet left without valid rows is emptied too) and those of any other
+        source when its first chunk arrives.
+
+        A DEP NO appearing twice in one source within the write raises
+        ValueError and rolls the transaction back: the second row would
+        silently overwrite the first.
+        """
+        written = 0
+        replaced = set()
+        seen = set()
+        with closing(self._connect()) as connection, connection:
+            if replace:
+                replaced = set(sources)
+                connection.executemany(
+                    "DELETE FROM deposits WHERE source = ?", [(s,) for s in replaced]
+                )
+            for df in chunks:
+                if replace:
+                    new_sources = set(self._sources(df)) - replaced
+                    connection.executemany(
+                        "DELETE FROM deposits WHERE source = ?", [(s,) for s in new_sources]
+                    )
+                    replaced |= new_sources
+                for source, dep_no in zip(self._sources(df), df["DEP NO"]):
+                    key = (source, dep_no_key(dep_no))
+                    if key in seen:
+                        raise ValueError(f"DEP NO {key[1]} appears more than once in {source!r}")
+                    seen.add(key)
+                written += self._insert(connection, df, replace)
+            self._bump_version(connection)
+            # Keep the planner statistics current so window queries pick the
+            # maturity index when they are selective
+            connection.execute("PRAGMA optimize")
+        return written
+
+    @staticmethod
+    def _bump_version(connection):
+        # Part of the writing transaction, so the digest changes exactly when
+        # the deposits do
+        connection.execute("UPDATE meta SET value = value + 1 WHERE name = 'version'")
+
+    @staticmethod
+    def _sources(df):
+        if SOURCE_COLUMN in df.columns:
+            return df[SOURCE_COLUMN]
+        return pd.Series("", index=df.index)
+
+    def _insert(self, connection, df, replace):
+        sources = self._sources(df)
+        rows = [
+            (
+                source,
+                self.seal(dep_no, name, cust_id, amount),
+                self.blind_index(dep_no),
+                self.blind_index(name),
+                _day(date),
+                _day(maturity_date),
+                float(rate),
+                str(frequency),
+            )
+            for source, dep_no, name, cust_id, date, maturity_date, amount, rate, frequency in zip(
+                sources,
+                df["DEP NO"],
+                df["NAME OF THE DEPOSITEE"],
+                df["CUST ID"] if "CUST ID" in df.columns else [None] * len(df),
+                df["DATE"],
+                df["MATURITY DATE"],
+                df["DEPOSIT AMT"],
+                df["RATE OF INT"],
+                df["INTEREST PAYABLE"],
+            )
+        ]
+        if not replace and len(self.index_keys) > 1:
+            # Rows not re-keyed yet have their blind index under an old key
+            connection.executemany(
+                "DELETE FROM deposits WHERE source = ? AND dep_no_index = ?",
+                [
+                    (source, self.blind_index(dep_no, index_key))
+                    for source, dep_no in zip(sources, df["DEP NO"])
+                    for index_key in self.index_keys[1:]
+                ],
+            )
+        connection.executemany(
+            """
+            INSERT INTO deposits VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source, dep_no_index) DO UPDATE SET
+                sealed = excluded.sealed,
+                name_index = excluded.name_index,
+                date = excluded.date,
+                maturity_date = excluded.maturity_date,
+                rate_of_int = excluded.rate_of_int,
+                interest_payable = excluded.interest_payable
+            """,
+            rows,
+        )
+        return len(rows)
+
+    def delete(self, dep_nos, source=None):
+        """Delete deposits by number, optionally only from one source."""
+        query = "DELETE FROM deposits WHERE dep_no_index = ?"
+        params = [
+            (self.blind_index(dep_no, index_key),)
+            for dep_no in dep_nos
+            for index_key in self.index_keys
+        ]
+        if source is not None:
+            query += " AND source = ?"
+            params = [p + (source,) for p in params]
+        with closing(self._connect()) as connection, connection:
+            deleted = connection.executemany(query, params).rowcount
+            if deleted:
+                self._bump_version(connection)
+        return deleted
+
+    def digest(self):
+        # Every write bumps the version, so the store id (telling databases
+        # apart) and the version identify the data without reading the rows
+        with closing(self._connect()) as connection:
+            meta = dict(connection.execute("SELECT name, value FROM meta"))
+        return hashlib.sha256(f"{meta['store_id']}\0{meta['version']}".encode()).hexdigest()
+
+    def query(self, depositees=None, dep_nos=None, active_between=None):
+        """The SQL and parameters selecting the filtered deposits."""
+        clauses, params = [], []
+        for column, values in [("name_index", depositees), ("dep_no_index", dep_nos)]:
+            if values is not None:
+                indexes = [
+                    self.blind_index(value, index_key)
+                    for value in values
+                    for index_key in self.index_keys
+                ]
+                clauses.append(f"{column} IN ({', '.join('?' * len(indexes)) or 'NULL'})")
+                params.extend(indexes)
+        if active_between is not None:
+            start, end = active_between
+            if start is not None:
+                clauses.append("maturity_date >= ?")
+                params.append(_day(start))
+            if end is not None:
+                clauses.append("date <= ?")
+                params.append(_day(end))
+
+        sql = (
+            "SELECT rowid, sealed, date, maturity_date, rate_of_int, interest_payable, source"
+            " FROM deposits"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql, params
+
+    def deposits(self, depositees=None, dep_nos=None, active_between=None):
+        if depositees is not None or dep_nos is not None:
+            # Matched on the blind indexes, like the rows were written
+            return self._load(*self.query(depositees, dep_nos, active_between))
+
+        # Read before the rows: a write in between only costs one more load
+        digest = self.digest()
+        loaded_digest, loaded = self._loaded
+        if loaded_digest != digest:
+            if active_between is not None:
+                return self._load(*self.query(active_between=active_between))
+            loaded = self._load(*self.query())
+            self._loaded = (digest, loaded)
+        if active_between is None:
+            return loaded.copy()
+        start, end = active_between
+        return _filter(loaded, active_between=(_day(start), _day(end)))
+
+    def _load(self, sql, params):
+        with closing(self._connect()) as connection:
+            rows = connection.execute(sql, params).fetchall()
+
+        # Sorted here rather than with ORDER BY rowid, which would make SQLite
+        # walk the table in rowid order instead of using the indexes
+        rows.sort()
+        records = []
+        for _, sealed, date, maturity_date, rate, frequency, source in rows:
+            dep_no, name, cust_id, amount = self.unseal(sealed)
+            records.append(
+                (dep_no, name, date, maturity_date, amount, rate, frequency, cust_id, source)
+            )
+        df = pd.DataFrame(
+            records, columns=DEPOSIT_COLUMNS + DEPOSIT_OPTIONAL_COLUMNS + [SOURCE_COLUMN]
+        )
+        # Rows were validated on the way in; this only restores the dtypes
+        df, _ = validate_deposits(df)
+        return df.reset_index(drop=True)
+
+    def rekey(self):
+        """
+        Re-seal the rows sealed under previous keys and recompute their blind
+        indexes under the current key, in one transaction. Each new token is
+        checked to decrypt under the current key alone before the transaction
+        commits. Returns the number of rows rewritten.
+        """
+        current = Fernet(self.primary_key)
+        with closing(self._connect()) as connection, connection:
+            rows = connection.execute("SELECT rowid, sealed FROM deposits").fetchall()
+            updates = []
+            for rowid, sealed in rows:
+                try:
+                    current.decrypt(sealed)
+                    continue
+                except InvalidToken:
+                    pass
+                values = self.unseal(sealed)
+                token = self.fernet.rotate(sealed)
+                if json.loads(current.decrypt(token)) != values:
+                    raise ValueError(f"Re-sealed row {rowid} does not match the original")
+                dep_no, name = values[0], values[1]
+                updates.append(
+                    (token, self.blind_index(dep_no), self.blind_index(name), rowid)
+                )
+            connection.executemany(
+                "UPDATE deposits SET sealed = ?, dep_no_index = ?, name_index = ? WHERE rowid = ?",
+                updates,
+            )
+            if updates:
+                self._bump_version(connection)
+        return len(updates)
+
+
+def open_store(path, key):
+    """The store for ``path``: SQLite for .db/.sqlite files, else an encrypted workbook."""
+    if path.endswith(SQLITE_EXTENSIONS):
+        return SQLiteStore(path, key)
+    return EncryptedWorkbookStore(path, key)
+
+
+def import_workbooks(store, sources, key=None, replace=True):
+    """
+    Load workbooks (encrypted .enc files are decrypted with ``key``), validate
+    them and write the valid deposits to ``store``. Returns the number of
+    deposits written and the rejection report.
+
+    Sheets are streamed chunk by chunk into a single transaction, so no
+    sheet is ever held whole as a frame. Memory still grows with the input:
+    an encrypted workbook is decrypted whole (Fernet tokens cannot be
+    decrypted in parts) and openpyxl loads a workbook's shared strings up
+    front.
+    With ``replace``, every sheet read replaces its stored deposits, even
+    when none of its rows are valid. A DEP NO repeated within a sheet is
+    reported as a problem and only its first row is kept.
+    """
+    loaded = []
+    for source in sources:
+        if source.endswith(".enc"):
+            with open(source, "rb") as f:
+                source = (os.path.basename(source), fernet(key).decrypt(f.read()))
+        loaded.append(source)
+    tasks = discover_sources(loaded)
+    problems = []
+    seen = set()
+
+    def valid_chunks():
+        for chunk in iter_portfolio_chunks(
+            loaded,
+            columns=DEPOSIT_COLUMNS,
+            optional_columns=DEPOSIT_OPTIONAL_COLUMNS,
+            tasks=tasks,
+        ):
+            df, rejected = validate_deposits(chunk)
+            if not rejected.empty:
+                problems.append(rejected)
+            # Chunks of a sheet are validated separately, so repeats across
+            # them are caught here
+            keys = pd.Series(
+                list(zip(df[SOURCE_COLUMN], df["DEP NO"].map(dep_no_key))),
+                index=df.index,
+                dtype=object,
+            )
+            repeated = keys.map(seen.__contains__).astype(bool) | keys.duplicated()
+            seen.update(keys)
+            if repeated.any():
+                issues = df.loc[repeated, REPORT_COLUMNS].copy()
+                issues["COLUMN"] = "DEP NO"
+                issues["PROBLEM"] = DUPLICATE_DEP_NO
+                problems.append(issues)
+            yield df[~repeated]
+
+    written = store.write_chunks(
+        valid_chunks(),
+        replace=replace,
+        sources=[source_label(label, sheet_name) for label, _, sheet_name in tasks],
+    )
+    if problems:
+        problems = pd.concat(problems, ignore_index=True)
+    else:
+        problems = pd.DataFrame(columns=REPORT_COLUMNS + ["COLUMN", "PROBLEM"])
+    return written, problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import deposit workbooks into an SQLite store")
+    parser.add_argument("database", help="SQLite database to create or update")
+    parser.add_argument("sources", nargs="+", help="workbooks, folders or .enc files")
+    parser.add_argument(
+        "--keep", action="store_true", help="keep deposits of the sources missing from the import"
+    )
+    args = parser.parse_args()
+
+    key = keys_from_environment()
+    written, problems = import_workbooks(
+        SQLiteStore(args.database, key), args.sources, key, replace=not args.keep
+    )
+    print(f"Imported {written} deposits into {args.database}")
+    if not problems.empty:
+        print("Skipped deposits with data problems:")
+        print(problems.to_string(index=False))
@@ -0,0 +1,93 @@
+import numpy as np
+
+from fixed_deposit_calculator.schedule import payment_ledger
+
+# Section 194A: interest a depositor may receive from one bank in a financial
+# year before TDS applies, and the rate withheld when a PAN is on record
+TDS_THRESHOLD = 50_000
+SENIOR_CITIZEN_TDS_THRESHOLD = 1_00_000
+TDS_RATE = 0.10
+
+# A depositor is identified by name and customer id (one customer id per bank)
+DEPOSITOR_COLUMNS = ["NAME OF THE DEPOSITEE", "CUST ID"]
+
+
+def tds_ledger(
+    df,
+    fy_start,
+    fy_end,
+    threshold=TDS_THRESHOLD,
+    rate=TDS_RATE,
+    senior_citizens=None,
+    senior_threshold=SENIOR_CITIZEN_TDS_THRESHOLD,
+    calendar=None,
+):
+    """
+    The FY payments ledger with the running interest of each depositor and the
+    tax expected to be withheld from every payment.
+
+    Once a depositor's interest for the year crosses the threshold, the
+    payment that crosses it bears TDS on everything received so far in the
+    year, and every later payment bears TDS on its own amount.
+    Depositees named in ``senior_citizens`` get ``senior_threshold`` instead.
+    With a business-day ``calendar``, payments count on their adjusted dates.
+    """
+    ledger = payment_ledger(df, fy_start, fy_end, calendar=calendar)
+    ledger = ledger.sort_values(DEPOSITOR_COLUMNS + ["PAYMENT DATE"], kind="stable")
+
+    limit = np.where(
+        ledger["NAME OF THE DEPOSITEE"].isin(senior_citizens or []),
+        senior_threshold,
+        threshold,
+    )
+    groups = ledger.groupby(DEPOSITOR_COLUMNS, sort=False, dropna=False)
+    ledger["FY INTEREST TO DATE"] = groups["INTEREST AMOUNT"].cumsum()
+
+    crossed = ledger["FY INTEREST TO DATE"].to_numpy() > limit
+    ledger["TDS APPLIES"] = crossed
+    # Grouped again: ``groups`` was made before the column existed
+    crossed_before = (
+        ledger.groupby(DEPOSITOR_COLUMNS, sort=False, dropna=False)["TDS APPLIES"]
+        .shift(fill_value=False)
+        .to_numpy(dtype=bool)
+    )
+    ledger["CROSSING PAYMENT"] = crossed & ~crossed_before
+
+    ledger["ESTIMATED TDS"] = rate * np.where(
+        ledger["CROSSING PAYMENT"],
+        ledger["FY INTEREST TO DATE"],
+        np.where(crossed, ledger["INTEREST AMOUNT"], 0.0),
+    )
+    return ledger.reset_index(drop=True)
+
+
+def tds_summary(df, fy_start, fy_end, **kwargs):
+    """
+    Per-depositor TDS projection for a financial year: projected interest,
+    the month the threshold is crossed (if it is) and the estimated tax
+    withheld in total and on each regular payment after the crossing one. Keyword arguments are
+    passed on to tds_ledger.
+    """
+    ledger = tds_ledger(df, fy_start, fy_end, **kwargs)
+
+    ledger["CROSSING DATE"] = ledger["PAYMENT DATE"].where(ledger["TDS APPLIES"])
+    groups = ledger.groupby(DEPOSITOR_COLUMNS, sort=True, dropna=False)
+
+    summary = groups.agg(
+        **{
+            "PROJECTED FY INTEREST": ("INTEREST AMOUNT", "sum"),
+            "PAYMENTS": ("INTEREST AMOUNT", "size"),
+            "CROSSING DATE": ("CROSSING DATE", "min"),
+            "ESTIMATED TDS": ("ESTIMATED TDS", "sum"),
+        }
+    )
+    summary["THRESHOLD CROSSED"] = summary["CROSSING DATE"].notna()
+    summary["CROSSING MONTH"] = summary["CROSSING DATE"].dt.strftime("%B %Y")
+    summary["TDS PER PAYMENT AFTER CROSSING"] = (
+        ledger[ledger["TDS APPLIES"] & ~ledger["CROSSING PAYMENT"]]
+        .groupby(DEPOSITOR_COLUMNS, dropna=False)["ESTIMATED TDS"]
+        .mean()
+        .reindex(summary.index)
+        .fillna(0.0)
+    )
+    return summary.drop(columns="CROSSING DATE").reset_index()
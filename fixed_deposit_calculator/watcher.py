@@ -0,0 +1,244 @@
+"""
+Watching portfolio files for changes.
+
+On Linux the directories holding the watched files are registered with
+inotify (through ctypes, no extra dependency), so a replaced ciphertext is
+noticed as soon as it is closed or renamed into place. Elsewhere, file
+modification times are polled. Writes come in bursts (an upload, a copy, an
+SQLite transaction and its WAL), so a change is only acted on once the files
+have been quiet for a debounce period: a burst causes one refresh.
+
+Merely reading an SQLite database in WAL mode creates and deletes its WAL
+and closes both files as writable, so for a database only the events of an
+actual write count; otherwise whoever refreshes on a change would trigger
+itself again.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+import traceback
+
+from fixed_deposit_calculator.storage import SQLITE_EXTENSIONS
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# What counts as a change of an SQLite database and of its WAL: writes, and
+# the database being replaced or removed
+DATABASE_MASK = IN_MODIFY | IN_MOVED_TO | IN_CREATE | IN_DELETE
+WAL_MASK = IN_MODIFY
+
+# Seconds of quiet after the last write before a change is acted on
+DEBOUNCE_SECONDS = 2.0
+
+# Seconds between modification time checks when inotify is unavailable
+POLL_SECONDS = 5.0
+
+
+class Inotify:
+    """Minimal ctypes binding of the Linux inotify API."""
+
+    # struct inotify_event: wd, mask, cookie, len, then len bytes of name
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        # AttributeError on platforms whose libc has no inotify
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, directory, mask=WATCH_MASK):
+        watch = self._add_watch(self.fd, os.fsencode(directory), mask)
+        if watch < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        return watch
+
+    def read(self, timeout=None):
+        """The (watch, mask, name) events available within ``timeout`` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            watch, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            events.append((watch, mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _masks(paths):
+    """``paths`` as {path: event mask}; plain paths count every event of WATCH_MASK."""
+    if isinstance(paths, dict):
+        return dict(paths)
+    return dict.fromkeys(paths, WATCH_MASK)
+
+
+class _InotifyChanges:
+    """Changes to a set of files, through inotify watches on their directories."""
+
+    def __init__(self, paths):
+        self.inotify = Inotify()
+        # A directory has one watch, so it gets the union of its files' masks
+        directories = {}
+        for path, mask in _masks(paths).items():
+            directory, name = os.path.split(os.path.abspath(path))
+            directories.setdefault(directory, {})[name] = mask
+        self.masks = {}
+        try:
+            for directory, names in directories.items():
+                mask = 0
+                for name_mask in names.values():
+                    mask |= name_mask
+                self.masks[self.inotify.add_watch(directory, mask)] = names
+        except OSError:
+            self.inotify.close()
+            raise
+
+    def wait(self, timeout):
+        """Whether a watched file changed within ``timeout`` seconds."""
+        # Other files of the directories (temporary files of an atomic
+        # replace, say) also raise events; they do not end the wait
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            events = self.inotify.read(remaining)
+            if any(
+                mask & self.masks.get(watch, {}).get(name, 0) for watch, mask, name in events
+            ):
+                return True
+
+    def close(self):
+        self.inotify.close()
+
+
+class _PolledChanges:
+    """Changes to a set of files, by comparing their stat results."""
+
+    def __init__(self, paths):
+        self.paths = _masks(paths)
+        self.signature = self._signature()
+
+    def _signature(self):
+        signature = []
+        for path, mask in self.paths.items():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                signature.append(None)
+                continue
+            # Without create and delete events, an empty file (a WAL a reader
+            # just created) is the same as none
+            if not stat.st_size and not mask & IN_CREATE:
+                signature.append(None)
+            else:
+                signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return signature
+
+    def wait(self, timeout):
+        deadline = timeout
+        while True:
+            step = min(POLL_SECONDS, deadline)
+            time.sleep(step)
+            signature = self._signature()
+            if signature != self.signature:
+                self.signature = signature
+                return True
+            deadline -= step
+            if deadline <= 0:
+                return False
+
+    def close(self):
+        pass
+
+
+def file_changes(paths):
+    """A change source for ``paths``: inotify where available, else polling."""
+    try:
+        return _InotifyChanges(paths)
+    except (OSError, AttributeError, TypeError):
+        return _PolledChanges(paths)
+
+
+def related_paths(path):
+    """
+    The files whose changes change a portfolio, with the events that count:
+    SQLite writes go to its WAL first.
+    """
+    if path.endswith(SQLITE_EXTENSIONS):
+        return {path: DATABASE_MASK, f"{path}-wal": WAL_MASK}
+    return {path: WATCH_MASK}
+
+
+def watch(paths, on_change, debounce=DEBOUNCE_SECONDS, stop=None, on_idle=None):
+    """
+    Call ``on_change()`` once per burst of changes to ``paths`` (file names,
+    or {file name: inotify events that count} as from related_paths), when
+    they have been quiet for ``debounce`` seconds, until ``stop`` (a
+    threading.Event) is set. ``on_idle()``, if given, is called about once a
+    second while nothing changes. Errors raised by the callbacks are printed
+    and watching goes on.
+    """
+    stop = stop or threading.Event()
+    changes = file_changes(paths)
+    try:
+        while not stop.is_set():
+            if not changes.wait(1.0):
+                callback = on_idle
+            else:
+                # Wait for a full quiet period after the last write
+                while changes.wait(debounce) and not stop.is_set():
+                    pass
+                callback = on_change
+            if callback is None or stop.is_set():
+                continue
+            try:
+                callback()
+            except Exception:
+                traceback.print_exc()
+    finally:
+        changes.close()
+
+
+class BackgroundWatcher(threading.Thread):
+    """``watch`` in a daemon thread; ``stop()`` ends it."""
+
+    def __init__(self, paths, on_change, debounce=DEBOUNCE_SECONDS, on_idle=None):
+        super().__init__(name="portfolio-watcher", daemon=True)
+        self.paths = _masks(paths)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.on_idle = on_idle
+        self.stopping = threading.Event()
+
+    def run(self):
+        watch(self.paths, self.on_change, self.debounce, self.stopping, self.on_idle)
+
+    def stop(self):
+        self.stopping.set()
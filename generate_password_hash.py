@@ -1,11 +1,12 @@
-import hashlib
+import argparse
 import getpass
-import base64
 from cryptography.fernet import Fernet
 
-def generate_password_hash(password):
-    """Generate a SHA-256 hash from a password string"""
-    return hashlib.sha256(password.encode()).hexdigest()
+from fixed_deposit_calculator.passwords import SCRYPT_N, SCRYPT_P, SCRYPT_R, hash_password
+
+def generate_password_hash(password, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    """Generate a salted scrypt hash (with its parameters recorded) from a password string"""
+    return hash_password(password, n=n, r=r, p=p)
 
 def encrypt_hash(hash_value, key=None):
     """Encrypt a hash value using Fernet"""
@@ -21,11 +22,17 @@ if __name__ == "__main__":
     print("Password Hash Generator for Fixed Deposit Calculator")
     print("----------------------------------------")
 
+    parser = argparse.ArgumentParser(description="Generate an encrypted password hash")
+    parser.add_argument("--n", type=int, default=SCRYPT_N, help="scrypt CPU/memory cost")
+    parser.add_argument("--r", type=int, default=SCRYPT_R, help="scrypt block size")
+    parser.add_argument("--p", type=int, default=SCRYPT_P, help="scrypt parallelization")
+    args = parser.parse_args()
+
     # Get password from user (hidden input)
     password = getpass.getpass("Enter the password you want to use: ")
 
     # Generate the hash
-    password_hash = generate_password_hash(password)
+    password_hash = generate_password_hash(password, n=args.n, r=args.r, p=args.p)
     
     # Ask if user wants to use an existing key or generate a new one
     use_existing = input("Do you have an existing fernet_key in your secrets? (y/n): ").lower().strip() == 'y'
@@ -9,6 +9,7 @@ from googleapiclient.discovery import build
 class GoogleCalendarUtil:
     service = None
     calendar_id = None
+    credentials = None
     # Get the directory where the project is located
     project_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -33,6 +34,7 @@ class GoogleCalendarUtil:
             with open("token.json", "w") as token:
                 token.write(creds.to_json())
 
+        self.credentials = creds
         self.service = build("calendar", "v3", credentials=creds)
 
     @staticmethod
@@ -68,28 +70,45 @@ class GoogleCalendarUtil:
 
         print("Cleared all calendar events.")
 
-    def create_event(self, summary, description, start_date, frequency, end_date=None):
-        event = {"summary": summary, "description": description,
-                 "start": {"date": str(GoogleCalendarUtil.parse_date(start_date))}, "end": {
-                "date": str(self.parse_date(start_date)),
+    @staticmethod
+    def event_body(summary, description, start_date, frequency, end_date=None, exdates=(), rdates=()):
+        """Build the body of a recurring interest event.
+
+        ``exdates`` are occurrences of the rule to leave out and ``rdates``
+        extra dates to add, e.g. to move occurrences onto business days.
+        """
+        recurrence = [GoogleCalendarUtil._create_monthly_recurrence_rule(end_date, frequency)]
+        if len(exdates):
+            recurrence.append(GoogleCalendarUtil._date_list_property("EXDATE", exdates))
+        if len(rdates):
+            recurrence.append(GoogleCalendarUtil._date_list_property("RDATE", rdates))
+        return {"summary": summary, "description": description,
+                "start": {"date": str(GoogleCalendarUtil.parse_date(start_date))}, "end": {
+                "date": str(GoogleCalendarUtil.parse_date(start_date)),
             }, "reminders": {
                 "useDefault": False,
                 "overrides": [
                     {"method": "popup", "minutes": 900},
                     {"method": "email", "minutes": 900},
                 ],
-            }, "recurrence": [self._create_monthly_recurrence_rule(end_date, frequency)]}
-        
-        # Set recurrence rule
+            }, "recurrence": recurrence}
 
+    def insert_event(self, body):
         event = (
             self.service.events()
-            .insert(calendarId=self.calendar_id, body=event)
+            .insert(calendarId=self.calendar_id, body=body)
             .execute()
         )
         print("Event created: %s" % (event.get("htmlLink")))
-        
-    def _create_monthly_recurrence_rule(self, end_date, frequency):
+        return event
+
+    def create_event(self, summary, description, start_date, frequency, end_date=None):
+        self.insert_event(
+            self.event_body(summary, description, start_date, frequency, end_date)
+        )
+
+    @staticmethod
+    def _create_monthly_recurrence_rule(end_date, frequency):
         """Create a monthly recurrence rule.
         
         Args:
@@ -102,7 +121,7 @@ class GoogleCalendarUtil:
         if end_date is not None:
             return (
                 "RRULE:FREQ=MONTHLY;UNTIL=" 
-                + str(self.parse_date_without_hyphens(end_date))
+                + str(GoogleCalendarUtil.parse_date_without_hyphens(end_date))
                 + ";INTERVAL=" 
                 + str(frequency)
             )
@@ -110,8 +129,19 @@ class GoogleCalendarUtil:
             # For indefinite recurrence, omit the UNTIL part
             return "RRULE:FREQ=MONTHLY;INTERVAL=" + str(frequency)
 
-    def create_maturity_event(self, summary, description, end_date):
-        event = {
+    @staticmethod
+    def _date_list_property(name, dates):
+        """An all-day EXDATE or RDATE property listing ``dates``."""
+        return (
+            name
+            + ";VALUE=DATE:"
+            + ",".join(GoogleCalendarUtil.parse_date_without_hyphens(date) for date in dates)
+        )
+
+    @staticmethod
+    def maturity_event_body(summary, description, end_date):
+        """Build the body of a one-off maturity event."""
+        return {
             "summary": summary,
             "description": description,
             "start": {"date": str(GoogleCalendarUtil.parse_date(end_date))},
@@ -125,6 +155,9 @@ class GoogleCalendarUtil:
             },
         }
 
+    def create_maturity_event(self, summary, description, end_date):
+        event = self.maturity_event_body(summary, description, end_date)
+
         event = (
             self.service.events()
             .insert(calendarId=self.calendar_id, body=event)
@@ -132,6 +165,20 @@ class GoogleCalendarUtil:
         )
         print("Maturity event created: %s" % (event.get("htmlLink")))
 
+    def iter_events(self):
+        """Yield every event of the calendar, following pagination."""
+        page_token = None
+        while True:
+            page = (
+                self.service.events()
+                .list(calendarId=self.calendar_id, maxResults=2500, pageToken=page_token)
+                .execute()
+            )
+            yield from page.get("items", [])
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return
+
     def get_all_events(self):
         return (
             self.service.events()
@@ -0,0 +1,135 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+PRODID = "-//fixed-deposit-calculator//ics_export//EN"
+
+# Private extended property naming what an event is about (a deposit, a SIP
+# folio); the UID is derived from it
+EVENT_KEY_PROPERTY = "eventKey"
+
+
+def escape_text(value):
+    """Escape a TEXT value as required by RFC 5545."""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line):
+    """Fold a content line into chunks of at most 75 octets."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never split a multi-byte UTF-8 sequence
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode("utf-8"))
+        start = end
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_date(iso_date):
+    return iso_date.replace("-", "")
+
+
+def with_event_key(event, *parts):
+    """
+    Return a copy of ``event`` tagged with what it is about, e.g. the kind of
+    event, SOURCE and DEP NO of a deposit.
+    """
+    private = dict(event.get("extendedProperties", {}).get("private", {}))
+    private[EVENT_KEY_PROPERTY] = "\x1f".join(str(part) for part in parts)
+    return dict(event, extendedProperties={"private": private})
+
+
+def event_uid(event):
+    """
+    A stable UID so subscribed clients update events instead of duplicating
+    them. It comes from the event key, so a changed amount or date updates
+    the event; events without a key fall back to their summary and start.
+    """
+    key = event.get("extendedProperties", {}).get("private", {}).get(EVENT_KEY_PROPERTY)
+    if key is None:
+        key = "\x1f".join([event["summary"], event["start"]["date"]])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest() + "@fixed-deposit-calculator"
+
+
+def event_lines(event, dtstamp):
+    """
+    Yield the content lines of one VEVENT for a Google Calendar event body as
+    built by GoogleCalendarUtil.event_body or maturity_event_body.
+    """
+    start = datetime.strptime(event["start"]["date"], "%Y-%m-%d")
+    # All-day events end on the following (exclusive) day in iCalendar
+    end = start + timedelta(days=1)
+
+    yield "BEGIN:VEVENT"
+    yield f"UID:{event_uid(event)}"
+    yield f"DTSTAMP:{dtstamp}"
+    yield f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}"
+    yield f"DTEND;VALUE=DATE:{end.strftime('%Y%m%d')}"
+    yield f"SUMMARY:{escape_text(event['summary'])}"
+    yield f"DESCRIPTION:{escape_text(event['description'])}"
+    for rule in event.get("recurrence", []):
+        yield rule
+
+    # Only popup reminders map cleanly to iCalendar; email alarms need attendees
+    for reminder in event.get("reminders", {}).get("overrides", []):
+        if reminder["method"] == "popup":
+            yield "BEGIN:VALARM"
+            yield "ACTION:DISPLAY"
+            yield f"DESCRIPTION:{escape_text(event['summary'])}"
+            yield f"TRIGGER:-PT{reminder['minutes']}M"
+            yield "END:VALARM"
+    yield "END:VEVENT"
+
+
+def calendar_lines(events, calendar_name, now=None):
+    """Yield every content line of a VCALENDAR holding ``events``."""
+    now = now or datetime.now(timezone.utc)
+    dtstamp = now.strftime("%Y%m%dT%H%M%SZ")
+
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield f"PRODID:{PRODID}"
+    yield "CALSCALE:GREGORIAN"
+    yield f"X-WR-CALNAME:{escape_text(calendar_name)}"
+    yield "X-WR-TIMEZONE:Asia/Kolkata"
+    for event in events:
+        yield from event_lines(event, dtstamp)
+    yield "END:VCALENDAR"
+
+
+def write_ics(path, events, calendar_name, now=None):
+    """
+    Stream ``events`` into a single .ics file without touching the network.
+
+    ``events`` can be any iterable (e.g. a generator over a very large book);
+    lines are written as they are produced rather than built up in memory.
+    Returns the number of events written.
+    """
+    count = 0
+
+    def counted(events):
+        nonlocal count
+        for event in events:
+            count += 1
+            yield event
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.writelines(
+            fold_line(line) for line in calendar_lines(counted(events), calendar_name, now)
+        )
+    return count
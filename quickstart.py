@@ -1,13 +1,30 @@
 from __future__ import print_function
 
+import argparse
 import os
 
 import pandas as pd
-import babel.numbers
 
 from dateutil.relativedelta import relativedelta
 
+from fixed_deposit_calculator.business_days import (
+    CONVENTIONS,
+    BusinessCalendar,
+    recurrence_adjustments,
+)
+from fixed_deposit_calculator.currency import format_inr
+from fixed_deposit_calculator.ingest import (
+    DEPOSIT_COLUMNS,
+    DEPOSIT_OPTIONAL_COLUMNS,
+    SOURCE_COLUMN,
+    load_portfolio,
+)
+from fixed_deposit_calculator.keys import keys_from_environment
+from fixed_deposit_calculator.schema import validate_deposits
+from fixed_deposit_calculator.storage import SQLiteStore
+from calendar_sync import GoogleCalendarAsyncClient, print_progress, run_sync
 from google_calendar import GoogleCalendarUtil
+from ics_export import with_event_key, write_ics
 
 
 def get_divider(tenure):
@@ -24,7 +41,7 @@ def get_divider(tenure):
 
 
 def fmt_curr(amt):
-    return babel.numbers.format_currency(amt.item(), "INR", locale="en_IN")
+    return format_inr(amt)
 
 
 def calculate_interest(amount, apr, tenure):
@@ -40,7 +57,7 @@ def calculate_total_interest(amount, apr, start_date, end_date):
     return amount * apr / 12 * number_of_months(start_date, end_date)
 
 
-def create_maturity_events(google_calendar_util, row):
+def maturity_event(row, calendar=None):
     summary = (
         "FD maturing: "
         + row["NAME OF THE DEPOSITEE"]
@@ -59,12 +76,19 @@ def create_maturity_events(google_calendar_util, row):
         + str(row["CUST ID"])
     )
 
-    google_calendar_util.create_maturity_event(
-        summary, description, row["MATURITY DATE"]
+    maturity_date = row["MATURITY DATE"]
+    if calendar is not None:
+        maturity_date = pd.Timestamp(calendar.adjust(maturity_date))
+
+    return with_event_key(
+        GoogleCalendarUtil.maturity_event_body(summary, description, maturity_date),
+        "maturity",
+        row.get(SOURCE_COLUMN, ""),
+        row["DEP NO"],
     )
 
 
-def create_events(google_calendar_util, row):
+def interest_event(row, calendar=None):
     apr = row["RATE OF INT"]
     amt = row["DEPOSIT AMT"]
     tenure = row["INTEREST PAYABLE"]
@@ -94,38 +118,116 @@ def create_events(google_calendar_util, row):
         + fmt_curr(amt + total_interest)
     )
 
-    google_calendar_util.create_event(
+    until = end_date - pd.Timedelta(1, unit="d")
+    # Occurrences falling on holidays are replaced by their business days
+    exdates, rdates = (), ()
+    if calendar is not None:
+        exdates, rdates = recurrence_adjustments(start_date, until, frequency, calendar)
+
+    event = GoogleCalendarUtil.event_body(
         summary=summary,
         description=description,
         start_date=start_date,
         frequency=frequency,
-        end_date=end_date - pd.Timedelta(1, unit="d"),
+        end_date=until,
+        exdates=exdates,
+        rdates=rdates,
     )
+    return with_event_key(event, "interest", row.get(SOURCE_COLUMN, ""), row["DEP NO"])
 
 
-def main():
-    # Get the directory where the project is located
-    project_dir = os.path.dirname(os.path.abspath(__file__))
+def portfolio_events(df, calendar=None):
+    """Yield the interest and maturity event bodies for every deposit."""
+    for i in range(len(df)):
+        row = df.iloc[i]
 
-    # Construct path to the data file
-    data_file_path = os.path.join(project_dir, "data", "data.xlsx")
+        if row["INTEREST PAYABLE"] != "C":
+            yield interest_event(row, calendar)
 
-    df = pd.read_excel(data_file_path, sheet_name="vivek fd 2025")
+        yield maturity_event(row, calendar)
 
-    google_calendar_util = GoogleCalendarUtil()
 
-    google_calendar_util.create_or_use_calendar("Investments")
+def main(ics_path=None, concurrency=8, db_path=None, holidays_path=None, convention="following"):
+    calendar = None
+    if holidays_path is not None:
+        calendar = BusinessCalendar.from_file(holidays_path, convention)
 
-    google_calendar_util.clear_calendar()
+    if db_path is not None:
+        df = SQLiteStore(db_path, keys_from_environment()).deposits()
+    else:
+        # Get the directory where the project is located
+        project_dir = os.path.dirname(os.path.abspath(__file__))
 
-    for i in range(len(df)):
-        row = df.iloc[i]
+        # Construct path to the data file
+        data_file_path = os.path.join(project_dir, "data", "data.xlsx")
 
-        if row["INTEREST PAYABLE"] != "C":
-            create_events(google_calendar_util, row)
+        df = load_portfolio(
+            [data_file_path],
+            columns=DEPOSIT_COLUMNS,
+            max_workers=None,
+            optional_columns=DEPOSIT_OPTIONAL_COLUMNS,
+        )
+
+        df, rejected_df = validate_deposits(df)
+        if not rejected_df.empty:
+            print("Skipping deposits with data problems:")
+            print(rejected_df.to_string(index=False))
+
+    if ics_path is not None:
+        # Offline export: no OAuth, no API calls
+        count = write_ics(ics_path, portfolio_events(df, calendar), "Investments")
+        print(f"Wrote {count} events to {ics_path}")
+        return
 
-        create_maturity_events(google_calendar_util, row)
+    sync_portfolio(df, concurrency, calendar)
+
+
+def sync_portfolio(df, concurrency=8, calendar=None):
+    """Bring the Investments calendar in line with the deposits of ``df``."""
+    google_calendar_util = GoogleCalendarUtil()
+
+    google_calendar_util.create_or_use_calendar("Investments")
+
+    # Unchanged events are skipped and stale ones deleted, instead of clearing
+    # the calendar and recreating everything
+    report = run_sync(
+        GoogleCalendarAsyncClient(google_calendar_util),
+        portfolio_events(df, calendar),
+        existing=list(google_calendar_util.iter_events()),
+        concurrency=concurrency,
+        progress=print_progress,
+    )
+    print(report)
+    for label, error in report.failed:
+        print(f"Failed to sync {label}: {error}")
+    return report
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Sync fixed deposits to Google Calendar")
+    parser.add_argument(
+        "--ics", metavar="PATH", help="write the events to an .ics file instead of syncing"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="number of concurrent API requests"
+    )
+    parser.add_argument(
+        "--db", metavar="PATH", help="read deposits from an SQLite store instead of data/data.xlsx"
+    )
+    parser.add_argument(
+        "--holidays", metavar="PATH", help="holiday file; events move to business days"
+    )
+    parser.add_argument(
+        "--convention",
+        choices=list(CONVENTIONS),
+        default="following",
+        help="business-day convention used with --holidays",
+    )
+    args = parser.parse_args()
+    main(
+        ics_path=args.ics,
+        concurrency=args.concurrency,
+        db_path=args.db,
+        holidays_path=args.holidays,
+        convention=args.convention,
+    )
@@ -0,0 +1,114 @@
+import argparse
+import datetime
+import os
+import time
+
+from fixed_deposit_calculator.business_days import CONVENTIONS, BusinessCalendar
+from fixed_deposit_calculator.keys import keys_from_environment
+from fixed_deposit_calculator.reports import ARTIFACTS_DIR, publish_report, report_digest
+from fixed_deposit_calculator.storage import open_store
+from fixed_deposit_calculator.watcher import DEBOUNCE_SECONDS, related_paths, watch
+from quickstart import sync_portfolio
+
+# Seconds before the day's report is tried again after a failed refresh
+RETRY_SECONDS = 60
+
+default_portfolio = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fixed_deposit_calculator", "data.xlsx.enc"
+)
+
+
+class PortfolioRefresher:
+    """
+    Re-renders the report artifacts of a portfolio (and optionally syncs the
+    calendar) whenever its file changes and when the day changes, so the app
+    finds the day's report ready instead of decrypting and computing it for
+    the first visitor.
+    """
+
+    def __init__(self, path, key, directory=ARTIFACTS_DIR, calendar=None, sync_calendar=False):
+        self.path = path
+        self.key = key
+        self.directory = directory
+        self.calendar = calendar
+        self.sync_calendar = sync_calendar
+        self.today = None
+        self.digest = None
+        self.synced_digest = None
+        self.retry_at = 0.0
+
+    def refresh(self):
+        started = time.perf_counter()
+        self.retry_at = time.monotonic() + RETRY_SECONDS
+        today = datetime.date.today()
+        store = open_store(self.path, self.key)
+        digest = report_digest(store, self.calendar)
+        if (today, digest) == (self.today, self.digest):
+            # Nothing new, e.g. the file was rewritten with the same content
+            return
+        entry = publish_report(store, self.key, today, self.directory, self.calendar)
+        # Only once published, so a failed day is retried
+        self.today, self.digest = today, digest
+        print(
+            f"Report for {entry['date']} (data {entry['digest'][:16]}) ready "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        # Calendar events only depend on the deposits, not on the day
+        if self.sync_calendar and entry["digest"] != self.synced_digest:
+            sync_portfolio(store.deposits(), calendar=self.calendar)
+            self.synced_digest = entry["digest"]
+
+    def on_idle(self):
+        # After a failure, wait a while before the next attempt
+        if datetime.date.today() != self.today and time.monotonic() >= self.retry_at:
+            self.refresh()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Watch a portfolio and pre-render its reports whenever it changes"
+    )
+    parser.add_argument(
+        "portfolio",
+        nargs="?",
+        default=default_portfolio,
+        help="encrypted workbook or SQLite store (default fixed_deposit_calculator/data.xlsx.enc)",
+    )
+    parser.add_argument("--out", default=ARTIFACTS_DIR, help="artifacts directory")
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=DEBOUNCE_SECONDS,
+        help="seconds of quiet after a write before refreshing",
+    )
+    parser.add_argument(
+        "--sync-calendar", action="store_true", help="also sync the Investments calendar"
+    )
+    parser.add_argument(
+        "--holidays", metavar="PATH", help="holiday file; payments move to business days"
+    )
+    parser.add_argument(
+        "--convention",
+        choices=list(CONVENTIONS),
+        default="following",
+        help="business-day convention used with --holidays",
+    )
+    args = parser.parse_args()
+
+    calendar = None
+    if args.holidays:
+        calendar = BusinessCalendar.from_file(args.holidays, args.convention)
+
+    key = keys_from_environment()
+    refresher = PortfolioRefresher(args.portfolio, key, args.out, calendar, args.sync_calendar)
+    refresher.refresh()
+    print(f"Watching {args.portfolio}")
+    try:
+        watch(
+            related_paths(args.portfolio),
+            refresher.refresh,
+            args.debounce,
+            on_idle=refresher.on_idle,
+        )
+    except KeyboardInterrupt:
+        pass
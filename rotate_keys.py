@@ -0,0 +1,270 @@
+"""
+Rotate the Fernet key of everything the app encrypts.
+
+Re-encrypts the .enc portfolios and report artifacts and the SQLite stores
+found in the given files and directories, and the password hash in
+secrets.toml, under a new key. Files are rotated in a process pool; each one
+is written to a temporary file next to it, read back and checked to decrypt
+under the new key alone to the same plaintext, and only then renamed over
+the original, so an interrupted rotation leaves every file readable.
+
+The secrets are rewritten first, with the new key as fernet_key and the keys
+it replaces as previous_fernet_keys, so the app decrypts both old and new
+files while the rotation runs. Remove previous_fernet_keys once it is done.
+With --secrets and no --new-key a new key is generated; while the secrets
+still list previous_fernet_keys, a rotation is under way and is resumed by
+passing its key (the current fernet_key) as --new-key, rather than starting
+another one. Without --secrets, the files are rotated to --new-key, which
+the app's secrets must already accept.
+
+    python rotate_keys.py fixed_deposit_calculator --secrets .streamlit/secrets.toml
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import time
+import tomllib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from fixed_deposit_calculator.keys import fernet, key_list, keys_from_environment
+from fixed_deposit_calculator.storage import SQLITE_EXTENSIONS, SQLiteStore
+
+
+def encrypted_files(paths):
+    """The .enc files and SQLite stores in ``paths``, walking directories."""
+    found = []
+    for path in paths:
+        if not os.path.isdir(path):
+            found.append(path)
+            continue
+        for directory, _, names in os.walk(path):
+            found.extend(
+                os.path.join(directory, name)
+                for name in sorted(names)
+                if name.endswith((".enc",) + SQLITE_EXTENSIONS)
+            )
+    return found
+
+
+def rotate_file(path, keys):
+    """
+    Re-encrypt one .enc file under ``keys[0]``. Returns (status, bytes):
+    "current" when it already decrypts under the new key.
+    """
+    new = Fernet(keys[0])
+    with open(path, "rb") as f:
+        token = f.read()
+    try:
+        new.decrypt(token)
+        return "current", len(token)
+    except InvalidToken:
+        pass
+
+    keyring = fernet(keys)
+    plaintext = keyring.decrypt(token)
+    # rotate keeps the original timestamp of the token
+    rotated = keyring.rotate(token)
+    temporary = f"{path}.rotating{os.getpid()}"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(rotated)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, temporary)
+        with open(temporary, "rb") as f:
+            if new.decrypt(f.read()) != plaintext:
+                raise ValueError("re-encrypted file does not match the original")
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return "rotated", len(rotated)
+
+
+def rotate_store(path, keys):
+    """Re-seal the rows of one SQLite store under ``keys[0]``; returns (status, rows)."""
+    # Only databases holding a store: SQLiteStore would create its table
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as connection:
+        is_store = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'deposits'"
+        ).fetchone()
+    if not is_store:
+        return "skipped", 0
+    rows = SQLiteStore(path, keys).rekey()
+    return ("rotated" if rows else "current"), rows
+
+
+def rotate_path(path, keys):
+    try:
+        if path.endswith(SQLITE_EXTENSIONS):
+            status, size = rotate_store(path, keys)
+        else:
+            status, size = rotate_file(path, keys)
+        return path, status, size, None
+    except Exception as e:
+        return path, "failed", 0, f"{type(e).__name__}: {e}"
+
+
+def read_secrets(path):
+    """The keys (fernet_key first) and encrypted password hash of a secrets.toml."""
+    with open(path, "rb") as f:
+        secrets = tomllib.load(f)
+    cryptography = secrets["cryptography"]
+    keys = key_list([cryptography["fernet_key"]] + cryptography.get("previous_fernet_keys", []))
+    return keys, secrets.get("authentication", {}).get("encrypted_password_hash")
+
+
+def rewrite_secrets(path, values):
+    """
+    Set ``values`` ({(section, name): TOML value}) in a secrets.toml, keeping
+    its other lines and comments, and replace the file atomically.
+    """
+    with open(path) as f:
+        lines = f.read().splitlines()
+
+    pending = dict(values)
+    output = []
+    section = None
+    skipping_array = False
+    for line in lines:
+        stripped = line.strip()
+        if skipping_array:
+            # Rest of a multi-line array being replaced
+            skipping_array = "]" not in stripped
+            continue
+        if stripped.startswith("[") and not stripped.startswith("[["):
+            _append_to_section(output, _assignments(section, pending))
+            section = stripped.strip("[]").strip()
+        name = stripped.split("=", 1)[0].strip()
+        if "=" in stripped and (section, name) in pending:
+            output.append(f"{name} = {pending.pop((section, name))}")
+            value = stripped.split("=", 1)[1].strip()
+            skipping_array = value.startswith("[") and "]" not in value
+            continue
+        output.append(line)
+    _append_to_section(output, _assignments(section, pending))
+    for section_name in dict.fromkeys(s for s, _ in pending):
+        output.extend(["", f"[{section_name}]"] + _assignments(section_name, pending))
+
+    text = "\n".join(output) + "\n"
+    # Fail before touching the file if the edit broke it
+    tomllib.loads(text)
+    temporary = f"{path}.rotating{os.getpid()}"
+    with open(temporary, "w") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    shutil.copymode(path, temporary)
+    os.replace(temporary, path)
+
+
+def _append_to_section(output, lines):
+    """Add keys new to a section after its last line, before the blank lines."""
+    end = len(output)
+    while end and not output[end - 1].strip():
+        end -= 1
+    output[end:end] = lines
+
+
+def _assignments(section, pending):
+    names = [name for s, name in pending if s == section]
+    return [f"{name} = {pending.pop((section, name))}" for name in names]
+
+
+def secrets_values(keys, encrypted_password_hash):
+    """The secrets.toml values for rotating to ``keys[0]`` from ``keys[1:]``."""
+    values = {
+        ("cryptography", "fernet_key"): json.dumps(keys[0].decode()),
+        ("cryptography", "previous_fernet_keys"): json.dumps([k.decode() for k in keys[1:]]),
+    }
+    if encrypted_password_hash:
+        token = encrypted_password_hash.encode()
+        try:
+            Fernet(keys[0]).decrypt(token)
+        except InvalidToken:
+            token = fernet(keys).rotate(token)
+        values[("authentication", "encrypted_password_hash")] = json.dumps(token.decode())
+    return values
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-encrypt portfolios, stores and the password hash under a new Fernet key"
+    )
+    parser.add_argument("paths", nargs="+", help=".enc files, SQLite stores or directories")
+    parser.add_argument(
+        "--new-key",
+        help="key to rotate to (with --secrets, default: a newly generated key; "
+        "required without --secrets)",
+    )
+    parser.add_argument(
+        "--secrets",
+        metavar="PATH",
+        help="secrets.toml to read the current keys from and update "
+        "(default: FERNET_KEY and FERNET_PREVIOUS_KEYS, and print the new lines)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="processes re-encrypting files"
+    )
+    args = parser.parse_args()
+
+    if not args.secrets and not args.new_key:
+        # The generated key would only be printed, and the files rotated to a
+        # key the app does not know yet
+        parser.error("--new-key is required without --secrets")
+    if args.secrets:
+        current, encrypted_password_hash = read_secrets(args.secrets)
+        if not args.new_key and len(current) > 1:
+            parser.error(
+                f"{args.secrets} lists previous_fernet_keys: a rotation is under way. "
+                "Resume it with --new-key set to its fernet_key, or remove "
+                "previous_fernet_keys once every file is rotated."
+            )
+    else:
+        current, encrypted_password_hash = keys_from_environment(), None
+    new_key = (args.new_key or Fernet.generate_key().decode()).encode()
+    keys = (new_key,) + tuple(key for key in current if key != new_key)
+
+    values = secrets_values(keys, encrypted_password_hash)
+    if args.secrets:
+        rewrite_secrets(args.secrets, values)
+        print(f"Updated {args.secrets}: the app now accepts the old and new keys")
+    else:
+        print("The app must accept the new key; .streamlit/secrets.toml needs:")
+        print("\n[cryptography]")
+        for (_, name), value in values.items():
+            print(f"{name} = {value}")
+        print("\nand re-encrypt encrypted_password_hash by running with --secrets.")
+
+    started = time.perf_counter()
+    paths = encrypted_files(args.paths)
+    counts = {}
+    size = 0
+    failures = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(rotate_path, path, keys) for path in paths]
+        for future in as_completed(futures):
+            path, status, amount, error = future.result()
+            counts[status] = counts.get(status, 0) + 1
+            if error:
+                failures.append((path, error))
+            elif status == "rotated" and not path.endswith(SQLITE_EXTENSIONS):
+                size += amount
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{counts.get('rotated', 0)} rotated ({size / 2**20:.1f} MB of files), "
+        f"{counts.get('current', 0)} already current, {counts.get('skipped', 0)} skipped, "
+        f"{len(failures)} failed, in {elapsed:.1f}s with {args.workers} workers"
+    )
+    for path, error in failures:
+        print(f"  {path}: {error}")
+    if failures:
+        raise SystemExit(1)
+    print("Once the app runs on the new key, remove previous_fernet_keys from the secrets.")
@@ -0,0 +1,193 @@
+"""
+SIP schedules and returns.
+
+Installments fall on the SIP's ``Day of the Month``, clamped to the last day
+of shorter months (a SIP on the 31st debits on Feb 28/29, then Mar 31).
+Every month is clamped on its own, so unlike deposit interest dates the day
+never drifts. All dates for all SIPs are generated at once with NumPy month
+arithmetic, and XIRR is solved for every folio together with a vectorized
+Newton iteration.
+"""
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from fixed_deposit_calculator.schedule import days_in_month
+
+# Optional columns of the SIP sheets. Without Start Date, installments are
+# counted from January of the current year (as the calendar events assume);
+# without End Date the SIP is still running; XIRR needs Current Value.
+SIP_OPTIONAL_COLUMNS = ["Start Date", "End Date", "Current Value"]
+
+XIRR_GUESS = 0.1
+XIRR_TOLERANCE = 1e-9
+XIRR_MAX_ITERATIONS = 100
+
+
+def _days(values):
+    return np.asarray(values, dtype="datetime64[D]")
+
+
+def _months(days):
+    return days.astype("datetime64[M]").astype(np.int64)
+
+
+def debit_dates(months, day):
+    """The debit date in each month index (months since 1970-01) for the given day."""
+    day = np.minimum(day, days_in_month(months))
+    return months.astype("datetime64[M]").astype("datetime64[D]") + (day - 1)
+
+
+def installment_schedule(start, end, day):
+    """
+    All installments of every SIP between its start and end dates (inclusive).
+
+    Returns (rows, dates): the position of the SIP and the debit date of each
+    installment, grouped by SIP in date order.
+    """
+    start, end = _days(start), _days(end)
+    day = np.asarray(day, dtype=np.int64)
+
+    first = _months(start)
+    first = np.where(debit_dates(first, day) < start, first + 1, first)
+    last = _months(end)
+    last = np.where(debit_dates(last, day) > end, last - 1, last)
+    counts = np.maximum(last - first + 1, 0)
+
+    rows = np.repeat(np.arange(len(day)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, debit_dates(first[rows] + offsets, day[rows])
+
+
+def next_debits(start, end, day, today, n=3):
+    """
+    The next ``n`` debit dates after ``today`` of every SIP, as an array of
+    shape (SIPs, n) with NaT past the end of a SIP.
+    """
+    start, end = _days(start), _days(end)
+    day = np.asarray(day, dtype=np.int64)
+    today = np.datetime64(pd.Timestamp(today), "D")
+
+    after = np.maximum(start, today + 1)
+    first = _months(after)
+    first = np.where(debit_dates(first, day) < after, first + 1, first)
+    months = first[:, None] + np.arange(n)
+    dates = debit_dates(months, day[:, None])
+    return np.where(dates <= end[:, None], dates, np.datetime64("NaT"))
+
+
+def xirr(groups, dates, amounts, count=None, guess=None):
+    """
+    Annualized internal rate of return of many cash flow series at once.
+
+    ``groups`` numbers the series (0..count-1) each cash flow belongs to. Each
+    Newton step evaluates the NPV and its derivative of every series with
+    two bincounts, so all series converge together. Series that do not
+    converge, or have no sign change, get NaN.
+
+    Without a ``guess``, each series starts from the rate that grows its
+    outflows to its inflows over their amount-weighted average horizon,
+    which is usually within a few Newton steps of the root.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=float)
+    dates = _days(dates)
+    n = int(groups.max(initial=-1)) + 1 if count is None else count
+
+    # Years from each cash flow to the last one of its series
+    last = np.full(n, np.datetime64("0001-01-01", "D"))
+    np.maximum.at(last, groups, dates)
+    years = (last[groups] - dates).astype(float) / 365.0
+
+    inflow = np.bincount(groups, np.maximum(amounts, 0.0), minlength=n)
+    outflow = np.bincount(groups, np.maximum(-amounts, 0.0), minlength=n)
+    solving = (inflow > 0) & (outflow > 0)
+
+    if guess is None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Amount-weighted time from the outflows to the inflows
+            horizon = (
+                np.bincount(groups, np.maximum(-amounts, 0.0) * years, minlength=n) / outflow
+                - np.bincount(groups, np.maximum(amounts, 0.0) * years, minlength=n) / inflow
+            )
+            rate = (inflow / outflow) ** (1.0 / np.maximum(horizon, 1 / 365.0)) - 1.0
+        rate = np.where(solving & np.isfinite(rate), np.clip(rate, -0.999, 10.0), XIRR_GUESS)
+    else:
+        rate = np.full(n, float(guess))
+    sign_change = solving.copy()
+
+    # Newton on the log growth rate x = log(1 + rate) of the value of the
+    # flows at the last date. For installments followed by a redemption
+    # value that is decreasing and concave in x, so the iteration converges
+    # from any start, including deeply negative returns where the present
+    # value is not monotone
+    x = np.log1p(rate)
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(XIRR_MAX_ITERATIONS):
+            if not solving.any():
+                break
+            grown = amounts * np.exp(x[groups] * years)
+            npv = np.bincount(groups, grown, minlength=n)
+            slope = np.bincount(groups, years * grown, minlength=n)
+            # At most one unit of log growth per step (a factor of e)
+            step = np.where(solving, np.clip(npv / slope, -1.0, 1.0), 0.0)
+            x = x - step
+            solving &= np.abs(step) > XIRR_TOLERANCE
+            solving &= np.isfinite(x)
+    rate = np.expm1(x)
+
+    converged = sign_change & ~solving & np.isfinite(rate)
+    return np.where(converged, rate, np.nan)
+
+
+def sip_frame(df, today=None):
+    """Typed Start Date, End Date, Day and Current Value columns for a SIP sheet."""
+    today = pd.Timestamp(today or datetime.date.today())
+    df = df.copy()
+    for column in SIP_OPTIONAL_COLUMNS:
+        if column not in df.columns:
+            df[column] = None
+    df["Start Date"] = pd.to_datetime(df["Start Date"], errors="coerce").fillna(
+        pd.Timestamp(today.year, 1, 1)
+    )
+    df["End Date"] = pd.to_datetime(df["End Date"], errors="coerce")
+    df["Day of the Month"] = pd.to_numeric(df["Day of the Month"], errors="coerce")
+    df["Amount"] = pd.to_numeric(df["Amount"], errors="coerce")
+    df["Current Value"] = pd.to_numeric(df["Current Value"], errors="coerce")
+    return df.dropna(subset=["Day of the Month", "Amount"]).reset_index(drop=True)
+
+
+def sip_summary(df, today=None, upcoming=3):
+    """
+    Per SIP: installments paid and amount invested up to ``today``, the next
+    ``upcoming`` debit dates and, where the Current Value is known, the XIRR.
+    """
+    today = pd.Timestamp(today or datetime.date.today())
+    df = sip_frame(df, today)
+    day = df["Day of the Month"].to_numpy(dtype=np.int64)
+    start = df["Start Date"].to_numpy(dtype="datetime64[D]")
+    end = df["End Date"].fillna(pd.Timestamp.max.normalize()).to_numpy(dtype="datetime64[D]")
+    amount = df["Amount"].to_numpy(dtype=float)
+
+    paid_until = np.minimum(end, np.datetime64(today, "D"))
+    rows, dates = installment_schedule(start, paid_until, day)
+    installments = np.bincount(rows, minlength=len(df))
+
+    summary = df[["Company", "Folio Number", "Amount", "Day of the Month"]].copy()
+    summary["INSTALLMENTS"] = installments
+    summary["INVESTED"] = installments * amount
+
+    following = next_debits(start, end, day, today, upcoming)
+    for i in range(upcoming):
+        summary[f"DEBIT {i + 1}"] = pd.to_datetime(following[:, i])
+
+    # Each SIP's cash flows: every installment out, the current value in today
+    valued = df["Current Value"].notna().to_numpy()
+    terminal = np.flatnonzero(valued)
+    groups = np.concatenate([rows, terminal])
+    flows = np.concatenate([-amount[rows], df["Current Value"].to_numpy(dtype=float)[terminal]])
+    flow_dates = np.concatenate([dates, np.full(len(terminal), np.datetime64(today, "D"))])
+    keep = valued[groups]
+    summary["XIRR"] = xirr(groups[keep], flow_dates[keep], flows[keep], count=len(df))
+    return summary
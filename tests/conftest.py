@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from fixed_deposit_calculator.schema import validate_deposits
+
+
+@pytest.fixture
+def deposits():
+    """Builds a validated frame of quarterly deposits with the given numbers."""
+
+    def build(dep_nos):
+        df = pd.DataFrame(
+            {
+                "DEP NO": dep_nos,
+                "NAME OF THE DEPOSITEE": "Asha",
+                "DATE": pd.Timestamp("2025-01-15"),
+                "MATURITY DATE": pd.Timestamp("2027-01-15"),
+                "DEPOSIT AMT": 100000.0,
+                "RATE OF INT": 0.07,
+                "INTEREST PAYABLE": "Q",
+                "CUST ID": 1001,
+            }
+        )
+        return validate_deposits(df)[0]
+
+    return build
+
+
+@pytest.fixture
+def book():
+    """
+    Builds a validated frame from dicts of DATE, MATURITY DATE, DEPOSIT AMT,
+    RATE OF INT and INTEREST PAYABLE; DEP NO, NAME OF THE DEPOSITEE and
+    CUST ID default to a numbered deposit of one depositee.
+    """
+
+    def build(*rows):
+        df = pd.DataFrame(list(rows))
+        df.insert(0, "DEP NO", df.pop("DEP NO") if "DEP NO" in df else range(1, len(df) + 1))
+        df["NAME OF THE DEPOSITEE"] = df.get("NAME OF THE DEPOSITEE", "Asha")
+        df["CUST ID"] = df.get("CUST ID", 1001)
+        return validate_deposits(df)[0]
+
+    return build
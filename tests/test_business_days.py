@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from fixed_deposit_calculator.business_days import BusinessCalendar, load_holidays
+
+HOLIDAYS = ["2025-08-15", "2025-09-30", "2025-10-31"]
+
+
+def days(*values):
+    return np.array(values, dtype="datetime64[D]")
+
+
+# Mixed time zones are deprecated in pandas: the dates must not depend on them
+@pytest.mark.filterwarnings("error")
+def test_load_holidays_keeps_the_date_of_every_dtstart(tmp_path):
+    path = tmp_path / "holidays.ics"
+    path.write_text(
+        "BEGIN:VCALENDAR\n"
+        "BEGIN:VEVENT\nDTSTART;VALUE=DATE:20250815\nEND:VEVENT\n"
+        "BEGIN:VEVENT\nDTSTART:20250126T000000Z\nEND:VEVENT\n"
+        "BEGIN:VEVENT\nDTSTART;TZID=Asia/Kolkata:20251002T093000\nEND:VEVENT\n"
+        "BEGIN:VEVENT\nDTSTART;VALUE=DATE:20250126\nEND:VEVENT\n"
+        "END:VCALENDAR\n"
+    )
+    np.testing.assert_array_equal(
+        load_holidays(str(path)), days("2025-01-26", "2025-08-15", "2025-10-02")
+    )
+
+
+def test_load_holidays_from_csv(tmp_path):
+    path = tmp_path / "holidays.csv"
+    path.write_text(
+        "date,name\n# national\n2025-08-15,Independence Day\n\n2025-01-26,Republic Day\n"
+    )
+    np.testing.assert_array_equal(load_holidays(str(path)), days("2025-01-26", "2025-08-15"))
+
+
+@pytest.mark.parametrize(
+    "date, following, modified_following",
+    [
+        # Business days stay, including a fifth Saturday
+        ("2025-08-14", "2025-08-14", "2025-08-14"),
+        ("2025-08-30", "2025-08-30", "2025-08-30"),
+        # A holiday moves to the (third) Saturday after it
+        ("2025-08-15", "2025-08-16", "2025-08-16"),
+        # Second Saturday, then Sunday
+        ("2025-09-13", "2025-09-15", "2025-09-15"),
+        # Sunday at a month end: modified following stays in August
+        ("2025-08-31", "2025-09-01", "2025-08-30"),
+        # Holiday at a month end
+        ("2025-09-30", "2025-10-01", "2025-09-29"),
+        # Holiday before a (first) Saturday in the next month
+        ("2025-10-31", "2025-11-01", "2025-10-30"),
+        # Outside the precomputed table
+        ("2200-08-31", "2200-09-01", "2200-08-30"),
+    ],
+)
+def test_rolling_conventions(date, following, modified_following):
+    for convention, expected in [
+        ("following", following),
+        ("modified_following", modified_following),
+    ]:
+        calendar = BusinessCalendar(days(*HOLIDAYS), convention)
+        assert calendar.adjust(days(date))[0] == np.datetime64(expected), convention
+
+
+def test_adjust_keeps_nat_and_reports_max_shift():
+    calendar = BusinessCalendar(days(*HOLIDAYS), "modified_following")
+    adjusted = calendar.adjust(days("2025-08-31", "NaT"))
+    assert adjusted[0] == np.datetime64("2025-08-30") and np.isnat(adjusted[1])
+    assert calendar.is_business_day(days("2025-08-30", "2025-08-31")).tolist() == [True, False]
+    assert 0 < calendar.max_shift < 7
+
+
+def test_unknown_convention():
+    with pytest.raises(ValueError, match="preceding"):
+        BusinessCalendar(convention="preceding")
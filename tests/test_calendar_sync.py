@@ -0,0 +1,95 @@
+import json
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from calendar_sync import FakeCalendarClient, run_sync, stored_content_hash, with_content_hash
+
+
+def http_error(status, reason=None):
+    errors = [{"reason": reason, "domain": "usageLimits"}] if reason else []
+    content = json.dumps({"error": {"code": status, "message": "error", "errors": errors}})
+    return HttpError(httplib2.Response({"status": status}), content.encode())
+
+
+class FlakyCalendarClient(FakeCalendarClient):
+    """Fails the first ``failures`` inserts with ``error``."""
+
+    def __init__(self, error, failures):
+        super().__init__(latency=0)
+        self.error = error
+        self.failures = failures
+
+    async def insert_event(self, body):
+        if self.failures:
+            self.failures -= 1
+            self.calls += 1
+            raise self.error
+        return await super().insert_event(body)
+
+
+def events(count):
+    return [
+        {"summary": f"FD {i}", "start": {"date": "2026-01-01"}, "end": {"date": "2026-01-01"}}
+        for i in range(count)
+    ]
+
+
+def test_sync_inserts_every_event():
+    client = FakeCalendarClient(latency=0.001)
+    report = run_sync(client, events(20), concurrency=4)
+    assert report.sent == 20 and not report.failed
+    assert sorted(e["summary"] for e in client.list_events()) == sorted(
+        e["summary"] for e in events(20)
+    )
+    assert all(stored_content_hash(e) for e in client.list_events())
+
+
+def test_resync_skips_unchanged_and_deletes_stale():
+    client = FakeCalendarClient(latency=0)
+    run_sync(client, events(5))
+    existing = client.list_events()
+    client.calls = 0
+
+    changed = events(4)
+    changed[0]["summary"] = "FD renamed"
+    report = run_sync(client, changed, existing=existing)
+
+    assert (report.skipped, report.sent, report.deleted) == (3, 1, 2)
+    assert client.calls == 3
+    assert len(client.list_events()) == 4
+
+
+def test_rate_limit_403_is_retried():
+    client = FlakyCalendarClient(http_error(403, "rateLimitExceeded"), failures=2)
+    report = run_sync(client, events(1), retries=3, backoff=0)
+    assert report.sent == 1 and not report.failed
+    assert client.calls == 3
+
+
+def test_permission_403_is_not_retried():
+    client = FlakyCalendarClient(http_error(403, "forbidden"), failures=2)
+    report = run_sync(client, events(1), retries=3, backoff=0)
+    assert report.sent == 0 and len(report.failed) == 1
+    assert client.calls == 1
+
+
+def test_server_errors_give_up_after_retries():
+    client = FlakyCalendarClient(http_error(503), failures=10)
+    report = run_sync(client, events(1), retries=2, backoff=0)
+    assert len(report.failed) == 1
+    assert client.calls == 3
+
+
+def test_other_exceptions_are_not_retried():
+    client = FakeCalendarClient(latency=0, fail_every=1)
+    report = run_sync(client, events(2), backoff=0)
+    assert report.sent == 0 and len(report.failed) == 2
+    assert client.calls == 2
+
+
+def test_with_content_hash_keeps_private_properties():
+    event = dict(events(1)[0], extendedProperties={"private": {"eventKey": "k"}})
+    hashed = with_content_hash(event)
+    assert hashed["extendedProperties"]["private"]["eventKey"] == "k"
+    assert stored_content_hash(hashed)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fixed_deposit_calculator.projection import cash_flow_matrix, maturity_ladder
+
+
+@pytest.fixture
+def portfolio(book):
+    return book(
+        # 35,000 every half year; the renewal at 7% pays the same
+        {
+            "DATE": "2024-11-01",
+            "MATURITY DATE": "2025-11-01",
+            "DEPOSIT AMT": 1000000.0,
+            "RATE OF INT": 0.07,
+            "INTEREST PAYABLE": "H",
+        },
+        # Placed inside the horizon: 7,500 a quarter, 8,750 once renewed at 7%
+        {
+            "DATE": "2025-07-10",
+            "MATURITY DATE": "2026-07-10",
+            "DEPOSIT AMT": 500000.0,
+            "RATE OF INT": 0.06,
+            "INTEREST PAYABLE": "Q",
+        },
+    )
+
+
+def test_cash_flow_matrix_pays_no_interest_on_placement_or_renewal(portfolio):
+    flows = cash_flow_matrix(portfolio, start="2025-04-15", years=2, reinvest_rate=0.07)
+    interest = flows[flows["INTEREST"] > 0]
+
+    # DEPOSIT 2 and 3 are the renewals of 0 and 1, DEPOSIT 4 renews 2 again
+    assert sorted(zip(interest["DEPOSIT"], interest["MONTH"], interest["INTEREST"])) == [
+        (0, 1, 35000),
+        (0, 7, 35000),
+        (1, 6, 7500),
+        (1, 9, 7500),
+        (1, 12, 7500),
+        (1, 15, 7500),
+        (2, 13, 35000),
+        (2, 19, 35000),
+        (3, 18, 8750),
+        (3, 21, 8750),
+    ]
+    maturities = flows[flows["INTEREST"] == 0].sort_values("MONTH")
+    assert list(maturities["MONTH"]) == [7, 15, 19]
+    assert list(maturities["REINVESTED"]) == [1000000, 500000, 1000000]
+    assert not maturities["PRINCIPAL"].any()
+
+
+def test_maturity_ladder_monthly_cells(portfolio):
+    ladder = maturity_ladder(portfolio, start="2025-04-15", years=2, reinvest_rate=0.07)
+
+    assert ladder.index[0] == pd.Period("2025-04", "M")
+    assert ladder.loc["2025-07", "INTEREST"] == 0
+    assert ladder.loc["2025-11", "INTEREST"] == 35000
+    assert ladder.loc["2026-07", "INTEREST"] == 7500
+    assert ladder.loc["2026-10", "INTEREST"] == 8750
+    assert ladder["INTEREST"].sum() == 4 * 35000 + 4 * 7500 + 2 * 8750
+    assert ladder["CASH"].sum() == ladder["INTEREST"].sum()
+    outstanding = ladder["OUTSTANDING"].iloc[[0, 3, 23]]
+    np.testing.assert_array_equal(outstanding, [1000000, 1500000, 1500000])
+
+
+def test_maturity_ladder_pays_out_principal_without_reinvestment(portfolio):
+    ladder = maturity_ladder(portfolio, start="2025-04-15", years=2)
+
+    assert ladder.loc["2025-11", "CASH"] == 35000 + 1000000
+    assert ladder.loc["2026-07", "CASH"] == 7500 + 500000
+    assert ladder["CUMULATIVE CASH"].iloc[-1] == 2 * 35000 + 4 * 7500 + 1500000
+    outstanding = ladder["OUTSTANDING"].iloc[[0, 3, 7, 15]]
+    np.testing.assert_array_equal(outstanding, [1000000, 1500000, 500000, 0])
+    assert not ladder["REINVESTED"].any()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fixed_deposit_calculator.query import IntervalBlocks, PaymentIndex, due_between
+from fixed_deposit_calculator.schedule import payment_ledger
+
+
+def days(*values):
+    return np.array(values, dtype="datetime64[D]")
+
+
+@pytest.fixture
+def portfolio(book):
+    return book(
+        # Matured long ago
+        {"DATE": "2015-01-10", "MATURITY DATE": "2016-01-10", "DEPOSIT AMT": 100000.0,
+         "RATE OF INT": 0.06, "INTEREST PAYABLE": "Y"},
+        # Quarterly from January: pays in January, April, July and October
+        {"DATE": "2024-01-31", "MATURITY DATE": "2026-01-31", "DEPOSIT AMT": 400000.0,
+         "RATE OF INT": 0.07, "INTEREST PAYABLE": "Q"},
+        # Quarterly from February
+        {"DATE": "2024-02-15", "MATURITY DATE": "2025-08-15", "DEPOSIT AMT": 400000.0,
+         "RATE OF INT": 0.08, "INTEREST PAYABLE": "Q"},
+        # Cumulative, maturing mid-window
+        {"DATE": "2023-05-20", "MATURITY DATE": "2025-05-20", "DEPOSIT AMT": 100000.0,
+         "RATE OF INT": 0.075, "INTEREST PAYABLE": "C"},
+        # Starts after the windows below
+        {"DATE": "2026-03-01", "MATURITY DATE": "2027-03-01", "DEPOSIT AMT": 120000.0,
+         "RATE OF INT": 0.07, "INTEREST PAYABLE": "M"},
+    )
+
+
+def test_interval_blocks_skip_matured_blocks():
+    start = days("2015-01-01", "2016-01-01", "2024-01-01", "2024-06-01", "2026-01-01")
+    maturity = days("2015-12-31", "2017-01-01", "2025-01-01", "2024-12-01", "2027-01-01")
+    blocks = IntervalBlocks(np.arange(5)[::-1], start, maturity, block_size=2)
+
+    assert sorted(blocks.alive(np.datetime64("2024-07-01"), np.datetime64("2025-12-31"))) == [2, 3]
+    assert sorted(blocks.alive(np.datetime64("2016-06-01"), np.datetime64("2016-06-01"))) == [1]
+    assert list(blocks.alive(np.datetime64("2030-01-01"), np.datetime64("2031-01-01"))) == []
+    empty = IntervalBlocks(np.arange(0), start, maturity, block_size=2)
+    assert list(empty.alive(np.datetime64("2024-01-01"), np.datetime64("2025-01-01"))) == []
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 1024])
+def test_alive_and_candidates(portfolio, block_size):
+    index = PaymentIndex.from_frame(portfolio, block_size)
+
+    assert list(index.alive("2025-04-01", "2025-06-30")) == [1, 2, 3]
+    # In April only the January-residue quarterly deposit pays; the
+    # cumulative one is found through its maturity in May
+    assert list(index.candidates("2025-04-01", "2025-04-30")) == [1]
+    assert list(index.candidates("2025-05-01", "2025-05-31")) == [2, 3]
+    assert list(index.candidates("2010-01-01", "2010-12-31")) == []
+
+
+def test_payments_and_interest(portfolio):
+    index = PaymentIndex.from_frame(portfolio, block_size=2)
+
+    rows, dates, amounts = index.payments("2025-04-01", "2025-09-30")
+    assert list(rows) == [1, 2, 3, 1, 2]
+    assert list(dates.astype(str)) == [
+        "2025-04-30", "2025-05-15", "2025-05-20", "2025-07-30", "2025-08-15"
+    ]
+    np.testing.assert_allclose(amounts, [7000, 8000, 7500, 7000, 8000])
+
+    rows, counts, interest = index.interest("2025-04-01", "2025-09-30")
+    assert list(rows) == [1, 2, 3] and list(counts) == [2, 2, 1]
+    np.testing.assert_allclose(interest, [14000, 16000, 7500])
+
+
+def test_due_between_matches_the_full_ledger(portfolio):
+    for window in [("2024-01-01", "2026-12-31"), ("2025-05-20", "2025-05-20"), ("2025-03-31", "2025-03-01")]:
+        expected = payment_ledger(portfolio, *window).drop(columns="DEPOSIT")
+        pd.testing.assert_frame_equal(due_between(portfolio, *window), expected)
+
+
+def test_dashboard_caches_one_index_per_data_version(portfolio):
+    dashboard = pytest.importorskip("fixed_deposit_calculator.dashboard")
+    window = (pd.Timestamp("2025-04-01"), pd.Timestamp("2026-03-31"))
+    try:
+        first = dashboard.get_payment_index("v1", window, None, portfolio)
+        assert dashboard.get_payment_index("v1", window, None, portfolio.head(1)) is first
+        assert len(first) == len(portfolio)
+        assert dashboard.get_payment_index("v2", window, None, portfolio.head(1)) is not first
+    finally:
+        dashboard.get_payment_index.clear()
@@ -0,0 +1,80 @@
+import pytest
+from cryptography.fernet import Fernet
+
+import refresh_service
+from fixed_deposit_calculator.storage import SQLiteStore
+from refresh_service import PortfolioRefresher
+
+
+def test_refresh_publishes_once_per_data_version(tmp_path, monkeypatch, deposits):
+    path = str(tmp_path / "portfolio.db")
+    key = Fernet.generate_key()
+    SQLiteStore(path, key).write(deposits([1, 2]))
+
+    published = []
+
+    def publish_report(store, *args):
+        published.append(store.digest())
+        return {"date": "2026-01-01", "digest": published[-1]}
+
+    monkeypatch.setattr(refresh_service, "publish_report", publish_report)
+    refresher = PortfolioRefresher(path, key, str(tmp_path / "artifacts"))
+    refresher.refresh()
+    refresher.refresh()
+    assert len(published) == 1
+
+    SQLiteStore(path, key).write(deposits([3]))
+    refresher.refresh()
+    assert len(published) == 2 and published[0] != published[1]
+
+
+def test_failed_refresh_is_retried_for_the_day(tmp_path, monkeypatch, deposits):
+    path = str(tmp_path / "portfolio.db")
+    key = Fernet.generate_key()
+    SQLiteStore(path, key).write(deposits([1]))
+    attempts = []
+
+    def publish_report(store, *args):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("disk full")
+        return {"date": "2026-01-01", "digest": store.digest()}
+
+    monkeypatch.setattr(refresh_service, "publish_report", publish_report)
+    refresher = PortfolioRefresher(path, key, str(tmp_path / "artifacts"))
+    with pytest.raises(OSError):
+        refresher.refresh()
+    assert refresher.today is None
+
+    # Not again straight away, but once the retry delay is over
+    refresher.on_idle()
+    assert len(attempts) == 1
+    refresher.retry_at = 0.0
+    refresher.on_idle()
+    refresher.on_idle()
+    assert len(attempts) == 2 and refresher.today is not None
+
+
+def test_dashboard_refresher_replaced_on_key_or_calendar_change(tmp_path, deposits):
+    dashboard = pytest.importorskip("fixed_deposit_calculator.dashboard")
+    path = str(tmp_path / "portfolio.db")
+    holidays = tmp_path / "holidays.csv"
+    holidays.write_text("date\n2026-01-26\n")
+    SQLiteStore(path, Fernet.generate_key()).write(deposits([1]))
+    directory = str(tmp_path / "artifacts")
+    settings = (str(holidays), "following", holidays.stat().st_mtime)
+    try:
+        first = dashboard.start_refresher(path, b"old", directory)
+        assert dashboard.start_refresher(path, b"old", directory) is first
+        rotated = dashboard.start_refresher(path, b"new", directory)
+        with_holidays = dashboard.start_refresher(path, b"new", directory, settings)
+        assert first.stopping.is_set() and rotated.stopping.is_set()
+        assert not with_holidays.stopping.is_set()
+        # Back to the old key: a new watcher rather than the stopped one
+        again = dashboard.start_refresher(path, b"old", directory)
+        assert again is not first and not again.stopping.is_set()
+        assert with_holidays.stopping.is_set()
+    finally:
+        dashboard.start_refresher.clear()
+        for watcher in dashboard._refreshers.values():
+            watcher.stop()
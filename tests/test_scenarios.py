@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fixed_deposit_calculator.scenarios import (
+    Scenario,
+    apply_scenario,
+    compare_scenarios,
+    evaluate_scenario,
+    portfolio_arrays,
+    scenario_schedule,
+)
+
+FY25 = (pd.Timestamp("2025-04-01"), pd.Timestamp("2026-03-31"))
+FY26 = (pd.Timestamp("2026-04-01"), pd.Timestamp("2027-03-31"))
+
+
+@pytest.fixture
+def half_yearly(book):
+    # Pays 35,000 on 2025-05-01 and at maturity on 2025-11-01
+    return book(
+        {
+            "DATE": "2024-11-01",
+            "MATURITY DATE": "2025-11-01",
+            "DEPOSIT AMT": 1000000.0,
+            "RATE OF INT": 0.07,
+            "INTEREST PAYABLE": "H",
+        }
+    )
+
+
+def test_same_rate_renewal_leaves_window_interest_unchanged(half_yearly):
+    base = portfolio_arrays(half_yearly)
+    windows = {"FY25": FY25}
+    renewal = Scenario(
+        "Renew", renewal_rate=0.07, renew_from="2025-04-01", renew_until="2027-03-31"
+    )
+
+    assert evaluate_scenario(base, Scenario("Base"), windows)["FY25 INTEREST"] == 70000
+    summary = evaluate_scenario(base, renewal, {"FY25": FY25, "FY26": FY26})
+    assert summary["FY25 INTEREST"] == 70000
+    # The renewal pays on 2026-05-01 and at its maturity on 2026-11-01; the
+    # one it starts on that day first pays on 2027-05-01
+    assert summary["FY26 INTEREST"] == 70000
+    assert summary["RENEWALS"] == 2
+
+
+def test_renewals_first_pay_one_period_after_renewal(half_yearly):
+    base = portfolio_arrays(half_yearly)
+    renewal = Scenario(
+        "Renew", renewal_rate=0.08, renew_from="2025-04-01", renew_until="2026-03-31"
+    )
+    columns, renewed = apply_scenario(base, renewal)
+    schedule = scenario_schedule(columns, len(base["DATE"]))
+
+    rows, dates = schedule.window_ledger("2025-04-01", "2026-12-31")
+    assert renewed == 1
+    assert list(rows) == [0, 0, 1, 1]
+    assert list(dates.astype(str)) == ["2025-05-01", "2025-11-01", "2026-05-01", "2026-11-01"]
+    next_dates = schedule.next_interest_dates("2025-06-01")
+    assert list(next_dates.astype(str)) == ["2025-11-01", "2026-05-01"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_compare_scenarios_reports_change_against_base(half_yearly, max_workers):
+    scenarios = [
+        Scenario("Cut", rate_change=-0.01),
+        Scenario("Renew", renewal_rate=0.06, renew_from="2025-04-01", renew_until="2027-03-31"),
+    ]
+    table = compare_scenarios(
+        half_yearly, scenarios, {"FY25": FY25, "FY26": FY26}, max_workers=max_workers
+    )
+
+    assert list(table.index) == ["Base", "Cut", "Renew"]
+    np.testing.assert_allclose(table["FY25 INTEREST"], [70000, 60000, 70000])
+    np.testing.assert_allclose(table["FY25 CHANGE"], [0, -10000, 0])
+    np.testing.assert_allclose(table["FY26 INTEREST"], [0, 0, 60000])
+    np.testing.assert_array_equal(table["RENEWALS"], [0, 0, 2])
@@ -0,0 +1,166 @@
+"""
+The vectorized schedule, payment index and window interest checked against
+the reference functions of interest.py on the adversarial books of
+benchmarks/oracle.py, with and without business-day calendars.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.oracle import (
+    BLOCK_SIZE,
+    CASES,
+    adversarial_book,
+    adversarial_days,
+    adversarial_windows,
+    divergences,
+    reproducer,
+)
+from fixed_deposit_calculator.business_days import BusinessCalendar
+from fixed_deposit_calculator.interest import (
+    calculate_date_range_interest_dates,
+    calculate_interest_amount,
+)
+from fixed_deposit_calculator.query import PaymentIndex
+from fixed_deposit_calculator.reports import with_window_interest
+from fixed_deposit_calculator.schedule import DepositSchedule
+
+SEEDS = range(2)
+DEPOSITS = 100
+
+
+def books(seed):
+    rng = np.random.default_rng(seed)
+    df = adversarial_book(rng, DEPOSITS)
+    return df, adversarial_days(rng, df, 8), adversarial_windows(rng, df, 12)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("case", list(CASES))
+def test_fast_paths_match_the_reference(case, seed):
+    df, days, windows = books(seed)
+    arguments = {"day": days, "window": windows, None: [None]}[CASES[case][2]]
+    for argument in arguments:
+        diverging = divergences(case, df, argument)
+        assert not diverging, reproducer(case, df, argument, diverging)
+
+
+# -- Business days -------------------------------------------------------
+
+
+@pytest.fixture(scope="module", params=["following", "modified_following"])
+def calendar(request):
+    """Holidays on random days and month ends, so payments move across months."""
+    rng = np.random.default_rng(7)
+    months = rng.choice(np.arange("1998-01", "2105-01", dtype="datetime64[M]"), 400)
+    month_ends = (months + 1).astype("datetime64[D]") - rng.integers(1, 3, len(months))
+    days = rng.choice(np.arange("1998-01-01", "2105-01-01", dtype="datetime64[D]"), 2000)
+    return BusinessCalendar(np.concatenate([month_ends, days]), request.param)
+
+
+def reference_payments(df, window, calendar):
+    """Each deposit's reference payments moved onto business days, clipped to the window."""
+    window_start, window_end = (np.datetime64(pd.Timestamp(w), "D") for w in window)
+    pad = pd.Timedelta(calendar.max_shift, unit="D")
+    payments = []
+    for start, frequency, maturity in zip(
+        df["DATE"], df["INTEREST PAYABLE"].astype(str), df["MATURITY DATE"]
+    ):
+        dates = calculate_date_range_interest_dates(
+            start, frequency, window[0] - pad, window[1] + pad, maturity
+        )
+        adjusted = calendar.adjust(np.array(dates, dtype="datetime64[D]"))
+        payments.append([d for d in adjusted if window_start <= d <= window_end])
+    return payments
+
+
+def moved_windows(df, calendar, seed, count=8):
+    """
+    Windows starting on a payment moved later, or ending on one moved
+    earlier, so the payment is only inside the window once it has moved.
+    """
+    rng = np.random.default_rng(seed)
+    schedule = DepositSchedule.from_frame(df)
+    rows, dates = schedule.window_ledger("1998-01-01", "2104-12-31")
+    adjusted = calendar.adjust(dates)
+    later, earlier = np.flatnonzero(adjusted > dates), np.flatnonzero(adjusted < dates)
+    windows = []
+    for i in rng.choice(later, min(count, len(later)), replace=False):
+        start = pd.Timestamp(adjusted[i])
+        windows.append((start, start + pd.Timedelta(days=int(rng.integers(0, 40)))))
+    for i in rng.choice(earlier, min(count, len(earlier)), replace=False):
+        end = pd.Timestamp(adjusted[i])
+        windows.append((end - pd.Timedelta(days=int(rng.integers(0, 40))), end))
+    return windows
+
+
+def by_row(n, rows, dates):
+    grouped = [[] for _ in range(n)]
+    for row, date in zip(rows, np.asarray(dates, dtype="datetime64[D]")):
+        grouped[row].append(date)
+    return grouped
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_business_day_payments_match_the_adjusted_reference(calendar, seed):
+    df, _, windows = books(seed)
+    windows += moved_windows(df, calendar, seed)
+    schedule = DepositSchedule.from_frame(df, calendar)
+    index = PaymentIndex.from_frame(df, BLOCK_SIZE, calendar)
+
+    for window in windows:
+        expected = reference_payments(df, window, calendar)
+        assert by_row(len(df), *schedule.window_ledger(*window)) == expected, window
+        rows, dates, _ = index.payments(*window)
+        assert by_row(len(df), rows, dates) == expected, window
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_business_day_window_interest_matches_the_adjusted_reference(calendar, seed):
+    df, _, windows = books(seed)
+    windows += moved_windows(df, calendar, seed)
+    index = PaymentIndex.from_frame(df, calendar=calendar)
+
+    for window in windows:
+        got = with_window_interest(df.copy(), *window, "W", calendar, index)
+        expected = []
+        for dates, frequency, amount, rate in zip(
+            reference_payments(df, window, calendar),
+            df["INTEREST PAYABLE"].astype(str),
+            df["DEPOSIT AMT"],
+            df["RATE OF INT"],
+        ):
+            per_payment = calculate_interest_amount(amount, rate, frequency)
+            interest = (per_payment if dates else 0) if frequency == "C" else len(dates) * per_payment
+            expected.append((len(dates), float(interest).hex()))
+        assert [
+            (count, float(interest).hex())
+            for count, interest in zip(got["W_PAYMENTS"], got["W_INTEREST_AMOUNT"])
+        ] == expected, window
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_business_day_next_interest_dates(calendar, seed):
+    df, days, _ = books(seed)
+    schedule = DepositSchedule.from_frame(df, calendar)
+    shift = pd.Timedelta(calendar.max_shift, unit="D")
+
+    for today in days:
+        got = schedule.next_interest_dates(today)
+        for row, (start, frequency, maturity) in enumerate(
+            zip(df["DATE"], df["INTEREST PAYABLE"].astype(str), df["MATURITY DATE"])
+        ):
+            if frequency == "C":
+                expected = calendar.adjust(np.datetime64(maturity, "D"))
+            elif start > today:
+                expected = calendar.adjust(np.datetime64(start, "D"))
+            else:
+                # The first payment after today once moved onto a business day,
+                # or the (adjusted) maturity once there are none left
+                dates = calculate_date_range_interest_dates(
+                    start, frequency, today - shift, max(maturity, today + shift), maturity
+                )
+                adjusted = calendar.adjust(np.array(dates, dtype="datetime64[D]"))
+                later = adjusted[adjusted > np.datetime64(today, "D")]
+                expected = later[0] if len(later) else calendar.adjust(np.datetime64(maturity, "D"))
+            assert got[row] == expected, (today, row)
@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+
+from fixed_deposit_calculator.schema import DUPLICATE_DEP_NO, validate_deposits
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(
+        {
+            "SOURCE": "book.xlsx:a",
+            "DEP NO": [1, 2, 3],
+            "NAME OF THE DEPOSITEE": "Asha",
+            "DATE": "2025-01-15",
+            "MATURITY DATE": "2027-01-15",
+            "DEPOSIT AMT": 100000,
+            "RATE OF INT": 0.07,
+            "INTEREST PAYABLE": " q",
+        }
+    )
+
+
+def rejected(frame, column, values):
+    frame[column] = values
+    valid, report = validate_deposits(frame)
+    return valid["DEP NO"].tolist(), report[["DEP NO", "COLUMN"]].values.tolist()
+
+
+def test_valid_rows_are_typed(frame):
+    valid, report = validate_deposits(frame)
+    assert report.empty and len(valid) == 3
+    assert valid["DATE"].dtype == "datetime64[ns]"
+    assert valid["INTEREST PAYABLE"].tolist() == ["Q"] * 3
+    assert valid["DEPOSIT AMT"].dtype == float
+
+
+def test_rate_outside_zero_to_one(frame):
+    # 7.1 is a percentage typed as a number; 0 is allowed, 1 is not
+    assert rejected(frame, "RATE OF INT", [7.1, 0.0, 1.0]) == (
+        [2],
+        [[1, "RATE OF INT"], [3, "RATE OF INT"]],
+    )
+    assert rejected(frame, "RATE OF INT", [-0.01, "seven", 0.999]) == (
+        [3],
+        [[1, "RATE OF INT"], [2, "RATE OF INT"]],
+    )
+
+
+def test_non_positive_amount(frame):
+    assert rejected(frame, "DEPOSIT AMT", [0, -5000, None]) == (
+        [],
+        [[1, "DEPOSIT AMT"], [2, "DEPOSIT AMT"], [3, "DEPOSIT AMT"]],
+    )
+
+
+def test_maturity_before_date(frame):
+    # Maturing on the deposit date is allowed
+    assert rejected(frame, "MATURITY DATE", ["2025-01-14", "2025-01-15", "not a date"]) == (
+        [2],
+        [[1, "MATURITY DATE"], [3, "MATURITY DATE"]],
+    )
+
+
+def test_bad_frequency_code(frame):
+    assert rejected(frame, "INTEREST PAYABLE", ["W", None, "c "]) == (
+        [3],
+        [[1, "INTEREST PAYABLE"], [2, "INTEREST PAYABLE"]],
+    )
+
+
+def test_repeated_dep_no_within_a_sheet(frame):
+    frame = pd.concat([frame, frame.assign(SOURCE="book.xlsx:b")], ignore_index=True)
+    # " 1" and 1.0 are 1 again; the same numbers on another sheet are other
+    # deposits, and the first row of a number is kept
+    frame["DEP NO"] = [1, " 1", 1.0, 1, 2, 3]
+    valid, report = validate_deposits(frame)
+
+    assert valid["DEP NO"].tolist() == [1, 1, 2, 3]
+    assert report[["SOURCE", "DEP NO", "PROBLEM"]].values.tolist() == [
+        ["book.xlsx:a", " 1", DUPLICATE_DEP_NO],
+        ["book.xlsx:a", 1.0, DUPLICATE_DEP_NO],
+    ]
+
+
+def test_every_problem_of_a_row_is_reported(frame):
+    frame.loc[0, ["DEP NO", "DEPOSIT AMT", "RATE OF INT"]] = [None, -1, 2]
+    valid, report = validate_deposits(frame)
+    assert len(valid) == 2
+    assert report["COLUMN"].tolist() == ["DEP NO", "DEPOSIT AMT", "RATE OF INT"]
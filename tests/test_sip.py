@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sip import installment_schedule, next_debits, xirr
+
+FAR = np.datetime64("2099-12-31")
+
+
+def test_xirr_of_a_known_series():
+    # The cash flows of the XIRR example in Excel's documentation
+    dates = ["2008-01-01", "2008-03-01", "2008-10-30", "2009-02-15", "2009-04-01"]
+    amounts = [-10000, 2750, 4250, 3250, 2750]
+    assert xirr(np.zeros(5), dates, amounts)[0] == pytest.approx(0.373362535, abs=1e-8)
+
+
+def test_xirr_solves_every_series_together():
+    groups = [0, 0, 1, 1, 1]
+    dates = ["2023-01-01", "2024-01-01", "2023-01-01", "2023-07-02", "2024-01-01"]
+    amounts = [-1000, 1100, -1000, -1000, 1800]
+    rates = xirr(groups, dates, amounts)
+
+    assert rates[0] == pytest.approx(0.10)
+    # 1000 (1 + r) + 1000 (1 + r) ** (183 / 365) = 1800
+    r = rates[1]
+    assert 1000 * (1 + r) + 1000 * (1 + r) ** (183 / 365) == pytest.approx(1800)
+    np.testing.assert_allclose(xirr(groups, dates, amounts, guess=0.5), rates)
+
+
+@pytest.mark.parametrize("amounts", [[-1000, -500], [1000, 500], [0, 0]])
+def test_xirr_without_a_sign_change_is_nan(amounts):
+    assert np.isnan(xirr([0, 0], ["2023-01-01", "2024-01-01"], amounts)).all()
+
+
+def test_xirr_of_an_empty_series_is_nan():
+    rates = xirr([0, 0], ["2023-01-01", "2024-01-01"], [-1000, 1100], count=2)
+    assert rates[0] == pytest.approx(0.10) and np.isnan(rates[1])
+
+
+@pytest.mark.parametrize(
+    "today, expected",
+    [
+        ("2024-01-31", ["2024-02-29", "2024-03-31", "2024-04-30"]),
+        ("2025-01-31", ["2025-02-28", "2025-03-31", "2025-04-30"]),
+        ("2025-01-30", ["2025-01-31", "2025-02-28", "2025-03-31"]),
+    ],
+)
+def test_next_debits_clamp_to_month_end_without_drifting(today, expected):
+    dates = next_debits(["2023-01-01"], [FAR], [31], today)
+    assert list(dates[0].astype(str)) == expected
+
+
+def test_next_debits_stop_at_the_end_date():
+    dates = next_debits(["2023-01-01"], ["2025-03-31"], [31], "2025-01-31")
+    assert list(pd.to_datetime(dates[0]).strftime("%Y-%m-%d").fillna("NaT")) == [
+        "2025-02-28",
+        "2025-03-31",
+        "NaT",
+    ]
+
+
+def test_installment_schedule_counts_clamped_debits():
+    rows, dates = installment_schedule(["2024-01-15", "2024-03-01"], ["2024-04-30", FAR], [31, 5])
+    assert list(rows[:4]) == [0, 0, 0, 0]
+    assert list(dates[:4].astype(str)) == ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"]
+    assert dates[4] == np.datetime64("2024-03-05")
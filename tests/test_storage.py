@@ -0,0 +1,91 @@
+import functools
+
+import pandas as pd
+import pytest
+from cryptography.fernet import Fernet
+
+from fixed_deposit_calculator import storage
+from fixed_deposit_calculator.storage import SQLiteStore, import_workbooks
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStore(str(tmp_path / "portfolio.db"), Fernet.generate_key())
+
+
+def write_workbook(path, **sheets):
+    with pd.ExcelWriter(path) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+
+def test_deposits_decrypted_once_per_data_version(store, deposits, monkeypatch):
+    store.write(deposits([1, 2, 3]))
+    unsealed = []
+    unseal = store.unseal
+    monkeypatch.setattr(store, "unseal", lambda token: unsealed.append(1) or unseal(token))
+
+    everything = store.deposits()
+    window = store.deposits(active_between=("2026-01-01", None))
+    store.deposits(active_between=(None, "2024-12-31"))
+    assert len(unsealed) == 3
+    assert len(everything) == 3 and len(window) == 3
+
+    store.write(deposits([4]))
+    assert len(store.deposits()) == 4
+    assert len(unsealed) == 7
+    # Lookups by number go through the blind indexes
+    assert store.deposits(dep_nos=["4"])["DEP NO"].tolist() == [4]
+
+
+def test_cached_windows_match_the_sql_query(store, deposits):
+    df = deposits([1, 2, 3])
+    df.loc[1, "MATURITY DATE"] = pd.Timestamp("2025-06-30")
+    df.loc[2, "DATE"] = pd.Timestamp("2025-07-01")
+    store.write(df)
+    windows = [("2025-06-30", "2025-06-30 23:00"), ("2025-07-01", None), (None, "2025-06-30")]
+
+    uncached = [store.deposits(active_between=window) for window in windows]
+    store.deposits()
+    for window, expected in zip(windows, uncached):
+        pd.testing.assert_frame_equal(store.deposits(active_between=window), expected)
+
+
+def test_write_rejects_a_repeated_deposit_number(store, deposits):
+    store.write(deposits([1]))
+    with pytest.raises(ValueError, match="DEP NO 2"):
+        store.write(pd.concat([deposits([2, 3]), deposits([2])], ignore_index=True))
+    # The failed write changed nothing
+    assert store.deposits()["DEP NO"].tolist() == [1]
+
+
+def test_import_reports_repeated_deposit_numbers(store, deposits, tmp_path, monkeypatch):
+    # One row per chunk, so the repeat is in a later chunk of the sheet
+    monkeypatch.setattr(
+        storage,
+        "iter_portfolio_chunks",
+        functools.partial(storage.iter_portfolio_chunks, chunksize=1),
+    )
+    path = str(tmp_path / "book.xlsx")
+    repeated = pd.concat([deposits([1, 2]), deposits([1])], ignore_index=True)
+    write_workbook(path, a=repeated, b=deposits([1]))
+
+    written, problems = import_workbooks(store, [path])
+    assert written == 3
+    assert problems[["SOURCE", "DEP NO", "COLUMN"]].values.tolist() == [
+        ["book.xlsx:a", 1, "DEP NO"]
+    ]
+    assert sorted(store.deposits()["SOURCE"]) == ["book.xlsx:a", "book.xlsx:a", "book.xlsx:b"]
+
+
+def test_import_empties_a_sheet_left_without_valid_rows(store, deposits, tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    write_workbook(path, a=deposits([1, 2]), b=deposits([3]))
+    import_workbooks(store, [path])
+
+    broken = deposits([1, 2])
+    broken["RATE OF INT"] = 7.0
+    write_workbook(path, a=broken, b=deposits([3]))
+    written, problems = import_workbooks(store, [path])
+    assert written == 1 and len(problems) == 2
+    assert store.deposits()["DEP NO"].tolist() == [3]
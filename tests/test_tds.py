@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+from fixed_deposit_calculator.tds import tds_ledger, tds_summary
+
+FY = (pd.Timestamp("2025-04-01"), pd.Timestamp("2026-03-31"))
+
+
+def deposit(name, cust_id, amount, frequency, **dates):
+    return {
+        "NAME OF THE DEPOSITEE": name,
+        "CUST ID": cust_id,
+        "DATE": dates.get("start", "2025-03-15"),
+        "MATURITY DATE": dates.get("maturity", "2027-03-15"),
+        "DEPOSIT AMT": amount,
+        "RATE OF INT": 0.10,
+        "INTEREST PAYABLE": frequency,
+    }
+
+
+@pytest.fixture
+def monthly(book):
+    # 10,000 on the 15th of every month of FY25, from two deposits of 5,000
+    return book(
+        deposit("Asha", 1, 600000.0, "M"),
+        deposit("Asha", 1, 600000.0, "M"),
+        deposit("Ravi", 2, 1200000.0, "M"),
+    )
+
+
+def summary_of(df, **kwargs):
+    return tds_summary(df, *FY, **kwargs).set_index("NAME OF THE DEPOSITEE")
+
+
+@pytest.mark.parametrize(
+    "amount, senior, crossed",
+    [
+        (500000.0, False, False),  # 50,000: at the threshold
+        (500010.0, False, True),  # 50,001
+        (1000000.0, True, False),  # 1,00,000: at the senior threshold
+        (1000010.0, True, True),  # 1,00,001
+    ],
+)
+def test_thresholds(book, amount, senior, crossed):
+    # One yearly payment of 10% inside the year
+    df = book(deposit("Asha", 1, amount, "Y", start="2025-01-10", maturity="2028-01-10"))
+    row = summary_of(df, senior_citizens=["Asha"] if senior else None).loc["Asha"]
+
+    assert row["PROJECTED FY INTEREST"] == pytest.approx(amount / 10)
+    assert row["THRESHOLD CROSSED"] == crossed
+    assert row["ESTIMATED TDS"] == pytest.approx(amount / 100 if crossed else 0.0)
+    if crossed:
+        assert row["CROSSING MONTH"] == "January 2026"
+    else:
+        assert pd.isna(row["CROSSING MONTH"])
+
+
+def test_crossing_month_and_tds_per_payment(monthly):
+    summary = summary_of(monthly, senior_citizens=["Ravi"])
+
+    # Asha passes 50,000 with the first payment of September: 10% of the
+    # 55,000 received so far, then 10% of each of the 13 later payments
+    asha = summary.loc["Asha"]
+    assert asha["PAYMENTS"] == 24
+    assert asha["CROSSING MONTH"] == "September 2025"
+    assert asha["ESTIMATED TDS"] == pytest.approx(5500 + 13 * 500)
+    assert asha["TDS PER PAYMENT AFTER CROSSING"] == pytest.approx(500)
+
+    # Ravi, a senior citizen, passes 1,00,000 with the eleventh
+    ravi = summary.loc["Ravi"]
+    assert ravi["CROSSING MONTH"] == "February 2026"
+    assert ravi["ESTIMATED TDS"] == pytest.approx(11000 + 1000)
+    assert ravi["TDS PER PAYMENT AFTER CROSSING"] == pytest.approx(1000)
+
+
+def test_ledger_marks_one_crossing_payment_per_depositor(monthly):
+    ledger = tds_ledger(monthly, *FY)
+
+    crossing = ledger[ledger["CROSSING PAYMENT"]]
+    assert crossing["NAME OF THE DEPOSITEE"].tolist() == ["Asha", "Ravi"]
+    assert crossing["FY INTEREST TO DATE"].tolist() == [55000, 60000]
+    ravi = ledger[ledger["NAME OF THE DEPOSITEE"] == "Ravi"]
+    assert ravi["ESTIMATED TDS"].tolist() == [0] * 5 + [6000] + [1000] * 6
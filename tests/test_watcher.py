@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+from cryptography.fernet import Fernet
+
+from fixed_deposit_calculator.storage import SQLiteStore
+from fixed_deposit_calculator.watcher import (
+    BackgroundWatcher,
+    _InotifyChanges,
+    _PolledChanges,
+    related_paths,
+)
+
+DEBOUNCE = 0.3
+
+
+@pytest.fixture
+def inotify_available(tmp_path):
+    try:
+        _InotifyChanges([tmp_path / "probe"]).close()
+    except (OSError, AttributeError, TypeError):
+        pytest.skip("inotify is not available")
+
+
+class Recorder:
+    def __init__(self, action=None):
+        self.calls = 0
+        self.action = action
+        self.called = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        if self.action is not None:
+            self.action()
+        self.called.set()
+
+
+def started(paths, on_change):
+    watcher = BackgroundWatcher(paths, on_change, debounce=DEBOUNCE)
+    watcher.start()
+    # Let the thread register its watches
+    time.sleep(0.2)
+    return watcher
+
+
+def test_burst_of_writes_is_one_change(tmp_path, inotify_available):
+    path = tmp_path / "data.xlsx.enc"
+    path.write_bytes(b"0")
+    recorder = Recorder()
+    watcher = started(related_paths(str(path)), recorder)
+    try:
+        for i in range(5):
+            path.write_bytes(str(i).encode())
+            time.sleep(DEBOUNCE / 3)
+        assert recorder.called.wait(5)
+        time.sleep(DEBOUNCE * 3)
+    finally:
+        watcher.stop()
+    assert recorder.calls == 1
+
+
+def test_other_files_of_the_directory_are_ignored(tmp_path, inotify_available):
+    path = tmp_path / "data.xlsx.enc"
+    path.write_bytes(b"0")
+    recorder = Recorder()
+    watcher = started(related_paths(str(path)), recorder)
+    try:
+        (tmp_path / "other.tmp").write_bytes(b"1")
+        time.sleep(DEBOUNCE * 4)
+    finally:
+        watcher.stop()
+    assert recorder.calls == 0
+
+
+def test_reading_the_store_does_not_trigger_a_refresh(tmp_path, inotify_available, deposits):
+    path = str(tmp_path / "portfolio.db")
+    key = Fernet.generate_key()
+    SQLiteStore(path, key).write(deposits([1, 2, 3]))
+
+    def read():
+        store = SQLiteStore(path, key)
+        store.digest()
+        store.deposits()
+
+    recorder = Recorder(read)
+    watcher = started(related_paths(path), recorder)
+    try:
+        read()
+        time.sleep(DEBOUNCE * 4)
+        assert recorder.calls == 0
+
+        SQLiteStore(path, key).write(deposits([4]))
+        assert recorder.called.wait(5)
+        # The callback's own reads must not start another round
+        time.sleep(DEBOUNCE * 4)
+    finally:
+        watcher.stop()
+    assert recorder.calls == 1
+
+
+def test_polling_ignores_an_empty_wal(tmp_path):
+    path = tmp_path / "portfolio.db"
+    path.write_bytes(b"db")
+    changes = _PolledChanges(related_paths(str(path)))
+    wal = tmp_path / "portfolio.db-wal"
+    wal.write_bytes(b"")
+    assert changes._signature() == changes.signature
+    wal.write_bytes(b"frames")
+    assert changes._signature() != changes.signature